@@ -14,10 +14,54 @@ USE_MOCK = False  # True → mock JSON, False → live Firebase
 import os
 from pathlib import Path
 KEY_PATH: str = str(Path(__file__).parent.parent / "serviceAccountKey.json")
+FIRESTORE_MAX_WORKERS: int = 8       # thread pool for overlapping Firestore RPCs
+POSTS_QUERY_CONCURRENCY: int = 4     # posts 'in' chunk queries in flight per request
+
+# ── Internal endpoints (routes/feed.py) ───────────────────────────────────────
+# POST /feed/publish/{post_id} and /feed/{user_id}/following/changed change
+# server state: callers must send this secret in the X-Internal-Key header.
+# Unset → both endpoints answer 503.
+INTERNAL_API_KEY: str = os.environ.get("THIKANA_INTERNAL_API_KEY", "")
 
 # ── Spatial settings ──────────────────────────────────────────────────────────
 MAX_RADIUS_KM: float = 10.0          # businesses beyond this are ignored
 GEOHASH_PRECISION: int = 5           # precision-5 ≈ 5×5 km cell
+GEOHASH_INDEX_PRECISIONS: tuple[int, ...] = (4, GEOHASH_PRECISION)  # cells queries read;
+                                     # 4 lets the kNN fallback reach KNN_MAX_RADIUS_KM
+GEOHASH_BUILD_PRECISIONS: tuple[int, ...] = (4, 5, 6)  # db/location_index.py writes
+                                     # (always with GEOHASH_INDEX_PRECISIONS);
+                                     # add to GEOHASH_INDEX_PRECISIONS once built
+GEOHASH_COVER_MAX_CELLS: int = 9     # finest precision whose radius cover fits wins
+MAX_QUERY_RADIUS_KM: float = 50.0    # upper bound for the radius_km query param
+SPATIAL_GRID_CELL_DEG: float = 0.1   # MockDB grid bucket ≈ 11×11 km
+# Sparse areas: fewer than KNN_MIN_NEARBY businesses within MAX_RADIUS_KM → use
+# the KNN_K nearest within KNN_MAX_RADIUS_KM instead. Dense areas never pay, and
+# a caller's radius_km is a hard limit that never falls back.
+KNN_MIN_NEARBY: int = 1              # 0 disables the fallback
+KNN_K: int = 10                      # businesses the fallback looks for
+KNN_MAX_RADIUS_KM: float = 100.0     # the fallback never looks further
+KNN_MAX_CELLS: int = 12 * GEOHASH_COVER_MAX_CELLS  # location_index cells one kNN
+                                     # search may read; 100 km needs precision 4 indexed
+
+# ── In-process caches (FirebaseDB) ────────────────────────────────────────────
+CELL_CACHE_TTL_SECONDS: float = 300.0  # location_index cells; 0 disables
+CELL_CACHE_MAX_ENTRIES: int = 10_000   # 1 entry per geohash cell (incl. empty)
+FOLLOWING_CACHE_TTL_SECONDS: float = 120.0  # users/{id}/following; 0 disables
+FOLLOWING_CACHE_MAX_ENTRIES: int = 50_000   # 1 frozenset per active user
+# Keep ALL businesses in memory, live via on_snapshot (db/replica.py): nearby
+# + business lookups then cost 0 reads. Memory grows with the collection.
+BUSINESS_REPLICA_ENABLED: bool = False
+# Newest posts per business in ring buffers, live via on_snapshot on posts
+# (db/recent_posts.py): feed post queries then cost 0 reads when answerable.
+RECENT_POSTS_ENABLED: bool = False
+RECENT_POSTS_PER_BUSINESS: int = 5   # ≥ the feed's limit_per_business
+RECENT_POSTS_HORIZON_HOURS: float | None = None  # listen to newer posts only; None = all
+
+# ── Candidate pool (core/candidate_pool.py) ───────────────────────────────────
+# Opt-in: a miss reads the whole pool (MAX_RADIUS_KM + the cell's half-diagonal,
+# ~2.5x the cells of one request) — it pays off once several users share a cell.
+CANDIDATE_POOL_TTL_SECONDS: float = 0.0   # shared per-cell feed pool; 0 disables (e.g. 60)
+CANDIDATE_POOL_MAX_ENTRIES: int = 2_000   # 1 pool per active cell (default radius only)
 
 # ── Scoring — Post feed ───────────────────────────────────────────────────────
 RECENCY_WINDOW_HOURS: float = 168.0  # 7 days — posts older than this score 0
@@ -25,6 +69,24 @@ POST_WEIGHT_FOLLOWING: float = 0.55
 POST_WEIGHT_LOCATION: float  = 0.35
 POST_WEIGHT_RECENCY: float   = 0.10
 
+# ── Feed candidate window ─────────────────────────────────────────────────────
+# Push `createdAt >= now - N hours` into the posts query so stale posts are
+# never read. None = fetch posts of any age (older posts can still rank via
+# the following/location signals). RECENCY_WINDOW_HOURS is the natural value.
+FEED_POSTS_WINDOW_HOURS: float | None = None
+FEED_WINDOW_FALLBACK: bool = True    # < limit posts in window → refetch any age
+
+# ── Feed inbox (fan-out on write, db/inbox.py) ────────────────────────────────
+# When on, publishing a post appends a ref to each follower's feed_inbox doc
+# and build_feed reads the followed half of the feed from that ONE document.
+FEED_INBOX_ENABLED: bool = False
+FEED_INBOX_SIZE: int = 200           # newest post refs kept per follower
+
+# ── Feed pagination (core/feed_snapshot.py) ───────────────────────────────────
+FEED_SNAPSHOT_TTL_SECONDS: float = 600.0  # cursor lifetime; 0 disables paging
+FEED_SNAPSHOT_MAX_ENTRIES: int = 1_000    # users with a live snapshot (LRU)
+FEED_SNAPSHOT_MAX_POSTS: int = 300        # ranked posts kept per snapshot
+
 # ── Scoring — Who to Follow ───────────────────────────────────────────────────
 MAX_POST_COUNT: int = 20             # postCount is normalised against this ceiling
 FOLLOW_WEIGHT_LOCATION: float = 0.70
@@ -2,151 +2,812 @@
 core/assembler.py
 
 Orchestrates the data layer (db/) and scoring layer (core/scorer.py).
-No Firestore calls here — only calls to `db` and `scorer`.
+No Firestore calls here — only calls to `db` / `async_db` and `scorer`.
+
+Each builder comes in two flavours that share the same ranking code:
+  build_feed / build_who_to_follow              — sync, sequential DB calls
+  build_feed_async / build_who_to_follow_async  — independent DB calls run
+                                                  concurrently on the event loop
+build_home(_async) produces both lists for one app open from a single pass
+over the shared stages (following, nearby, business docs).
 
 DB reads per request (Firebase):
-  build_feed:          ~4–12 reads total
+  build_feed:          ~4–12 reads total (full post docs only for the winners)
   build_who_to_follow: ~3–11 reads total
+  build_home:          ~4–12 reads total (who-to-follow adds none)
+
+All builders run inside a request_scope() (db/identity_map.py), so business
+docs loaded by get_nearby_businesses are not re-read by get_businesses_batch.
+
+Nearby businesses and their recent posts come from the shared per-cell
+candidate pool (core/candidate_pool.py) when it is enabled (opt-in); a
+warm pool leaves only the following read and the followed-outside-pool
+posts.
+Who-to-follow then ranks straight from the pool's BusinessTable columns,
+and feed winners take their business metadata from the same table.
+
+Where fewer than KNN_MIN_NEARBY businesses are within the radius (rural
+areas), "nearby" becomes the KNN_K nearest within KNN_MAX_RADIUS_KM
+instead, so the feed and suggestions are never empty for lack of
+neighbours. Dense areas never make that extra call.
+
+With config.FEED_INBOX_ENABLED the followed posts of the feed are read
+from the user's fan-out inbox (db/inbox.py) — one document however many
+businesses they follow. The following set still comes from the (cached)
+following list, so scoring and labels don't depend on what the capped
+inbox holds. The first read of an unseeded inbox falls back to the pull
+path and seeds it.
 """
 
-from db import db
-from core import scorer
+import asyncio
+import heapq
+from datetime import datetime, timedelta, timezone
 
+import numpy as np
 
-def build_feed(
+import config
+
+from db import async_db, db
+from db.identity_map import request_scoped
+from core import candidate_pool, feed_snapshot, scorer
+from core.business_table import BusinessRow, BusinessTable
+from core.candidate_pool import CandidatePool
+from core.records import PostCandidate, RankedPost
+
+_POSTS_PER_BUSINESS = 5     # post candidates per business, pulled or from the inbox
+
+
+# ── Ranking (shared by sync and async builders) ──────────────────────────────
+
+def _feed_candidates(
     user_id: str,
+    following_set: frozenset[str],
+    nearby: dict[str, float],
+) -> list[str]:
+    """Union: followed ∪ nearby, excluding the user's own account."""
+    return list((following_set | set(nearby.keys())) - {user_id})
+
+
+def _feed_since() -> datetime | None:
+    """Lower createdAt bound for feed candidates, or None when not configured."""
+    if config.FEED_POSTS_WINDOW_HOURS is None:
+        return None
+    return datetime.now(timezone.utc) - timedelta(hours=config.FEED_POSTS_WINDOW_HOURS)
+
+
+def _followed(user_id: str) -> tuple[frozenset[str], list[dict] | None]:
+    """
+    Followed side of the feed: (following set, inbox post refs).
+    The set always comes from the following list; a seeded inbox only
+    replaces the followed posts queries. Without one the inbox is None.
+    """
+    inbox = db.get_feed_inbox(user_id) if config.FEED_INBOX_ENABLED else None
+    return db.get_following_ids(user_id), inbox
+
+
+async def _followed_async(user_id: str) -> tuple[frozenset[str], list[dict] | None]:
+    """Async _followed — the list and the inbox are read concurrently."""
+    if not config.FEED_INBOX_ENABLED:
+        return await async_db.get_following_ids(user_id), None
+    following_set, inbox = await asyncio.gather(
+        async_db.get_following_ids(user_id),
+        async_db.get_feed_inbox(user_id),
+    )
+    return following_set, inbox
+
+
+def _inbox_candidates(inbox: list[dict] | None, following_set: frozenset[str]) -> list[dict]:
+    """
+    Inbox refs of businesses still followed, newest _POSTS_PER_BUSINESS per
+    business — the same cap the pulled posts get. The inbox is newest first.
+    """
+    per_business: dict[str, int] = {}
+    result: list[dict] = []
+    for post in inbox or []:
+        uid = post.get("uid")
+        if uid not in following_set or per_business.get(uid, 0) >= _POSTS_PER_BUSINESS:
+            continue
+        per_business[uid] = per_business.get(uid, 0) + 1
+        result.append(post)
+    return result
+
+
+def _inbox_seed(candidates: list[dict], following_set: frozenset[str]) -> list[dict]:
+    """Followed posts found by a pull-path read — the initial inbox contents."""
+    return [post for post in candidates if post.get("uid") in following_set]
+
+
+def _nearby(
     lat: float,
     lon: float,
-    limit: int = 20,
-) -> list[dict]:
+    since: datetime | None,
+    radius_km: float | None = None,
+    with_posts: bool = True,
+) -> tuple[dict[str, float], CandidatePool | None]:
     """
-    Build the ranked post feed for a user.
-
-    Steps:
-      1. Get following IDs           (1 DB read)
-      2. Get nearby businesses       (9 + ceil(n/10) reads in Firebase)
-      3. Union: followed ∪ nearby candidates
-      4. Fetch posts for all candidates in ONE batch
-      5. Fetch business metadata in ONE batch
-      6. Score → deduplicate → sort → return top N
+    Nearby businesses within radius_km (default MAX_RADIUS_KM) — from the
+    cell's shared pool when enabled and radius_km is the default, else from
+    db (an explicit radius reads only its own cover). Too few within the
+    default radius → the nearest ones further out (_too_sparse); an
+    explicit radius_km is a hard limit and never falls back.
+    with_posts=False (who-to-follow) leaves the pool's posts unloaded.
     """
-    # Step 1
-    following_ids: list[str] = db.get_following_ids(user_id)
-    following_set: set[str] = set(following_ids)
+    radius = config.MAX_RADIUS_KM if radius_km is None else radius_km
+    pool = None
+    if radius_km is None and candidate_pool.enabled():
+        pool = candidate_pool.get_pool(db, lat, lon, since, with_posts)
+        nearby = pool.nearby(lat, lon)
+    else:
+        nearby = db.get_nearby_businesses(lat, lon, radius)
+    if _too_sparse(nearby, radius_km):
+        nearby = db.get_nearest_businesses(lat, lon, *_knn_args(nearby))
+    return nearby, pool
 
-    # Step 2
-    nearby: dict[str, float] = db.get_nearby_businesses(lat, lon)
 
-    # Step 3 — union, exclude self
-    candidate_ids: list[str] = list(
-        (following_set | set(nearby.keys())) - {user_id}
-    )
-    if not candidate_ids:
-        return []
+async def _nearby_async(
+    lat: float,
+    lon: float,
+    since: datetime | None,
+    radius_km: float | None = None,
+    with_posts: bool = True,
+) -> tuple[dict[str, float], CandidatePool | None]:
+    """Async _nearby."""
+    radius = config.MAX_RADIUS_KM if radius_km is None else radius_km
+    pool = None
+    if radius_km is None and candidate_pool.enabled():
+        pool = await candidate_pool.get_pool_async(async_db, lat, lon, since, with_posts)
+        nearby = pool.nearby(lat, lon)
+    else:
+        nearby = await async_db.get_nearby_businesses(lat, lon, radius)
+    if _too_sparse(nearby, radius_km):
+        nearby = await async_db.get_nearest_businesses(lat, lon, *_knn_args(nearby))
+    return nearby, pool
 
-    # Step 4 — ONE batch read for posts
-    raw_posts: list[dict] = db.get_posts_for_businesses(
-        candidate_ids, limit_per_business=5
-    )
 
-    # Step 5 — ONE batch read for business metadata
-    businesses: dict[str, dict] = db.get_businesses_batch(candidate_ids)
-    biz_locations: dict[str, dict] = {
-        biz_id: biz["location"]
-        for biz_id, biz in businesses.items()
-        if biz.get("location")
-    }
+def _too_sparse(nearby: dict[str, float], radius_km: float | None) -> bool:
+    """
+    True when the default radius holds fewer than KNN_MIN_NEARBY businesses.
+    Always False for a caller's radius_km — the fallback would widen it.
+    """
+    return radius_km is None and len(nearby) < config.KNN_MIN_NEARBY
+
+
+def _knn_args(nearby: dict[str, float]) -> tuple[int, float]:
+    """(k, max_radius_km) for the fallback — never fewer businesses than nearby."""
+    return max(config.KNN_K, len(nearby)), max(config.KNN_MAX_RADIUS_KM, config.MAX_RADIUS_KM)
 
-    # Step 6 — score, deduplicate, sort
-    seen: set[str] = set()
-    scored: list[tuple[dict, float]] = []
 
-    for post in raw_posts:
-        post_id     = post.get("id")
-        business_id = post.get("uid")
+def _window_too_small(since: datetime | None, candidates: list[dict], limit: int) -> bool:
+    """True when the windowed fetch can't fill a page and should be retried unbounded."""
+    return since is not None and config.FEED_WINDOW_FALLBACK and len(candidates) < limit
 
-        if post_id in seen or business_id == user_id:
+
+def _select_feed(
+    user_id: str,
+    following_set: frozenset[str],
+    nearby: dict[str, float],
+    candidates: list[dict],
+    limit: int,
+) -> list[RankedPost]:
+    """
+    Deduplicate → score all candidates in one vectorised pass → top N.
+    Needs only {id, uid, createdAt} per post. Returns RankedPost records,
+    best first — the provider's dicts are only read, never kept.
+    """
+    # Location reuses the nearby distances — no haversine per post. A followed
+    # business outside the request's radius has none, so its location is 0.
+    seen: set[str] = set()
+    posts: list[PostCandidate] = []
+    for post in candidates:
+        post_id = post.get("id")
+        if post_id in seen or post.get("uid") == user_id:
             continue
         seen.add(post_id)
+        posts.append(PostCandidate.from_post(post))
+
+    scores = scorer.score_candidates(posts, following_set, nearby).tolist()
 
-        s = scorer.score_post(post, following_set, lat, lon, biz_locations)
+    # Bounded heap selection (ties keep fetch order, like a stable sort)
+    top = heapq.nlargest(limit, range(len(posts)), key=scores.__getitem__)
+    return [RankedPost(posts[i].id, posts[i].uid, scores[i]) for i in top]
 
-        biz = businesses.get(business_id, {})
+
+def _present_feed(
+    selected: list[RankedPost],
+    full_posts: dict[str, dict],
+    following_set: frozenset[str],
+    nearby: dict[str, float],
+    businesses: dict[str, BusinessRow],
+) -> list[dict]:
+    """
+    Build the response dicts for the hydrated winners, in ranked order.
+    Posts deleted between the two phases are skipped.
+
+    Each response is a copy: providers' post dicts are shared (MockDB's
+    snapshot, the identity map), so they are never written to.
+    """
+    result: list[dict] = []
+    for ranked in selected:
+        hydrated = full_posts.get(ranked.id)
+        if hydrated is None:
+            continue
+        business_id = hydrated.get("uid")
+        biz = businesses.get(business_id)
         dist = nearby.get(business_id)
 
-        post["score"] = s
+        post = dict(hydrated)
+        post["score"] = ranked.score
         post["recommendation_type"] = (
             "followed" if business_id in following_set else "nearby"
         )
         if dist is not None:
             post["distance_km"] = dist
         post["business"] = {
-            "businessName": biz.get("businessName", ""),
-            "username":     biz.get("username", ""),
-            "businessType": biz.get("businessType", ""),
+            "businessName": biz.business_name if biz else "",
+            "username":     biz.username if biz else "",
+            "businessType": biz.business_type if biz else "",
         }
+        result.append(post)
+
+    return result
+
+
+def _business_rows(docs: dict[str, dict]) -> dict[str, BusinessRow]:
+    """Fetched business docs as row views of a table built from them."""
+    return BusinessTable.from_docs(docs).rows(docs)
 
-        scored.append((post, s))
 
-    scored.sort(key=lambda x: -x[1])
-    return [p for p, _ in scored[:limit]]
+def _hydration_ids(selected: list[RankedPost]) -> tuple[list[str], list[str]]:
+    """(post IDs, distinct business IDs) of the selected posts."""
+    post_ids = [ranked.id for ranked in selected]
+    business_ids = list(dict.fromkeys(ranked.uid for ranked in selected))
+    return post_ids, business_ids
+
+
+def _follow_candidates(
+    user_id: str,
+    following_set: frozenset[str],
+    nearby: dict[str, float],
+) -> dict[str, float]:
+    """Nearby businesses minus already-followed and self."""
+    return {
+        biz_id: dist
+        for biz_id, dist in nearby.items()
+        if biz_id not in following_set and biz_id != user_id
+    }
+
+
+def _follow_table(
+    candidates: dict[str, float],
+    pool: CandidatePool | None,
+) -> BusinessTable | None:
+    """The pool's table when it holds every candidate, else None (fetch them)."""
+    if pool is not None and all(biz_id in pool.table for biz_id in candidates):
+        return pool.table
+    return None
+
+
+def _rank_who_to_follow(
+    candidates: dict[str, float],
+    table: BusinessTable,
+    limit: int,
+) -> list[dict]:
+    """
+    Score (one vectorised pass over the distances and the table's
+    post_count column) → bounded heap selection of the top N → build
+    response dicts for the winners only.
+    """
+    ids, rows = table.lookup(candidates)
+    if not ids:
+        return []
+
+    distances = np.fromiter((candidates[biz_id] for biz_id in ids), dtype=np.float64, count=len(ids))
+    scores = scorer.score_businesses_to_follow_batch(distances, table.post_count[rows]).tolist()
+    top = heapq.nlargest(limit, range(len(ids)), key=scores.__getitem__)
+
+    result: list[dict] = []
+    for i in top:
+        biz = BusinessRow(table, rows[i])
+        result.append({
+            "id":           ids[i],
+            "businessName": biz.business_name,
+            "username":     biz.username,
+            "businessType": biz.business_type,
+            "distance_km":  candidates[ids[i]],
+            "postCount":    biz.post_count,
+            "score":        scores[i],
+        })
+    return result
+
+
+def _first_page(
+    user_id: str,
+    selected: list[RankedPost],
+    following_set: frozenset[str],
+    nearby: dict[str, float],
+    limit: int,
+) -> tuple[list[RankedPost], str | None]:
+    """Snapshot a full ranking and return its first page (top `limit` when paging is off)."""
+    if not feed_snapshot.enabled():
+        return selected[:limit], None
+    return feed_snapshot.save(user_id, selected, following_set, nearby).page(0, limit)
+
+
+# ── Sync builders ─────────────────────────────────────────────────────────────
+
+def _rank_feed(
+    user_id: str,
+    lat: float,
+    lon: float,
+    limit: int,
+    keep: int | None = None,
+    radius_km: float | None = None,
+) -> tuple[list[RankedPost], frozenset[str], dict[str, float], CandidatePool | None]:
+    """
+    Steps 1–5 of build_feed → (ranked candidates, following set, nearby, pool).
+    Keeps the top `keep` candidates (default `limit`); `limit` is the page
+    size the window fallback has to fill.
+    """
+    # Step 1
+    following_set, inbox = _followed(user_id)
+
+    # Step 2
+    since = _feed_since()
+    nearby, pool = _nearby(lat, lon, since, radius_km)
+
+    selected = _rank_candidates(
+        user_id, following_set, inbox, nearby, pool, since, limit, keep
+    )
+    return selected, following_set, nearby, pool
+
+
+def _rank_candidates(
+    user_id: str,
+    following_set: frozenset[str],
+    inbox: list[dict] | None,
+    nearby: dict[str, float],
+    pool: CandidatePool | None,
+    since: datetime | None,
+    limit: int,
+    keep: int | None = None,
+) -> list[RankedPost]:
+    """Steps 3–5 of build_feed, given the followed side and the nearby side."""
+    # Step 3 — union, exclude self (a seeded inbox already holds followed posts)
+    pulled = following_set if inbox is None else frozenset()
+    candidate_ids = _feed_candidates(user_id, pulled, nearby)
+    if not candidate_ids and not inbox:
+        return []
+
+    # Step 4 — ONE projected batch read for ranking fields, only for
+    # businesses outside the pool (recency window pushed down when
+    # configured, unbounded retry if it can't fill a page)
+    followed = _inbox_candidates(inbox, following_set)
+    pooled, uncovered = pool.split(candidate_ids) if pool else ([], candidate_ids)
+    candidates = followed + pooled + db.get_post_candidates(
+        uncovered, limit_per_business=_POSTS_PER_BUSINESS, since=since
+    )
+    if _window_too_small(since, candidates, limit):
+        candidates = followed + db.get_post_candidates(
+            candidate_ids, limit_per_business=_POSTS_PER_BUSINESS
+        )
+    if inbox is None and config.FEED_INBOX_ENABLED:
+        db.seed_feed_inbox(user_id, _inbox_seed(candidates, following_set))
+
+    # Step 5 — score and select
+    return _select_feed(user_id, following_set, nearby, candidates, keep or limit)
+
+
+def _hydrate_feed(
+    selected: list[RankedPost],
+    following_set: frozenset[str],
+    nearby: dict[str, float],
+    pool: CandidatePool | None = None,
+) -> list[dict]:
+    """Steps 6–7 of build_feed — hydrate the selected posts, attach metadata."""
+    if not selected:
+        return []
+
+    # Step 6 — hydrate winners only (pooled businesses from the pool's table)
+    post_ids, business_ids = _hydration_ids(selected)
+    businesses, unpooled = pool.business_rows(business_ids) if pool else ({}, business_ids)
+    full_posts: dict[str, dict] = db.get_posts_by_ids(post_ids)
+    if unpooled:
+        businesses.update(_business_rows(db.get_businesses_batch(unpooled)))
+
+    # Step 7
+    return _present_feed(selected, full_posts, following_set, nearby, businesses)
+
+
+@request_scoped
+def build_feed(
+    user_id: str,
+    lat: float,
+    lon: float,
+    limit: int = 20,
+    radius_km: float | None = None,
+) -> list[dict]:
+    """
+    Build the ranked post feed for a user — two-phase: rank on skinny
+    candidates, then hydrate only the `limit` winners.
+
+    Steps:
+      1. Get following IDs           (1 DB read, 0 while cached — plus the
+                                      feed inbox, 1 read, when enabled)
+      2. Get nearby businesses       (0 reads from a warm candidate pool,
+                                      else c + ceil(n/10) reads in Firebase,
+                                      c = cells covering radius_km)
+      3. Union: followed ∪ nearby candidates (nearby only with an inbox)
+      4. Phase 1 — {id, uid, createdAt} for all candidates' posts: inbox
+         and pooled ones from memory, the rest fetched
+         (only createdAt >= now - FEED_POSTS_WINDOW_HOURS when configured)
+      5. Deduplicate → score in one vectorised pass → heap-select top N
+      6. Phase 2 — hydrate the top N posts + their businesses (pool table,
+         identity map)
+      7. Attach metadata to the winners
+    """
+    selected, following_set, nearby, pool = _rank_feed(
+        user_id, lat, lon, limit, radius_km=radius_km
+    )
+    return _hydrate_feed(selected, following_set, nearby, pool)
 
 
+@request_scoped
+def build_feed_page(
+    user_id: str,
+    lat: float,
+    lon: float,
+    limit: int = 20,
+    cursor: str | None = None,
+    radius_km: float | None = None,
+) -> tuple[list[dict], str | None]:
+    """
+    One page of the feed → (posts, next_cursor).
+
+    The first page ranks up to FEED_SNAPSHOT_MAX_POSTS candidates and keeps
+    them in a per-user snapshot (core/feed_snapshot.py). A cursor resumes
+    from that snapshot — steps 1–5 are skipped, only the page's own posts
+    are hydrated. An expired cursor re-ranks and continues at its offset.
+    Raises feed_snapshot.InvalidCursor for a malformed cursor.
+    radius_km only affects ranking — a cursor keeps its snapshot's radius.
+    """
+    if not feed_snapshot.enabled():
+        return build_feed(user_id, lat, lon, limit, radius_km), None
+
+    snapshot_id, offset = feed_snapshot.decode_cursor(cursor) if cursor else (None, 0)
+    snapshot = feed_snapshot.load(user_id, snapshot_id)
+    pool = None
+    if snapshot is None:
+        selected, following_set, nearby, pool = _rank_feed(
+            user_id, lat, lon, limit,
+            keep=config.FEED_SNAPSHOT_MAX_POSTS, radius_km=radius_km,
+        )
+        snapshot = feed_snapshot.save(user_id, selected, following_set, nearby)
+
+    page, next_cursor = snapshot.page(offset, limit)
+    return _hydrate_feed(page, snapshot.following, snapshot.nearby, pool), next_cursor
+
+
+@request_scoped
 def build_who_to_follow(
     user_id: str,
     lat: float,
     lon: float,
     limit: int = 10,
+    radius_km: float | None = None,
 ) -> list[dict]:
     """
     Build the "Who to Follow" list — nearby businesses not yet followed.
 
     Steps:
-      1. Get following IDs           (1 DB read)
-      2. Get nearby businesses       (9 + ceil(n/10) reads in Firebase)
+      1. Get following IDs           (1 DB read, 0 while cached)
+      2. Get nearby businesses       (0 reads from a warm candidate pool,
+                                      else c reads in Firebase, c = cells
+                                      covering radius_km — no post queries)
       3. Filter out already-followed and self
-      4. Fetch business metadata in ONE batch
-      5. Score → sort → return top N
+      4. Business columns: the pool's BusinessTable (0 reads), else ONE
+         batch fetch (0 reads — all came from step 2)
+      5. Score → heap-select top N → build response dicts
     """
     # Step 1
-    following_ids: list[str] = db.get_following_ids(user_id)
-    following_set: set[str] = set(following_ids)
+    following_set = db.get_following_ids(user_id)
 
     # Step 2
-    nearby: dict[str, float] = db.get_nearby_businesses(lat, lon)
+    nearby, pool = _nearby(lat, lon, _feed_since(), radius_km, with_posts=False)
 
+    # Steps 3–5
+    return _suggest(user_id, following_set, nearby, pool, limit)
+
+
+def _suggest(
+    user_id: str,
+    following_set: frozenset[str],
+    nearby: dict[str, float],
+    pool: CandidatePool | None,
+    limit: int,
+) -> list[dict]:
+    """Steps 3–5 of build_who_to_follow."""
     # Step 3 — filter
-    candidates: dict[str, float] = {
-        biz_id: dist
-        for biz_id, dist in nearby.items()
-        if biz_id not in following_set and biz_id != user_id
-    }
+    candidates = _follow_candidates(user_id, following_set, nearby)
     if not candidates:
         return []
 
-    # Step 4 — ONE batch read
-    businesses: dict[str, dict] = db.get_businesses_batch(list(candidates.keys()))
+    # Step 4 — the pool's columns, or ONE batch read
+    table = _follow_table(candidates, pool)
+    if table is None:
+        table = BusinessTable.from_docs(db.get_businesses_batch(list(candidates)))
 
-    # Step 5 — score and sort
-    scored: list[tuple[dict, float]] = []
-    for biz_id, distance_km in candidates.items():
-        biz = businesses.get(biz_id)
-        if not biz:
-            continue
+    # Step 5 — score and select
+    return _rank_who_to_follow(candidates, table, limit)
+
+
+@request_scoped
+def build_home(
+    user_id: str,
+    lat: float,
+    lon: float,
+    feed_limit: int = 20,
+    follow_limit: int = 10,
+    radius_km: float | None = None,
+) -> dict:
+    """
+    Feed + "Who to Follow" for one app open — every shared stage runs once.
+
+    Steps:
+      1. Following IDs (+ inbox) and nearby businesses — once for both lists
+      2. Rank the feed (build_feed steps 3–5); the first page is snapshotted
+         so /feed can continue from next_cursor
+      3. Hydrate the feed winners
+      4. Who-to-follow over the same nearby set — the pool's table (or the
+         identity map), so no second business fetch
+
+    Returns {"feed": [...], "next_cursor": str | None, "who_to_follow": [...]}.
+    """
+    since = _feed_since()
+    following_set, inbox = _followed(user_id)
+    nearby, pool = _nearby(lat, lon, since, radius_km)
+
+    keep = config.FEED_SNAPSHOT_MAX_POSTS if feed_snapshot.enabled() else None
+    selected = _rank_candidates(
+        user_id, following_set, inbox, nearby, pool, since, feed_limit, keep
+    )
+    page, next_cursor = _first_page(user_id, selected, following_set, nearby, feed_limit)
+    feed = _hydrate_feed(page, following_set, nearby, pool)
+
+    suggestions = _suggest(user_id, following_set, nearby, pool, follow_limit)
+
+    return {"feed": feed, "next_cursor": next_cursor, "who_to_follow": suggestions}
+
+
+# ── Async builders ────────────────────────────────────────────────────────────
+
+async def _rank_feed_async(
+    user_id: str,
+    lat: float,
+    lon: float,
+    limit: int,
+    keep: int | None = None,
+    radius_km: float | None = None,
+) -> tuple[list[RankedPost], frozenset[str], dict[str, float], CandidatePool | None]:
+    """Async _rank_feed — following/inbox and nearby are fetched concurrently."""
+    since = _feed_since()
+    (following_set, inbox), (nearby, pool) = await asyncio.gather(
+        _followed_async(user_id),
+        _nearby_async(lat, lon, since, radius_km),
+    )
+    selected = await _rank_candidates_async(
+        user_id, following_set, inbox, nearby, pool, since, limit, keep
+    )
+    return selected, following_set, nearby, pool
+
+
+async def _rank_candidates_async(
+    user_id: str,
+    following_set: frozenset[str],
+    inbox: list[dict] | None,
+    nearby: dict[str, float],
+    pool: CandidatePool | None,
+    since: datetime | None,
+    limit: int,
+    keep: int | None = None,
+) -> list[RankedPost]:
+    """Async _rank_candidates."""
+    pulled = following_set if inbox is None else frozenset()
+    candidate_ids = _feed_candidates(user_id, pulled, nearby)
+    if not candidate_ids and not inbox:
+        return []
+
+    followed = _inbox_candidates(inbox, following_set)
+    pooled, uncovered = pool.split(candidate_ids) if pool else ([], candidate_ids)
+    candidates = followed + pooled + await async_db.get_post_candidates(
+        uncovered, limit_per_business=_POSTS_PER_BUSINESS, since=since
+    )
+    if _window_too_small(since, candidates, limit):
+        candidates = followed + await async_db.get_post_candidates(
+            candidate_ids, limit_per_business=_POSTS_PER_BUSINESS
+        )
+    if inbox is None and config.FEED_INBOX_ENABLED:
+        await async_db.seed_feed_inbox(user_id, _inbox_seed(candidates, following_set))
+
+    return _select_feed(user_id, following_set, nearby, candidates, keep or limit)
+
+
+async def _hydrate_feed_async(
+    selected: list[RankedPost],
+    following_set: frozenset[str],
+    nearby: dict[str, float],
+    pool: CandidatePool | None = None,
+) -> list[dict]:
+    """Async _hydrate_feed — posts ‖ unpooled businesses."""
+    if not selected:
+        return []
+
+    post_ids, business_ids = _hydration_ids(selected)
+    businesses, unpooled = pool.business_rows(business_ids) if pool else ({}, business_ids)
+    if unpooled:
+        full_posts, fetched = await asyncio.gather(
+            async_db.get_posts_by_ids(post_ids),
+            async_db.get_businesses_batch(unpooled),
+        )
+        businesses.update(_business_rows(fetched))
+    else:
+        full_posts = await async_db.get_posts_by_ids(post_ids)
+    return _present_feed(selected, full_posts, following_set, nearby, businesses)
+
+
+@request_scoped
+async def build_feed_async(
+    user_id: str,
+    lat: float,
+    lon: float,
+    limit: int = 20,
+    radius_km: float | None = None,
+) -> list[dict]:
+    """
+    Async build_feed — same result, fewer sequential round trips:
+      1+2. following IDs (+ inbox) ‖ nearby businesses (concurrent; pool-backed)
+      3.   union → candidates
+      4–5. skinny post candidates (inbox + pooled + fetched) → score → top N
+      6.   hydrate posts ‖ businesses of winners  (concurrent)
+      7.   attach metadata (shared with build_feed)
+    """
+    selected, following_set, nearby, pool = await _rank_feed_async(
+        user_id, lat, lon, limit, radius_km=radius_km
+    )
+    return await _hydrate_feed_async(selected, following_set, nearby, pool)
+
+
+@request_scoped
+async def build_feed_page_async(
+    user_id: str,
+    lat: float,
+    lon: float,
+    limit: int = 20,
+    cursor: str | None = None,
+    radius_km: float | None = None,
+) -> tuple[list[dict], str | None]:
+    """Async build_feed_page."""
+    if not feed_snapshot.enabled():
+        return await build_feed_async(user_id, lat, lon, limit, radius_km), None
+
+    snapshot_id, offset = feed_snapshot.decode_cursor(cursor) if cursor else (None, 0)
+    snapshot = feed_snapshot.load(user_id, snapshot_id)
+    pool = None
+    if snapshot is None:
+        selected, following_set, nearby, pool = await _rank_feed_async(
+            user_id, lat, lon, limit,
+            keep=config.FEED_SNAPSHOT_MAX_POSTS, radius_km=radius_km,
+        )
+        snapshot = feed_snapshot.save(user_id, selected, following_set, nearby)
+
+    page, next_cursor = snapshot.page(offset, limit)
+    hydrated = await _hydrate_feed_async(page, snapshot.following, snapshot.nearby, pool)
+    return hydrated, next_cursor
+
+
+@request_scoped
+async def build_who_to_follow_async(
+    user_id: str,
+    lat: float,
+    lon: float,
+    limit: int = 10,
+    radius_km: float | None = None,
+) -> list[dict]:
+    """
+    Async build_who_to_follow:
+      1+2. following IDs ‖ nearby businesses      (concurrent)
+      3–5. filter → business columns (pool table or identity map) → rank
+    """
+    following_set, (nearby, pool) = await asyncio.gather(
+        async_db.get_following_ids(user_id),
+        _nearby_async(lat, lon, _feed_since(), radius_km, with_posts=False),
+    )
+    return await _suggest_async(user_id, following_set, nearby, pool, limit)
+
+
+async def _suggest_async(
+    user_id: str,
+    following_set: frozenset[str],
+    nearby: dict[str, float],
+    pool: CandidatePool | None,
+    limit: int,
+) -> list[dict]:
+    """Async _suggest."""
+    candidates = _follow_candidates(user_id, following_set, nearby)
+    if not candidates:
+        return []
+
+    table = _follow_table(candidates, pool)
+    if table is None:
+        table = BusinessTable.from_docs(await async_db.get_businesses_batch(list(candidates)))
+    return _rank_who_to_follow(candidates, table, limit)
+
+
+@request_scoped
+async def build_home_async(
+    user_id: str,
+    lat: float,
+    lon: float,
+    feed_limit: int = 20,
+    follow_limit: int = 10,
+    radius_km: float | None = None,
+) -> dict:
+    """
+    Async build_home:
+      1. following IDs (+ inbox) ‖ nearby businesses    (concurrent)
+      2. rank the feed → snapshot the first page
+      3+4. hydrate feed winners ‖ who-to-follow         (concurrent)
+    """
+    since = _feed_since()
+    (following_set, inbox), (nearby, pool) = await asyncio.gather(
+        _followed_async(user_id),
+        _nearby_async(lat, lon, since, radius_km),
+    )
+
+    keep = config.FEED_SNAPSHOT_MAX_POSTS if feed_snapshot.enabled() else None
+    selected = await _rank_candidates_async(
+        user_id, following_set, inbox, nearby, pool, since, feed_limit, keep
+    )
+    page, next_cursor = _first_page(user_id, selected, following_set, nearby, feed_limit)
+
+    feed, suggestions = await asyncio.gather(
+        _hydrate_feed_async(page, following_set, nearby, pool),
+        _suggest_async(user_id, following_set, nearby, pool, follow_limit),
+    )
 
-        s = scorer.score_business_to_follow(biz, distance_km)
-        scored.append((
-            {
-                "id":           biz_id,
-                "businessName": biz.get("businessName", ""),
-                "username":     biz.get("username", ""),
-                "businessType": biz.get("businessType", ""),
-                "distance_km":  distance_km,
-                "postCount":    biz.get("postCount", 0),
-                "score":        s,
-            },
-            s,
-        ))
-
-    scored.sort(key=lambda x: -x[1])
-    return [item for item, _ in scored[:limit]]
+    return {"feed": feed, "next_cursor": next_cursor, "who_to_follow": suggestions}
+
+
+# ── Cache stats ───────────────────────────────────────────────────────────────
+
+def cache_stats() -> dict:
+    """
+    Hit/miss counters of every in-process cache — the provider's, the
+    candidate pools and the feed snapshots. Reported by GET / (main.py).
+    """
+    return {
+        **db.cache_stats(),
+        "candidate_pool": candidate_pool.stats(),
+        "feed_snapshot":  feed_snapshot.stats(),
+    }
+
+
+# ── Write-side hooks ───────────────────────────────────────────────────────────
+
+async def publish_post_async(post_id: str) -> int:
+    """
+    Fan a newly published post out to its business's followers' inboxes.
+    Returns the number of inboxes written — 0 when the inbox is disabled.
+    """
+    if not config.FEED_INBOX_ENABLED:
+        return 0
+    return await async_db.fan_out_post(post_id)
+
+
+async def following_changed_async(user_id: str) -> None:
+    """
+    Call after the user follows/unfollows: drops their cached following set
+    and their inbox (the next feed re-seeds it).
+    """
+    await async_db.invalidate_following(user_id)
+    if config.FEED_INBOX_ENABLED:
+        await async_db.reset_feed_inbox(user_id)
@@ -0,0 +1,272 @@
+"""
+core/business_table.py
+
+Compact struct-of-arrays table of businesses — no app logic, no DB calls.
+
+The hot fields of every business live in parallel NumPy columns indexed by
+an interned integer row:
+
+  lat, lon      float64  (NaN = no location — never matches a radius query)
+  post_count    int32
+  type_code     int16    (index into the table's businessType vocabulary)
+
+so a radius query or a who-to-follow scoring pass is one vectorised sweep
+over contiguous arrays instead of a walk over dicts. Only businessName and
+username are kept beside the columns, as strings; documents are not kept.
+get_many()/doc() rebuild the FIELDS projection on demand — responses never
+need more.
+
+BusinessRow is a __slots__ view of one row (row()/rows()); it copies
+nothing, so ranking and response building read the columns directly.
+
+Removed rows are recycled, so a long-lived table (db/replica.py) does not
+grow with churn. Not thread-safe — callers that mutate from another thread
+hold their own lock.
+"""
+
+import sys
+
+import numpy as np
+
+import config
+from core.distance import within_radius
+
+_MIN_CAPACITY = 64
+
+# The document fields a table row can reproduce (plus "id")
+FIELDS = ("businessName", "username", "businessType", "postCount", "location")
+
+
+def _post_count(doc: dict) -> int:
+    try:
+        return int(doc.get("postCount") or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+class BusinessRow:
+    """Read-only view of one table row."""
+
+    __slots__ = ("_table", "row")
+
+    def __init__(self, table: "BusinessTable", row: int):
+        self._table = table
+        self.row = row
+
+    @property
+    def id(self) -> str:
+        return self._table._ids[self.row]
+
+    @property
+    def lat(self) -> float:
+        return float(self._table.lat[self.row])
+
+    @property
+    def lon(self) -> float:
+        return float(self._table.lon[self.row])
+
+    @property
+    def post_count(self) -> int:
+        return int(self._table.post_count[self.row])
+
+    @property
+    def business_type(self) -> str:
+        return self._table._types[self._table.type_code[self.row]]
+
+    @property
+    def business_name(self) -> str:
+        return self._table._names[self.row]
+
+    @property
+    def username(self) -> str:
+        return self._table._usernames[self.row]
+
+    def doc(self) -> dict:
+        """The FIELDS projection of this row, as a new dict."""
+        return self._table.doc(self.row)
+
+
+class BusinessTable:
+    """Businesses as NumPy columns behind an interned string → row map."""
+
+    def __init__(self, capacity: int = _MIN_CAPACITY):
+        capacity = max(capacity, 1)
+        self.lat = np.full(capacity, np.nan)
+        self.lon = np.full(capacity, np.nan)
+        self.post_count = np.zeros(capacity, dtype=np.int32)
+        self.type_code = np.zeros(capacity, dtype=np.int16)
+        self._ids: list[str | None] = []
+        self._names: list[str] = []
+        self._usernames: list[str] = []
+        self._rows: dict[str, int] = {}
+        self._free: list[int] = []
+        self._types: list[str] = [""]
+        self._type_codes: dict[str, int] = {"": 0}
+
+    @classmethod
+    def from_docs(cls, docs: dict[str, dict]) -> "BusinessTable":
+        table = cls(capacity=len(docs))
+        for biz_id, doc in docs.items():
+            table.upsert(biz_id, doc)
+        return table
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, biz_id: str) -> bool:
+        return biz_id in self._rows
+
+    # ── Mutation ──────────────────────────────────────────────────────────────
+
+    def upsert(self, biz_id: str, doc: dict) -> int:
+        """Insert or replace a business (doc is not kept). Returns its row."""
+        row = self._rows.get(biz_id)
+        if row is None:
+            row = self._allocate(sys.intern(biz_id))
+
+        loc = doc.get("location") or {}
+        lat, lon = loc.get("latitude"), loc.get("longitude")
+        located = lat is not None and lon is not None
+        self.lat[row] = lat if located else np.nan
+        self.lon[row] = lon if located else np.nan
+        self.post_count[row] = _post_count(doc)
+        self.type_code[row] = self._type_code(doc.get("businessType") or "")
+        self._names[row] = str(doc.get("businessName") or "")
+        self._usernames[row] = str(doc.get("username") or "")
+        return row
+
+    def remove(self, biz_id: str) -> None:
+        """Drop a business. Unknown IDs are ignored."""
+        row = self._rows.pop(biz_id, None)
+        if row is None:
+            return
+        self.lat[row] = self.lon[row] = np.nan
+        self._ids[row] = None
+        self._names[row] = self._usernames[row] = ""
+        self._free.append(row)
+
+    def _allocate(self, biz_id: str) -> int:
+        if self._free:
+            row = self._free.pop()
+            self._ids[row] = biz_id
+        else:
+            row = len(self._ids)
+            if row == len(self.lat):
+                self._grow()
+            self._ids.append(biz_id)
+            self._names.append("")
+            self._usernames.append("")
+        self._rows[biz_id] = row
+        return row
+
+    def _grow(self) -> None:
+        extra = max(len(self.lat), _MIN_CAPACITY)
+        self.lat = np.concatenate([self.lat, np.full(extra, np.nan)])
+        self.lon = np.concatenate([self.lon, np.full(extra, np.nan)])
+        self.post_count = np.concatenate([self.post_count, np.zeros(extra, dtype=np.int32)])
+        self.type_code = np.concatenate([self.type_code, np.zeros(extra, dtype=np.int16)])
+
+    def _type_code(self, business_type: str) -> int:
+        code = self._type_codes.get(business_type)
+        if code is None:
+            code = self._type_codes[business_type] = len(self._types)
+            self._types.append(business_type)
+        return code
+
+    # ── Reads ─────────────────────────────────────────────────────────────────
+
+    def lookup(self, business_ids) -> tuple[list[str], np.ndarray]:
+        """(IDs present in the table, their rows), in the given order."""
+        rows = self._rows
+        ids = [biz_id for biz_id in business_ids if biz_id in rows]
+        return ids, np.fromiter((rows[biz_id] for biz_id in ids), dtype=np.intp, count=len(ids))
+
+    def row(self, biz_id: str) -> BusinessRow | None:
+        row = self._rows.get(biz_id)
+        return None if row is None else BusinessRow(self, row)
+
+    def rows(self, business_ids) -> dict[str, BusinessRow]:
+        """{business_id: BusinessRow} for the IDs present in the table."""
+        rows = self._rows
+        return {
+            biz_id: BusinessRow(self, rows[biz_id])
+            for biz_id in business_ids
+            if biz_id in rows
+        }
+
+    def doc(self, row: int) -> dict:
+        """The FIELDS projection of one row, as a new dict."""
+        doc = {
+            "id":           self._ids[row],
+            "businessName": self._names[row],
+            "username":     self._usernames[row],
+            "businessType": self._types[self.type_code[row]],
+            "postCount":    int(self.post_count[row]),
+        }
+        if not np.isnan(self.lat[row]):
+            doc["location"] = {"latitude": float(self.lat[row]), "longitude": float(self.lon[row])}
+        return doc
+
+    def located_ids(self) -> frozenset[str]:
+        """IDs of the businesses that have a location."""
+        n = len(self._ids)
+        has_location = ~np.isnan(self.lat[:n])
+        return frozenset(self._ids[i] for i in has_location.nonzero()[0])
+
+    def get_many(self, business_ids: list[str]) -> dict[str, dict]:
+        """{business_id: doc()} for the IDs present in the table."""
+        rows = self._rows
+        return {
+            biz_id: self.doc(rows[biz_id])
+            for biz_id in business_ids
+            if biz_id in rows
+        }
+
+    def nearby(
+        self,
+        lat: float,
+        lon: float,
+        max_radius_km: float = config.MAX_RADIUS_KM,
+    ) -> dict[str, float]:
+        """
+        Same contract as DataProvider.get_nearby_businesses — a vectorised
+        bounding-box pass over the lat/lon columns, then exact Haversine on
+        the rows inside the box.
+
+        Returns {business_id: distance_km}, sorted by distance ascending.
+        """
+        n = len(self._ids)
+        if not n:
+            return {}
+        rows, dists = within_radius(lat, lon, self.lat[:n], self.lon[:n], max_radius_km)
+        ids = self._ids
+        result: dict[str, float] = {
+            ids[row]: round(float(dist), 2) for row, dist in zip(rows, dists)
+        }
+        return dict(sorted(result.items(), key=lambda x: x[1]))
+
+    def nearest(
+        self,
+        lat: float,
+        lon: float,
+        k: int,
+        max_radius_km: float,
+    ) -> dict[str, float]:
+        """
+        Same contract as DataProvider.get_nearest_businesses — the radius
+        sweep of nearby(), then a partial sort of the k closest.
+        """
+        n = len(self._ids)
+        if not n or k <= 0:
+            return {}
+        rows, dists = within_radius(lat, lon, self.lat[:n], self.lon[:n], max_radius_km)
+        if len(rows) > k:
+            closest = np.argpartition(dists, k - 1)[:k]
+            rows, dists = rows[closest], dists[closest]
+        order = np.argsort(dists, kind="stable")
+        ids = self._ids
+        return {ids[rows[i]]: round(float(dists[i]), 2) for i in order}
+
+    def nbytes(self) -> int:
+        """Bytes held by the NumPy columns."""
+        return self.lat.nbytes + self.lon.nbytes + self.post_count.nbytes + self.type_code.nbytes
@@ -0,0 +1,281 @@
+"""
+core/candidate_pool.py
+
+Cell-level shared candidate pool for feed requests.
+
+Every user standing in the same geohash cell (config.GEOHASH_PRECISION) sees
+the same nearby businesses and the same recent posts from them — only the
+following set differs. A CandidatePool holds, per center cell:
+
+  • every business within MAX_RADIUS_KM of *any point* of the cell —
+    queried from the cell center with MAX_RADIUS_KM + the cell's
+    half-diagonal. Only default-radius requests use the pool; a request
+    with its own radius_km reads exactly its own cover instead, so its
+    reads scale with the area it asked for
+  • those businesses as a BusinessTable (core/business_table.py) — columns
+    plus name strings; the fetched documents are not kept
+  • their recent skinny post candidates {id, uid, createdAt} — loaded by
+    the first feed request (with_posts), so who-to-follow alone never
+    pays for the post queries
+
+A request then only computes its own exact distances (one vectorised
+Haversine pass over the pool) and fetches posts for followed businesses
+the pool doesn't cover. Pools live in a TTLCache; concurrent misses for
+the same cell are collapsed into one build (per-key lock for sync callers,
+a shared task for async callers), so Firestore reads for a neighbourhood
+no longer grow with the number of users in it.
+
+Who-to-follow ranks from the table's columns and phase-2 hydration takes
+pooled businesses' metadata from its row views (business_rows), so neither costs
+reads for businesses in the pool.
+
+The pool is opt-in (CANDIDATE_POOL_TTL_SECONDS > 0): a miss covers the
+whole cell plus MAX_RADIUS_KM, more cells than one request's own cover,
+so it only pays off where several users share a cell within the TTL.
+"""
+
+import asyncio
+import logging
+import threading
+from collections import defaultdict
+from datetime import datetime
+
+import config
+from core.business_table import BusinessRow, BusinessTable
+from core.distance import haversine_km
+from core.geohash_utils import cell_bounds, encode
+from db.cache import MISSING, TTLCache
+
+logger = logging.getLogger(__name__)
+
+_POSTS_PER_BUSINESS = 5     # same as the feed builders
+_LOCK_STRIPES = 64
+
+
+# ── Pool ──────────────────────────────────────────────────────────────────────
+
+class CandidatePool:
+    """Businesses, their locations and recent post candidates around one cell."""
+
+    def __init__(
+        self,
+        cell: str,
+        radius_km: float,
+        businesses: dict[str, dict],
+        posts: list[dict] | None = None,
+    ):
+        self.cell = cell
+        self.radius_km = radius_km
+        self.table = BusinessTable.from_docs(businesses)
+        self.business_ids = self.table.located_ids()
+        # Post queries go out in nearby order, like an unpooled feed's
+        self.query_ids = [biz_id for biz_id in businesses if biz_id in self.business_ids]
+
+        self._posts_by_business: dict[str, list[dict]] | None = None
+        if posts is not None:
+            self.set_posts(posts)
+
+    @property
+    def has_posts(self) -> bool:
+        return self._posts_by_business is not None
+
+    def set_posts(self, posts: list[dict]) -> None:
+        """Attach the post candidates (published in one assignment)."""
+        by_business: dict[str, list[dict]] = defaultdict(list)
+        for post in posts:
+            by_business[post.get("uid")].append(post)
+        self._posts_by_business = by_business
+
+    def nearby(
+        self,
+        lat: float,
+        lon: float,
+        max_radius_km: float = config.MAX_RADIUS_KM,
+    ) -> dict[str, float]:
+        """
+        Same contract as DataProvider.get_nearby_businesses, served from the
+        pool. Exact for any (lat, lon) inside the pool's cell.
+
+        Returns {business_id: distance_km}, sorted by distance ascending.
+        """
+        return self.table.nearby(lat, lon, max_radius_km)
+
+    def business_rows(self, business_ids: list[str]) -> tuple[dict[str, BusinessRow], list[str]]:
+        """(row views of the pooled IDs, IDs the pool doesn't hold)."""
+        rows = self.table.rows(business_ids)
+        return rows, [biz_id for biz_id in business_ids if biz_id not in rows]
+
+    def split(self, business_ids: list[str]) -> tuple[list[dict], list[str]]:
+        """
+        (pooled post candidates, business IDs the pool doesn't cover).
+        Needs has_posts — get the pool with_posts=True.
+        """
+        pooled: list[dict] = []
+        uncovered: list[str] = []
+        for biz_id in business_ids:
+            if biz_id in self.business_ids:
+                pooled.extend(self._posts_by_business.get(biz_id, ()))
+            else:
+                uncovered.append(biz_id)
+        return pooled, uncovered
+
+
+# ── Building ──────────────────────────────────────────────────────────────────
+
+def _pool_query(cell: str) -> tuple[float, float, float]:
+    """(center_lat, center_lon, query radius) that covers MAX_RADIUS_KM from anywhere in cell."""
+    lat, lon, half_lat, half_lon = cell_bounds(cell)
+    # The corner nearer the equator is the widest one.
+    half_diagonal = max(
+        haversine_km(lat, lon, lat + half_lat, lon + half_lon),
+        haversine_km(lat, lon, lat - half_lat, lon + half_lon),
+    )
+    return lat, lon, config.MAX_RADIUS_KM + half_diagonal
+
+
+def _in_order(nearby: dict[str, float], businesses: dict[str, dict]) -> dict[str, dict]:
+    return {biz_id: businesses[biz_id] for biz_id in nearby if biz_id in businesses}
+
+
+def _build(
+    provider,
+    cell: str,
+    since: datetime | None,
+    with_posts: bool,
+) -> CandidatePool:
+    """
+    DB reads (Firebase): one get_nearby_businesses, + ceil(n/10) post
+    queries with_posts. get_businesses_batch is served by the identity map.
+    """
+    lat, lon, radius_km = _pool_query(cell)
+    nearby = provider.get_nearby_businesses(lat, lon, radius_km)
+    businesses = _in_order(nearby, provider.get_businesses_batch(list(nearby)))
+    posts = _fetch_posts(provider, list(nearby), since) if with_posts else None
+    logger.debug(f"candidate pool {cell}: {len(businesses)} businesses, posts: {with_posts}")
+    return CandidatePool(cell, radius_km, businesses, posts)
+
+
+async def _build_async(
+    provider,
+    cell: str,
+    since: datetime | None,
+    with_posts: bool,
+) -> CandidatePool:
+    lat, lon, radius_km = _pool_query(cell)
+    nearby = await provider.get_nearby_businesses(lat, lon, radius_km)
+    if with_posts:
+        businesses, posts = await asyncio.gather(
+            provider.get_businesses_batch(list(nearby)),
+            _fetch_posts_async(provider, list(nearby), since),
+        )
+    else:
+        businesses, posts = await provider.get_businesses_batch(list(nearby)), None
+    logger.debug(f"candidate pool {cell}: {len(businesses)} businesses, posts: {with_posts}")
+    return CandidatePool(cell, radius_km, _in_order(nearby, businesses), posts)
+
+
+def _fetch_posts(provider, business_ids: list[str], since: datetime | None) -> list[dict]:
+    """DB reads (Firebase): ceil(n/10) projected post queries."""
+    return provider.get_post_candidates(
+        business_ids, limit_per_business=_POSTS_PER_BUSINESS, since=since
+    )
+
+
+async def _fetch_posts_async(
+    provider,
+    business_ids: list[str],
+    since: datetime | None,
+) -> list[dict]:
+    return await provider.get_post_candidates(
+        business_ids, limit_per_business=_POSTS_PER_BUSINESS, since=since
+    )
+
+
+async def _load_posts_async(provider, pool: CandidatePool, since: datetime | None) -> None:
+    pool.set_posts(await _fetch_posts_async(provider, pool.query_ids, since))
+
+
+# ── Cache ─────────────────────────────────────────────────────────────────────
+
+_pools = TTLCache(
+    ttl_seconds=config.CANDIDATE_POOL_TTL_SECONDS,
+    max_entries=config.CANDIDATE_POOL_MAX_ENTRIES,
+)
+_locks = [threading.Lock() for _ in range(_LOCK_STRIPES)]
+_inflight: dict[tuple, asyncio.Task] = {}
+
+
+def enabled() -> bool:
+    return _pools.enabled
+
+
+def _key(lat: float, lon: float) -> tuple:
+    # The window is part of the key so a config change never serves old posts.
+    return encode(lat, lon), config.FEED_POSTS_WINDOW_HOURS
+
+
+def get_pool(
+    provider,
+    lat: float,
+    lon: float,
+    since: datetime | None = None,
+    with_posts: bool = True,
+) -> CandidatePool:
+    """
+    Pool for the cell containing (lat, lon) — built at most once per TTL.
+    since is the feed's createdAt window, applied when the posts are loaded.
+    The pool covers MAX_RADIUS_KM — for default-radius requests only.
+    with_posts=False (who-to-follow) skips the post queries; the first
+    with_posts caller loads them.
+    """
+    key = _key(lat, lon)
+    pool = _pools.get(key)
+    if pool is MISSING or (with_posts and not pool.has_posts):
+        with _locks[hash(key) % _LOCK_STRIPES]:
+            pool = _pools.get(key)
+            if pool is MISSING:
+                pool = _build(provider, key[0], since, with_posts)
+                _pools.set(key, pool)
+            elif with_posts and not pool.has_posts:
+                pool.set_posts(_fetch_posts(provider, pool.query_ids, since))
+    return pool
+
+
+async def get_pool_async(
+    provider,
+    lat: float,
+    lon: float,
+    since: datetime | None = None,
+    with_posts: bool = True,
+) -> CandidatePool:
+    """
+    Async get_pool — concurrent misses for one cell await the same build,
+    and concurrent post loads for one pool the same fetch.
+    """
+    key = _key(lat, lon)
+    pool = _pools.get(key)
+    if pool is MISSING:
+        pool = await _shared(key, lambda: _build_async(provider, key[0], since, with_posts))
+        _pools.set(key, pool)
+    if with_posts and not pool.has_posts:
+        await _shared(key + ("posts",), lambda: _load_posts_async(provider, pool, since))
+    return pool
+
+
+async def _shared(key: tuple, start):
+    """Await the in-flight task for key, starting it with start() if there is none."""
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(start())
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    return await asyncio.shield(task)
+
+
+def clear() -> None:
+    """Drop every pool (tests, or after bulk data changes)."""
+    _pools.clear()
+
+
+def stats() -> dict:
+    return _pools.stats()
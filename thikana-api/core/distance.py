@@ -0,0 +1,104 @@
+"""
+core/distance.py
+
+Great-circle distance kernels — pure math, no app logic, no DB calls.
+
+  haversine_km        one pair of coordinates  → float
+  haversine_km_batch  one origin, N candidates → np.ndarray of N distances
+  within_radius       one origin, N candidates → (indices, distances) of those
+                      within a radius — bounding-box rejection first, exact
+                      Haversine on the survivors only
+
+Use the batch kernel whenever there is more than a handful of candidates:
+one vectorised pass over N points is far cheaper than N Python calls.
+"""
+
+import math
+
+import numpy as np
+
+EARTH_RADIUS_KM: float = 6371.0
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Haversine formula — distance between two coordinates in kilometres."""
+    dlat = math.radians(lat2 - lat1)
+    dlon = math.radians(lon2 - lon1)
+    a = (
+        math.sin(dlat / 2) ** 2
+        + math.cos(math.radians(lat1))
+        * math.cos(math.radians(lat2))
+        * math.sin(dlon / 2) ** 2
+    )
+    return EARTH_RADIUS_KM * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+def haversine_km_batch(lat: float, lon: float, lats, lons) -> np.ndarray:
+    """
+    Distance in km from one origin (lat, lon) to every (lats[i], lons[i]).
+
+    lats / lons may be lists or arrays of equal length. NaN coordinates
+    produce NaN distances, so callers can keep missing locations in place.
+    """
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+
+    dlat = np.radians(lats - lat)
+    dlon = np.radians(lons - lon)
+    a = (
+        np.sin(dlat / 2) ** 2
+        + math.cos(math.radians(lat))
+        * np.cos(np.radians(lats))
+        * np.sin(dlon / 2) ** 2
+    )
+    return EARTH_RADIUS_KM * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+# Widen the box a hair so float rounding never rejects a point Haversine keeps
+_BOX_SLACK: float = 1e-9
+
+
+def bounding_box(lat: float, radius_km: float) -> tuple[float, float]:
+    """
+    (half-height, half-width) in degrees of the smallest lat/lon box around
+    every point within radius_km of latitude lat. The half-width is 180
+    (no longitude bound) when the circle reaches a pole.
+    """
+    angle = radius_km / EARTH_RADIUS_KM * (1 + _BOX_SLACK)    # radians
+    d_lat = math.degrees(angle)
+    if abs(lat) + d_lat >= 90.0:
+        return d_lat, 180.0
+    ratio = math.sin(angle) / math.cos(math.radians(lat))
+    return d_lat, math.degrees(math.asin(min(ratio, 1.0)))
+
+
+def within_radius(
+    lat: float,
+    lon: float,
+    lats,
+    lons,
+    max_radius_km: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (indices, distances_km) of the candidates within max_radius_km of
+    (lat, lon), in input order.
+
+    A vectorised bounding-box test rejects candidates that cannot be in
+    range; haversine_km_batch runs on the survivors only, so distances are
+    exactly what it returns for the full set. NaN coordinates never match.
+    """
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+
+    d_lat, d_lon = bounding_box(lat, max_radius_km)
+    keep = np.abs(lats - lat) <= d_lat
+    if d_lon < 180.0:
+        if abs(lon) + d_lon < 180.0:
+            keep &= np.abs(lons - lon) <= d_lon
+        else:                                          # box crosses the antimeridian
+            keep &= np.abs((lons - lon + 180.0) % 360.0 - 180.0) <= d_lon
+    candidates = keep.nonzero()[0]
+
+    dists = haversine_km_batch(lat, lon, lats[candidates], lons[candidates])
+    hit = dists <= max_radius_km
+    return candidates[hit], dists[hit]
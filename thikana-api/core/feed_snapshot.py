@@ -0,0 +1,127 @@
+"""
+core/feed_snapshot.py
+
+Ranked feed snapshots behind cursor pagination (/feed/{user_id}?cursor=...).
+
+The first page of a feed ranks up to FEED_SNAPSHOT_MAX_POSTS candidates and
+stores them here as compact RankedPost records, together
+with the following set and distances needed to present them. Later pages
+slice the snapshot instead of re-running the ranking pipeline, so scrolling
+costs only the page's own hydration reads and the order stays stable while
+the user scrolls.
+
+Snapshots are per user (a new first page replaces the old one) and live in
+a TTLCache — LRU-bounded by FEED_SNAPSHOT_MAX_ENTRIES, expiring after
+FEED_SNAPSHOT_TTL_SECONDS.
+
+Cursors are opaque to clients: urlsafe base64 of "<snapshot_id>.<offset>".
+"""
+
+import base64
+import binascii
+import secrets
+
+import config
+from core.records import RankedPost
+from db.cache import MISSING, TTLCache
+
+
+class InvalidCursor(ValueError):
+    """A cursor that was not produced by encode_cursor."""
+
+
+class FeedSnapshot:
+    """One user's ranked feed, best first."""
+
+    def __init__(
+        self,
+        snapshot_id: str,
+        rows: list[RankedPost],
+        following: frozenset[str],
+        nearby: dict[str, float],
+    ):
+        self.snapshot_id = snapshot_id
+        self.rows = rows
+        self.following = following
+        self.nearby = nearby
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def page(self, offset: int, limit: int) -> tuple[list[RankedPost], str | None]:
+        """
+        (rows offset..offset+limit, next cursor).
+        The next cursor is None on the last page.
+        """
+        end = offset + limit
+        next_cursor = encode_cursor(self.snapshot_id, end) if end < len(self.rows) else None
+        return self.rows[offset:end], next_cursor
+
+
+_snapshots = TTLCache(
+    ttl_seconds=config.FEED_SNAPSHOT_TTL_SECONDS,
+    max_entries=config.FEED_SNAPSHOT_MAX_ENTRIES,
+)
+
+
+def enabled() -> bool:
+    return _snapshots.enabled
+
+
+# ── Cursors ───────────────────────────────────────────────────────────────────
+
+def encode_cursor(snapshot_id: str, offset: int) -> str:
+    raw = f"{snapshot_id}.{offset}".encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> tuple[str, int]:
+    """(snapshot_id, offset). Raises InvalidCursor if the cursor is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        snapshot_id, offset = raw.rsplit(".", 1)
+        offset = int(offset)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursor("invalid cursor") from None
+    if not snapshot_id or offset < 0:
+        raise InvalidCursor("invalid cursor")
+    return snapshot_id, offset
+
+
+# ── Store ─────────────────────────────────────────────────────────────────────
+
+def save(
+    user_id: str,
+    selected: list[RankedPost],
+    following_set: frozenset[str],
+    nearby: dict[str, float],
+) -> FeedSnapshot:
+    """Store a ranked list as the user's current snapshot (replacing any older one)."""
+    business_ids = {ranked.uid for ranked in selected}
+    snapshot = FeedSnapshot(
+        snapshot_id=secrets.token_urlsafe(8),
+        rows=selected,
+        # Only what presenting these rows needs — keeps snapshots small
+        following=frozenset(following_set & business_ids),
+        nearby={biz_id: d for biz_id, d in nearby.items() if biz_id in business_ids},
+    )
+    _snapshots.set(user_id, snapshot)
+    return snapshot
+
+
+def load(user_id: str, snapshot_id: str | None) -> FeedSnapshot | None:
+    """The user's snapshot if it is still cached and is the one the cursor points at."""
+    if snapshot_id is None:
+        return None
+    snapshot = _snapshots.get(user_id)
+    if snapshot is MISSING or snapshot.snapshot_id != snapshot_id:
+        return None
+    return snapshot
+
+
+def clear() -> None:
+    _snapshots.clear()
+
+
+def stats() -> dict:
+    return _snapshots.stats()
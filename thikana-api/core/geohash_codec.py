@@ -0,0 +1,211 @@
+"""
+core/geohash_codec.py
+
+Integer geohash codec — pure bit math, no app logic, no DB calls.
+
+A geohash of precision p is 5·p bits: longitude and latitude bits
+interleaved, longitude first. Held as an int, a cell is just its
+quantized column / row:
+
+  x = lon column in [0, 2^lon_bits)     lon_bits = ceil(5p / 2)
+  y = lat row    in [0, 2^lat_bits)     lat_bits = floor(5p / 2)
+
+so encoding is two multiplies and a bit interleave, and a neighbour is
+x ± 1 / y ± 1 (longitude wraps, latitude stops at the poles) — O(1), no
+string manipulation. base32 strings (the IDs stored in location_index)
+are only produced at the edge, 5 bits per character.
+
+  encode / encode_batch   lat, lon (scalar or NumPy arrays) → int codes
+  to_base32 / from_base32 int ↔ geohash string
+  neighbours              center + 8 neighbours as int codes
+  bounds                  center and half-extents of a cell
+  grid / from_xy / to_xy  the precision's column × row grid, cell ↔ (x, y)
+
+Points exactly on a cell edge go to the cell above / to the right, and the
++90 / +180 edges fold into the last row / column — the same cells
+pygeohash returns.
+"""
+
+import numpy as np
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+MAX_PRECISION = 12                      # 60 bits — fits a uint64
+
+_DECODE = {ch: i for i, ch in enumerate(BASE32)}
+_BASE32_BYTES = np.frombuffer(BASE32.encode(), dtype=np.uint8)
+_PAIRS = [a + b for a in BASE32 for b in BASE32]   # 10 bits → 2 characters
+
+# Neighbour offsets (dx = lon columns, dy = lat rows), in get_search_cells order
+NEIGHBOUR_OFFSETS: tuple[tuple[int, int], ...] = (
+    (0, 0),                             # center
+    (0, 1), (0, -1), (1, 0), (-1, 0),   # top, bottom, right, left
+    (1, 1), (-1, 1), (1, -1), (-1, -1), # NE, NW, SE, SW
+)
+
+
+def _bits(precision: int) -> tuple[int, int]:
+    """(lon_bits, lat_bits) for a precision."""
+    if not 1 <= precision <= MAX_PRECISION:
+        raise ValueError(f"precision must be 1–{MAX_PRECISION}, got {precision}")
+    total = 5 * precision
+    return (total + 1) // 2, total // 2
+
+
+# ── Bit interleaving ──────────────────────────────────────────────────────────
+
+def _spread_byte(b: int) -> int:
+    return sum(((b >> i) & 1) << (2 * i) for i in range(8))
+
+
+_SPREAD = [_spread_byte(b) for b in range(256)]
+
+
+def _spread(v: int) -> int:
+    """Move bit i of a (≤ 32-bit) value to bit 2i — one table lookup per byte."""
+    out = _SPREAD[v & 0xFF] | _SPREAD[(v >> 8) & 0xFF] << 16
+    if v >> 16:
+        out |= _SPREAD[(v >> 16) & 0xFF] << 32 | _SPREAD[v >> 24] << 48
+    return out
+
+
+def _squash(v):
+    """Inverse of _spread: bit 2i → bit i (odd bits ignored)."""
+    v = v & 0x5555555555555555
+    v = (v | (v >> 1))  & 0x3333333333333333
+    v = (v | (v >> 2))  & 0x0F0F0F0F0F0F0F0F
+    v = (v | (v >> 4))  & 0x00FF00FF00FF00FF
+    v = (v | (v >> 8))  & 0x0000FFFF0000FFFF
+    v = (v | (v >> 16)) & 0x00000000FFFFFFFF
+    return v
+
+
+def _shifts(precision: int) -> tuple[int, int]:
+    """(x shift, y shift) after spreading — the last bit is lon when 5p is odd."""
+    return (0, 1) if precision % 2 else (1, 0)
+
+
+def _interleave(x: int, y: int, precision: int) -> int:
+    sx, sy = _shifts(precision)
+    return (_spread(x) << sx) | (_spread(y) << sy)
+
+
+def _deinterleave(code: int, precision: int) -> tuple[int, int]:
+    if precision % 2:
+        return _squash(code), _squash(code >> 1)
+    return _squash(code >> 1), _squash(code)
+
+
+# ── Encoding ──────────────────────────────────────────────────────────────────
+
+def encode(lat: float, lon: float, precision: int) -> int:
+    """Integer geohash of one coordinate."""
+    lon_bits, lat_bits = _bits(precision)
+    x = min(int((lon + 180.0) / 360.0 * (1 << lon_bits)), (1 << lon_bits) - 1)
+    y = min(int((lat + 90.0) / 180.0 * (1 << lat_bits)), (1 << lat_bits) - 1)
+    return _interleave(max(x, 0), max(y, 0), precision)
+
+
+def encode_batch(lats, lons, precision: int) -> np.ndarray:
+    """Integer geohashes of N coordinates in one vectorised pass → uint64 array."""
+    lon_bits, lat_bits = _bits(precision)
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+    x = np.floor((lons + 180.0) / 360.0 * (1 << lon_bits))
+    y = np.floor((lats + 90.0) / 180.0 * (1 << lat_bits))
+    x = np.clip(x, 0, (1 << lon_bits) - 1).astype(np.uint64)
+    y = np.clip(y, 0, (1 << lat_bits) - 1).astype(np.uint64)
+    one = np.uint64(1)
+    if precision % 2:
+        return _spread_np(x) | (_spread_np(y) << one)
+    return (_spread_np(x) << one) | _spread_np(y)
+
+
+def _spread_np(v: np.ndarray) -> np.ndarray:
+    for shift, mask in (
+        (16, 0x0000FFFF0000FFFF),
+        (8,  0x00FF00FF00FF00FF),
+        (4,  0x0F0F0F0F0F0F0F0F),
+        (2,  0x3333333333333333),
+        (1,  0x5555555555555555),
+    ):
+        v = (v | (v << np.uint64(shift))) & np.uint64(mask)
+    return v
+
+
+# ── base32 ────────────────────────────────────────────────────────────────────
+
+def to_base32(code: int, precision: int) -> str:
+    """Integer geohash → the usual geohash string."""
+    out = BASE32[code >> (5 * (precision - 1))] if precision % 2 else ""
+    for shift in range(10 * (precision // 2) - 10, -1, -10):
+        out += _PAIRS[(code >> shift) & 1023]
+    return out
+
+
+def to_base32_batch(codes: np.ndarray, precision: int) -> list[str]:
+    """Vectorised to_base32 for a uint64 array."""
+    codes = np.asarray(codes, dtype=np.uint64)
+    shifts = np.arange(precision - 1, -1, -1, dtype=np.uint64) * np.uint64(5)
+    digits = (codes[:, None] >> shifts) & np.uint64(31)
+    chars = _BASE32_BYTES[digits.astype(np.intp)]
+    return np.ascontiguousarray(chars).view(f"S{precision}").ravel().astype(str).tolist()
+
+
+def from_base32(geohash: str) -> tuple[int, int]:
+    """Geohash string → (integer code, precision)."""
+    code = 0
+    try:
+        for ch in geohash:
+            code = (code << 5) | _DECODE[ch]
+    except KeyError:
+        raise ValueError(f"invalid geohash: {geohash!r}") from None
+    _bits(len(geohash))
+    return code, len(geohash)
+
+
+# ── Cell arithmetic ───────────────────────────────────────────────────────────
+
+def grid(precision: int) -> tuple[int, int]:
+    """(columns, rows) of the precision's cell grid."""
+    lon_bits, lat_bits = _bits(precision)
+    return 1 << lon_bits, 1 << lat_bits
+
+
+def from_xy(x: int, y: int, precision: int) -> int:
+    """Cell at column x (from -180°) and row y (from -90°)."""
+    return _interleave(x, y, precision)
+
+
+def to_xy(code: int, precision: int) -> tuple[int, int]:
+    """(column, row) of a cell."""
+    return _deinterleave(code, precision)
+
+
+def neighbours(code: int, precision: int) -> list[int]:
+    """
+    Center + 8 neighbours (top, bottom, right, left, NE, NW, SE, SW).
+    Longitude wraps at ±180°; rows past a pole are clamped, so polar
+    cells repeat — callers that need distinct cells dedupe.
+    """
+    lon_bits, lat_bits = _bits(precision)
+    x, y = _deinterleave(code, precision)
+    n_cols, max_row = 1 << lon_bits, (1 << lat_bits) - 1
+    sx, sy = _shifts(precision)
+    # Spread each of the 3 columns / 3 rows once, then OR the 9 pairs.
+    cols = {dx: _spread((x + dx) % n_cols) << sx for dx in (-1, 0, 1)}
+    rows = {dy: _spread(min(max(y + dy, 0), max_row)) << sy for dy in (-1, 0, 1)}
+    return [cols[dx] | rows[dy] for dx, dy in NEIGHBOUR_OFFSETS]
+
+
+def bounds(code: int, precision: int) -> tuple[float, float, float, float]:
+    """(center_lat, center_lon, half_height_deg, half_width_deg) of a cell."""
+    lon_bits, lat_bits = _bits(precision)
+    x, y = _deinterleave(code, precision)
+    half_lat = 90.0 / (1 << lat_bits)
+    half_lon = 180.0 / (1 << lon_bits)
+    return (
+        -90.0 + (2 * y + 1) * half_lat,
+        -180.0 + (2 * x + 1) * half_lon,
+        half_lat,
+        half_lon,
+    )
@@ -2,7 +2,8 @@
 core/geohash_utils.py
 
 Pure spatial math — no app logic, no DB calls.
-Uses pygeohash (pure Python, no C compiler needed).
+String-level geohash helpers over the integer codec in core/geohash_codec.py
+(location_index document IDs are base32 geohash strings).
 
 PRECISION GUIDE:
   precision=4 → ~40km cell   (city-level)
@@ -10,15 +11,25 @@ PRECISION GUIDE:
   precision=6 → ~600m cell   (street-level)
 
 9 cells (center + 8 neighbours) at precision=5 covers ~15km search zone.
+For an arbitrary radius use cover_cells — the exact set of indexed cells
+the search circle touches, at the finest precision that stays within
+GEOHASH_COVER_MAX_CELLS.
 """
 
-import pygeohash as pgh
+import math
+from functools import lru_cache
+
+import numpy as np
+
+import config
 from config import GEOHASH_PRECISION
+from core import geohash_codec
+from core.distance import EARTH_RADIUS_KM, haversine_km_batch
 
 
 def encode(lat: float, lon: float, precision: int = GEOHASH_PRECISION) -> str:
     """Encode a lat/lon coordinate into a geohash string."""
-    return pgh.encode(lat, lon, precision)
+    return geohash_codec.to_base32(geohash_codec.encode(lat, lon, precision), precision)
 
 
 def get_search_cells(lat: float, lon: float, precision: int = GEOHASH_PRECISION) -> list[str]:
@@ -28,19 +39,119 @@ def get_search_cells(lat: float, lon: float, precision: int = GEOHASH_PRECISION)
 
     Example for lat=18.52, lon=73.85, precision=5:
     → 9 strings like ['tfe72', 'tfe73', 'tfe70', 'tfe71', ...]
+
+    Neighbours are integer arithmetic on the center cell; the strings for a
+    center are memoised, so a repeat cell costs one encode and a dict hit.
+    Cells touching a pole return fewer than 9 (no duplicates).
+    """
+    return list(_search_cells(geohash_codec.encode(lat, lon, precision), precision))
+
+
+@lru_cache(maxsize=16_384)
+def _search_cells(center: int, precision: int) -> tuple[str, ...]:
+    cells = geohash_codec.neighbours(center, precision)
+    return tuple(dict.fromkeys(geohash_codec.to_base32(c, precision) for c in cells))
+
+
+def cover_cells(
+    lat: float,
+    lon: float,
+    radius_km: float,
+    precisions: tuple[int, ...] | None = None,
+) -> list[str]:
+    """
+    Every cell that intersects the circle of radius_km around (lat, lon) —
+    no cell is missed near an edge, none lies wholly outside the circle.
+
+    precisions are the ones location_index holds (default
+    config.GEOHASH_INDEX_PRECISIONS). The finest whose cover has at most
+    config.GEOHASH_COVER_MAX_CELLS cells wins, so small radii read a few
+    small cells and large radii a few large ones; if every cover is over
+    budget the coarsest precision is used.
     """
-    center = pgh.encode(lat, lon, precision)
-    neighbours = [
-        pgh.get_adjacent(center, "top"),
-        pgh.get_adjacent(center, "bottom"),
-        pgh.get_adjacent(center, "right"),
-        pgh.get_adjacent(center, "left"),
-        pgh.get_adjacent(pgh.get_adjacent(center, "top"),    "right"),  # NE
-        pgh.get_adjacent(pgh.get_adjacent(center, "top"),    "left"),   # NW
-        pgh.get_adjacent(pgh.get_adjacent(center, "bottom"), "right"),  # SE
-        pgh.get_adjacent(pgh.get_adjacent(center, "bottom"), "left"),   # SW
+    precisions = sorted(precisions or config.GEOHASH_INDEX_PRECISIONS, reverse=True)
+    budget = config.GEOHASH_COVER_MAX_CELLS
+    for precision in precisions[:-1]:
+        rows, cols = _cover_block(lat, lon, radius_km, precision)
+        # The block bounds the cover; the disc fills ≥ π/4 of it.
+        if len(rows) * len(cols) * math.pi / 4 > budget:
+            continue
+        cells = _cover(lat, lon, radius_km, precision, rows, cols)
+        if len(cells) <= budget:
+            return cells
+    precision = precisions[-1]
+    return _cover(lat, lon, radius_km, precision, *_cover_block(lat, lon, radius_km, precision))
+
+
+def _cover_block(
+    lat: float,
+    lon: float,
+    radius_km: float,
+    precision: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """(row indices, column indices) of the cells overlapping the circle's bounding box."""
+    n_cols, n_rows = geohash_codec.grid(precision)
+    cell_h, cell_w = 180.0 / n_rows, 360.0 / n_cols
+    ang = radius_km / EARTH_RADIUS_KM                       # radians
+    d_lat = math.degrees(ang)
+
+    lat_lo, lat_hi = max(lat - d_lat, -90.0), min(lat + d_lat, 90.0)
+    rows = np.arange(
+        min(int((lat_lo + 90.0) / cell_h), n_rows - 1),
+        min(int((lat_hi + 90.0) / cell_h), n_rows - 1) + 1,
+    )
+
+    # Widest longitude extent of a spherical cap; a pole inside → every column
+    if lat_hi >= 90.0 or lat_lo <= -90.0 or math.sin(ang) >= math.cos(math.radians(lat)):
+        return rows, np.arange(n_cols)
+    d_lon = math.degrees(math.asin(math.sin(ang) / math.cos(math.radians(lat))))
+    first = math.floor((lon - d_lon + 180.0) / cell_w)
+    last = math.floor((lon + d_lon + 180.0) / cell_w)
+    if last - first + 1 >= n_cols:
+        return rows, np.arange(n_cols)
+    return rows, np.arange(first, last + 1) % n_cols
+
+
+def _cover(
+    lat: float,
+    lon: float,
+    radius_km: float,
+    precision: int,
+    rows: np.ndarray,
+    cols: np.ndarray,
+) -> list[str]:
+    """The cells of the block whose nearest point is within radius_km."""
+    n_cols, n_rows = geohash_codec.grid(precision)
+    cell_h, cell_w = 180.0 / n_rows, 360.0 / n_cols
+    y, x = (a.ravel() for a in np.meshgrid(rows, cols, indexing="ij"))
+
+    lat_min = -90.0 + y * cell_h
+    lon_min = -180.0 + x * cell_w
+    # Longitude offset to the nearest meridian edge (0 when inside the column)
+    to_min = (lon - lon_min) % 360.0
+    inside = to_min <= cell_w
+    d_lon = np.where(inside, 0.0, np.minimum(to_min - cell_w, 360.0 - to_min))
+    edge_lon = np.where(to_min - cell_w < 360.0 - to_min, lon_min + cell_w, lon_min)
+    edge_lon = np.where(inside, lon, edge_lon)
+
+    # Nearest point on that meridian: latitude atan(tan φ / cos Δλ), clamped to the cell
+    phi = np.degrees(np.arctan2(math.tan(math.radians(lat)), np.cos(np.radians(d_lon))))
+    near_lat = np.clip(np.where(inside, lat, phi), lat_min, lat_min + cell_h)
+
+    dist = haversine_km_batch(lat, lon, near_lat, edge_lon)
+    hit = dist <= radius_km * (1 + 1e-9)
+    return [
+        geohash_codec.to_base32(geohash_codec.from_xy(int(cx), int(cy), precision), precision)
+        for cx, cy in zip(x[hit], y[hit])
     ]
-    return [center] + neighbours  # 9 cells total
+
+
+def cell_bounds(cell: str) -> tuple[float, float, float, float]:
+    """
+    Center and half-extents of a geohash cell:
+    (center_lat, center_lon, half_height_deg, half_width_deg).
+    """
+    return geohash_codec.bounds(*geohash_codec.from_base32(cell))
 
 
 def cell_for_business(lat: float, lon: float) -> str:
@@ -0,0 +1,51 @@
+"""
+core/records.py
+
+Slotted records for the feed hot path — no app logic, no DB calls.
+
+Providers hand the assembler plain post dicts, and those dicts are often
+shared: MockDB returns its own snapshot objects, FirebaseDB's identity map
+and the candidate pool hand the same dict to many callers. The ranking
+stages therefore work on small read-only records instead, and response
+dicts are materialized (copied) only for the posts of the returned page.
+
+  PostCandidate  one post to rank      id, uid, created_at (epoch s, NaN = unknown)
+  RankedPost     one selected post     id, uid, score
+
+Both use __slots__, so a candidate costs three pointers, not a dict.
+"""
+
+from core.scorer import created_epoch
+
+
+class PostCandidate:
+    """Ranking fields of one post, createdAt parsed once."""
+
+    __slots__ = ("id", "uid", "created_at")
+
+    def __init__(self, id: str, uid: str, created_at: float):
+        self.id = id
+        self.uid = uid
+        self.created_at = created_at
+
+    @classmethod
+    def from_post(cls, post: dict) -> "PostCandidate":
+        """From any post dict with id, uid and createdAt (skinny or full)."""
+        return cls(post.get("id"), post.get("uid"), created_epoch(post.get("createdAt")))
+
+    def __repr__(self) -> str:
+        return f"PostCandidate({self.id!r}, {self.uid!r}, {self.created_at!r})"
+
+
+class RankedPost:
+    """A post that made the ranking, with its score."""
+
+    __slots__ = ("id", "uid", "score")
+
+    def __init__(self, id: str, uid: str, score: float):
+        self.id = id
+        self.uid = uid
+        self.score = score
+
+    def __repr__(self) -> str:
+        return f"RankedPost({self.id!r}, {self.uid!r}, {self.score!r})"
@@ -2,31 +2,24 @@
 core/scorer.py
 
 Pure scoring logic — NO database calls, NO I/O, NO side effects.
-Every function takes plain Python dicts and returns a float in [0.0, 1.0].
+Single-item functions take plain Python dicts and return a float in [0.0, 1.0];
+the *_batch functions take NumPy columns and return an array of such floats.
 All weights and constants come from config.py.
 """
 
-import math
 from datetime import datetime, timezone
+from typing import TYPE_CHECKING
 
-import config
+import numpy as np
 
+import config
+from core.distance import haversine_km
 
-# ── Helpers ───────────────────────────────────────────────────────────────────
+if TYPE_CHECKING:
+    from core.records import PostCandidate
 
-def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    """Haversine formula — distance between two coordinates in kilometres."""
-    R = 6371.0
-    dlat = math.radians(lat2 - lat1)
-    dlon = math.radians(lon2 - lon1)
-    a = (
-        math.sin(dlat / 2) ** 2
-        + math.cos(math.radians(lat1))
-        * math.cos(math.radians(lat2))
-        * math.sin(dlon / 2) ** 2
-    )
-    return R * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
 
+# ── Helpers ───────────────────────────────────────────────────────────────────
 
 def _parse_utc(dt_value) -> datetime | None:
     """
@@ -50,8 +43,94 @@ def _parse_utc(dt_value) -> datetime | None:
     return None
 
 
+def created_epoch(dt_value) -> float:
+    """createdAt (any _parse_utc format) → epoch seconds, NaN if unparseable."""
+    created_dt = _parse_utc(dt_value)
+    return created_dt.timestamp() if created_dt else float("nan")
+
+
 # ── Public scoring functions ──────────────────────────────────────────────────
 
+def score_posts_batch(
+    biz_index: np.ndarray,
+    created_at: np.ndarray,
+    following: np.ndarray,
+    biz_distance_km: np.ndarray,
+    now: float | None = None,
+) -> np.ndarray:
+    """
+    Score N posts in ONE vectorised pass. Returns float array in [0.0, 1.0].
+
+    Columns (one entry per post):
+      biz_index   int   — row of the post's business in biz_distance_km
+      created_at  float — createdAt as epoch seconds (NaN = unknown)
+      following   bool  — True if the user follows the post's business
+    Per-business column:
+      biz_distance_km float — user → business distance (NaN = unknown/far)
+
+    `now` is epoch seconds, read once for the whole batch when omitted.
+    Same signals and weights as score_post.
+    """
+    if now is None:
+        now = datetime.now(timezone.utc).timestamp()
+
+    # Signal 1 — Following (binary: 0 or 1)
+    following_signal = np.asarray(following, dtype=np.float64)
+
+    # Signal 2 — Location (1.0 at 0km, 0.0 at MAX_RADIUS_KM)
+    dist = np.asarray(biz_distance_km, dtype=np.float64)[biz_index]
+    location_signal = np.nan_to_num(
+        np.maximum(0.0, 1.0 - dist / config.MAX_RADIUS_KM), nan=0.0
+    )
+
+    # Signal 3 — Recency (1.0 = just posted, 0.0 = older than 7 days)
+    hours_old = (now - np.asarray(created_at, dtype=np.float64)) / 3600
+    recency_signal = np.nan_to_num(
+        np.maximum(0.0, 1.0 - hours_old / config.RECENCY_WINDOW_HOURS), nan=0.0
+    )
+
+    return np.round(
+        following_signal * config.POST_WEIGHT_FOLLOWING
+        + location_signal  * config.POST_WEIGHT_LOCATION
+        + recency_signal   * config.POST_WEIGHT_RECENCY,
+        4,
+    )
+
+
+def score_candidates(
+    candidates: list["PostCandidate"],
+    following_ids: frozenset[str],
+    business_distances: dict[str, float],
+    now: float | None = None,
+) -> np.ndarray:
+    """
+    Build the score_posts_batch columns from PostCandidate records and score
+    them — createdAt is already parsed, so this is attribute reads only.
+
+    business_distances is the {business_id: distance_km} map returned by
+    db.get_nearby_businesses — no distance is recomputed. Businesses missing
+    from it are outside the request's search radius (radius_km, default
+    MAX_RADIUS_KM), so their location signal is 0 — this includes followed
+    businesses within MAX_RADIUS_KM when the caller narrows radius_km.
+    """
+    biz_rows: dict[str, int] = {}
+    biz_index = np.empty(len(candidates), dtype=np.intp)
+    created_at = np.empty(len(candidates), dtype=np.float64)
+    following = np.empty(len(candidates), dtype=bool)
+
+    for i, candidate in enumerate(candidates):
+        business_id = candidate.uid or ""
+        biz_index[i] = biz_rows.setdefault(business_id, len(biz_rows))
+        created_at[i] = candidate.created_at
+        following[i] = business_id in following_ids
+
+    biz_distance_km = np.array(
+        [business_distances.get(biz_id, np.nan) for biz_id in biz_rows],
+        dtype=np.float64,
+    )
+    return score_posts_batch(biz_index, created_at, following, biz_distance_km, now)
+
+
 def score_post(
     post: dict,
     following_ids: set[str],
@@ -61,6 +140,7 @@ def score_post(
 ) -> float:
     """
     Score a single post candidate. Returns float in [0.0, 1.0].
+    Thin wrapper over score_posts_batch — prefer score_candidates for many posts.
 
     Signals:
       following_signal  (config.POST_WEIGHT_FOLLOWING = 0.55)
@@ -69,46 +149,56 @@ def score_post(
     """
     business_id = post.get("uid", "")
 
-    # Signal 1 — Following (binary: 0 or 1)
-    following_signal = 1.0 if business_id in following_ids else 0.0
-
-    # Signal 2 — Location (1.0 at 0km, 0.0 at MAX_RADIUS_KM)
-    location_signal = 0.0
+    dist = None
     biz_loc = business_locations.get(business_id)
     if biz_loc and biz_loc.get("latitude") and biz_loc.get("longitude"):
         dist = haversine_km(user_lat, user_lon, biz_loc["latitude"], biz_loc["longitude"])
-        location_signal = max(0.0, 1.0 - dist / config.MAX_RADIUS_KM)
-
-    # Signal 3 — Recency (1.0 = just posted, 0.0 = older than 7 days)
-    recency_signal = 0.0
-    created_dt = _parse_utc(post.get("createdAt"))
-    if created_dt:
-        hours_old = (datetime.now(timezone.utc) - created_dt).total_seconds() / 3600
-        recency_signal = max(0.0, 1.0 - hours_old / config.RECENCY_WINDOW_HOURS)
 
-    return round(
-        following_signal * config.POST_WEIGHT_FOLLOWING
-        + location_signal  * config.POST_WEIGHT_LOCATION
-        + recency_signal   * config.POST_WEIGHT_RECENCY,
-        4,
+    scores = score_posts_batch(
+        biz_index=np.zeros(1, dtype=np.intp),
+        created_at=np.array([created_epoch(post.get("createdAt"))]),
+        following=np.array([business_id in following_ids]),
+        biz_distance_km=np.array([np.nan if dist is None else dist]),
     )
+    return float(scores[0])
 
 
-def score_business_to_follow(business: dict, distance_km: float) -> float:
+def score_businesses_to_follow_batch(
+    distance_km: np.ndarray,
+    post_count: np.ndarray,
+) -> np.ndarray:
     """
-    Score a business for the "Who to Follow" list. Returns float in [0.0, 1.0].
+    Score N "Who to Follow" candidates in ONE vectorised pass.
+    Returns float array in [0.0, 1.0].
+
+    Columns (one entry per business):
+      distance_km  float — user → business distance
+      post_count   float — the business's postCount (0 when unknown)
 
     Signals:
       location_signal  (config.FOLLOW_WEIGHT_LOCATION = 0.70)
       activity_signal  (config.FOLLOW_WEIGHT_ACTIVITY = 0.30)
     """
-    location_signal = max(0.0, 1.0 - distance_km / config.MAX_RADIUS_KM)
+    dist = np.asarray(distance_km, dtype=np.float64)
+    location_signal = np.maximum(0.0, 1.0 - dist / config.MAX_RADIUS_KM)
 
-    post_count = business.get("postCount", 0) or 0
-    activity_signal = min(post_count, config.MAX_POST_COUNT) / config.MAX_POST_COUNT
+    posts = np.asarray(post_count, dtype=np.float64)
+    activity_signal = np.minimum(posts, config.MAX_POST_COUNT) / config.MAX_POST_COUNT
 
-    return round(
+    return np.round(
         location_signal  * config.FOLLOW_WEIGHT_LOCATION
         + activity_signal * config.FOLLOW_WEIGHT_ACTIVITY,
         4,
     )
+
+
+def score_business_to_follow(business: dict, distance_km: float) -> float:
+    """
+    Score a business for the "Who to Follow" list. Returns float in [0.0, 1.0].
+    Thin wrapper over score_businesses_to_follow_batch.
+    """
+    scores = score_businesses_to_follow_batch(
+        np.array([distance_km]),
+        np.array([business.get("postCount", 0) or 0]),
+    )
+    return float(scores[0])
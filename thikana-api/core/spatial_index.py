@@ -0,0 +1,204 @@
+"""
+core/spatial_index.py
+
+In-memory spatial index over point coordinates — no app logic, no DB calls.
+
+GridIndex buckets points into a uniform lat/lon grid. A radius query only
+visits the buckets overlapping the query's bounding box, so lookups cost
+O(points near the query) instead of O(all points). A k-nearest query visits
+rings of buckets outward from the query's bucket and stops as soon as
+nothing beyond the rings can beat the k points already found.
+
+CELL SIZE GUIDE (config.SPATIAL_GRID_CELL_DEG):
+  0.05° → ~5.5km  bucket (dense metro snapshots)
+  0.1°  → ~11km   bucket (default — one radius ≈ one bucket)
+  0.5°  → ~55km   bucket (sparse country-wide data)
+"""
+
+import heapq
+import math
+from typing import Hashable, Iterator
+
+from config import SPATIAL_GRID_CELL_DEG
+from core.distance import EARTH_RADIUS_KM, haversine_km
+
+_KM_PER_DEG_LAT = 111.195  # mean Earth radius (6371 km) × π / 180
+
+
+class GridIndex:
+    """
+    Uniform lat/lon grid of buckets.  key → (lat, lon).
+
+    Longitude buckets wrap around the antimeridian, so a query at lon=179.9
+    also sees points at lon=-179.9.
+    """
+
+    def __init__(self, cell_deg: float = SPATIAL_GRID_CELL_DEG):
+        if cell_deg <= 0:
+            raise ValueError("cell_deg must be positive")
+        self.cell_deg = cell_deg
+        self._n_lon = math.ceil(360.0 / cell_deg)
+        self._buckets: dict[tuple[int, int], dict[Hashable, tuple[float, float]]] = {}
+        self._points: dict[Hashable, tuple[float, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._points
+
+    # ── Mutation ──────────────────────────────────────────────────────────────
+
+    def _bucket_of(self, lat: float, lon: float) -> tuple[int, int]:
+        row = math.floor(lat / self.cell_deg)
+        col = math.floor((lon + 180.0) / self.cell_deg) % self._n_lon
+        return row, col
+
+    def insert(self, key: Hashable, lat: float, lon: float) -> None:
+        """Add a point, or move it if the key is already indexed."""
+        if key in self._points:
+            self.remove(key)
+        self._points[key] = (lat, lon)
+        self._buckets.setdefault(self._bucket_of(lat, lon), {})[key] = (lat, lon)
+
+    def remove(self, key: Hashable) -> None:
+        """Drop a point. Unknown keys are ignored."""
+        point = self._points.pop(key, None)
+        if point is None:
+            return
+        bucket_key = self._bucket_of(*point)
+        bucket = self._buckets.get(bucket_key)
+        if bucket is not None:
+            bucket.pop(key, None)
+            if not bucket:
+                del self._buckets[bucket_key]
+
+    # ── Queries ───────────────────────────────────────────────────────────────
+
+    def query_radius(
+        self,
+        lat: float,
+        lon: float,
+        radius_km: float,
+    ) -> Iterator[tuple[Hashable, float, float]]:
+        """
+        Yield (key, lat, lon) for every point in the buckets overlapping the
+        bounding box of the circle. This is a superset of the points within
+        radius_km — callers apply the exact distance filter themselves.
+        """
+        dlat = radius_km / _KM_PER_DEG_LAT
+        row_lo = math.floor((lat - dlat) / self.cell_deg)
+        row_hi = math.floor((lat + dlat) / self.cell_deg)
+
+        # Longitude span grows with latitude; use the widest edge of the box.
+        max_abs_lat = min(90.0, abs(lat) + dlat)
+        cos_lat = math.cos(math.radians(max_abs_lat))
+        if cos_lat <= 1e-9:
+            cols = range(self._n_lon)
+        else:
+            dlon = radius_km / (_KM_PER_DEG_LAT * cos_lat)
+            if 2 * dlon >= 360.0:
+                cols = range(self._n_lon)
+            else:
+                col_lo = math.floor((lon - dlon + 180.0) / self.cell_deg)
+                col_hi = math.floor((lon + dlon + 180.0) / self.cell_deg)
+                cols = range(col_lo, min(col_hi, col_lo + self._n_lon - 1) + 1)
+
+        for row in range(row_lo, row_hi + 1):
+            for col in cols:
+                bucket = self._buckets.get((row, col % self._n_lon))
+                if not bucket:
+                    continue
+                for key, (p_lat, p_lon) in bucket.items():
+                    yield key, p_lat, p_lon
+
+    def nearest(
+        self,
+        lat: float,
+        lon: float,
+        k: int,
+        max_radius_km: float,
+    ) -> list[tuple[Hashable, float]]:
+        """
+        The k points nearest (lat, lon) within max_radius_km, as
+        (key, distance_km) nearest first (fewer if there are fewer).
+
+        Ring r is every bucket r steps from the query's bucket. After each
+        ring, every point not yet seen lies outside the block of rings
+        visited, so at least clearance_km away: the search stops once the
+        k-th nearest point found is within that, or the clearance passes
+        max_radius_km.
+        """
+        if k <= 0:
+            return []
+        row0 = math.floor(lat / self.cell_deg)
+        col0 = math.floor((lon + 180.0) / self.cell_deg)
+        rows = (math.floor(-90.0 / self.cell_deg), math.floor(90.0 / self.cell_deg))
+
+        found: list[tuple[float, Hashable]] = []     # (distance, key) within max_radius_km
+        visited: set[tuple[int, int]] = set()
+        ring = 0
+        while True:
+            # A ring with more buckets than are occupied: scan those instead, once.
+            exhaustive = 8 * ring > len(self._buckets)
+            ring_keys = self._buckets if exhaustive else self._ring(row0, col0, ring, rows)
+            for bucket_key in ring_keys:
+                if bucket_key in visited:
+                    continue
+                visited.add(bucket_key)
+                for key, (p_lat, p_lon) in self._buckets.get(bucket_key, {}).items():
+                    dist = haversine_km(lat, lon, p_lat, p_lon)
+                    if dist <= max_radius_km:
+                        found.append((dist, key))
+            if exhaustive:
+                break
+
+            clearance = self._clearance_km(lat, lon, row0, col0, ring, rows)
+            if clearance >= max_radius_km:
+                break
+            if len(found) >= k and heapq.nsmallest(k, found)[-1][0] <= clearance:
+                break
+            ring += 1
+
+        return [(key, dist) for dist, key in heapq.nsmallest(k, found)]
+
+    def _ring(
+        self,
+        row0: int,
+        col0: int,
+        ring: int,
+        rows: tuple[int, int],
+    ) -> Iterator[tuple[int, int]]:
+        """Bucket keys exactly `ring` steps (rows or columns) from (row0, col0)."""
+        for row in range(max(row0 - ring, rows[0]), min(row0 + ring, rows[1]) + 1):
+            if abs(row - row0) == ring:
+                cols = range(col0 - ring, col0 + ring + 1)
+            else:
+                cols = (col0 - ring, col0 + ring)
+            for col in cols:
+                yield row, col % self._n_lon
+
+    def _clearance_km(
+        self,
+        lat: float,
+        lon: float,
+        row0: int,
+        col0: int,
+        ring: int,
+        rows: tuple[int, int],
+    ) -> float:
+        """Lower bound on the distance from (lat, lon) to any bucket outside the rings."""
+        bounds = [math.inf]
+        if row0 - ring > rows[0]:
+            bounds.append(math.radians(lat - (row0 - ring) * self.cell_deg))
+        if row0 + ring < rows[1]:
+            bounds.append(math.radians((row0 + ring + 1) * self.cell_deg - lat))
+        if 2 * ring + 1 < self._n_lon:
+            west = (col0 - ring) * self.cell_deg - 180.0
+            east = (col0 + ring + 1) * self.cell_deg - 180.0
+            d_lon = math.radians(min(lon - west, east - lon))
+            # Beyond the block's meridians: cross one of them, or go over a pole.
+            cos_lat = math.cos(math.radians(lat))
+            cross = math.asin(min(1.0, math.sin(d_lon) * cos_lat)) if d_lon < math.pi / 2 else math.inf
+            bounds.append(min(cross, math.radians(90.0 - abs(lat))))
+        return EARTH_RADIUS_KM * min(bounds)
@@ -1,15 +1,31 @@
 """db/__init__.py
 
-Exports a single `db` object — the active data provider.
-The rest of the app only ever does: `from db import db`
+Exports the active data provider in two flavours:
+  `db`       — DataProvider      (sync, used by def routes and scripts)
+  `async_db` — AsyncDataProvider (coroutines, used by async def routes)
+The rest of the app only ever does: `from db import db` / `from db import async_db`
 It never knows whether it's talking to mock or Firebase.
+
+Both are built on first access, not at import, so importing a submodule
+(db.mock, db.location_index, ...) never needs Firebase credentials.
 """
 
-from config import USE_MOCK
+import config
+
 
-if USE_MOCK:
-    from db.mock import MockDB
-    db = MockDB()
-else:
+def _build() -> tuple:
+    if config.USE_MOCK:
+        from db.mock import AsyncMockDB, MockDB
+        sync_db = MockDB()
+        return sync_db, AsyncMockDB(sync_db)
     from db.firebase import FirebaseDB
-    db = FirebaseDB()
+    from db.firebase_async import AsyncFirebaseDB
+    return FirebaseDB(), AsyncFirebaseDB()
+
+
+def __getattr__(name: str):
+    if name not in ("db", "async_db"):
+        raise AttributeError(f"module 'db' has no attribute {name!r}")
+    global db, async_db
+    db, async_db = _build()
+    return globals()[name]
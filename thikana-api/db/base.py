@@ -4,10 +4,14 @@ db/base.py
 Defines the DataProvider interface using Python's Protocol.
 Both MockDB and FirebaseDB must implement exactly these methods.
 
+AsyncDataProvider is the same interface with coroutine methods, implemented
+by AsyncFirebaseDB (Firestore AsyncClient) and AsyncMockDB.
+
 Protocol = structural typing (duck typing with type safety).
 No inheritance needed — if a class has these methods, it satisfies the interface.
 """
 
+from datetime import datetime
 from typing import Protocol, runtime_checkable
 
 
@@ -18,8 +22,12 @@ class DataProvider(Protocol):
         """Fetch a single user's document. Returns None if not found."""
         ...
 
-    def get_following_ids(self, user_id: str) -> list[str]:
-        """Return list of business IDs the user follows."""
+    def get_following_ids(self, user_id: str) -> frozenset[str]:
+        """Return the set of business IDs the user follows."""
+        ...
+
+    def invalidate_following(self, user_id: str) -> None:
+        """Forget any cached following set for the user (after follow/unfollow)."""
         ...
 
     def get_nearby_businesses(
@@ -34,6 +42,21 @@ class DataProvider(Protocol):
         """
         ...
 
+    def get_nearest_businesses(
+        self,
+        lat: float,
+        lon: float,
+        k: int,
+        max_radius_km: float,
+    ) -> dict[str, float]:
+        """
+        The k businesses nearest (lat, lon) within max_radius_km (fewer if
+        there are fewer) — the first k of get_nearby_businesses(lat, lon,
+        max_radius_km), but searched outward so it stops once k are found.
+        Returns {business_id: distance_km}, sorted by distance ascending.
+        """
+        ...
+
     def get_businesses_batch(self, business_ids: list[str]) -> dict[str, dict]:
         """
         Batch-fetch business metadata by IDs.
@@ -45,9 +68,118 @@ class DataProvider(Protocol):
         self,
         business_ids: list[str],
         limit_per_business: int = 5,
+        since: datetime | None = None,
     ) -> list[dict]:
         """
         Fetch recent posts for a set of businesses.
         Returns flat list (all businesses combined), capped per business.
+        since (optional) keeps only posts with createdAt >= since.
+        """
+        ...
+
+    def get_post_candidates(
+        self,
+        business_ids: list[str],
+        limit_per_business: int = 5,
+        since: datetime | None = None,
+    ) -> list[dict]:
+        """
+        Same selection as get_posts_for_businesses, but each post carries only
+        the ranking fields: {id, uid, createdAt}.
         """
         ...
+
+    def get_posts_by_ids(self, post_ids: list[str]) -> dict[str, dict]:
+        """
+        Batch-fetch full post documents by ID.
+        Returns {post_id: post_dict}; missing posts are left out.
+        """
+        ...
+
+    def get_feed_inbox(self, user_id: str) -> list[dict] | None:
+        """
+        Post refs {id, uid, createdAt} fanned out to the user, newest first,
+        at most FEED_INBOX_SIZE. None if the inbox has not been seeded.
+        """
+        ...
+
+    def seed_feed_inbox(self, user_id: str, posts: list[dict]) -> None:
+        """Mark the inbox seeded with these posts (refs already fanned out are kept)."""
+        ...
+
+    def reset_feed_inbox(self, user_id: str) -> None:
+        """Drop the inbox — the next feed read re-seeds it (e.g. after follow/unfollow)."""
+        ...
+
+    def fan_out_post(self, post_id: str) -> int:
+        """Append a post's ref to every follower's inbox. Returns inboxes written."""
+        ...
+
+    def cache_stats(self) -> dict:
+        """Counters of the provider's in-process caches, by cache name."""
+        ...
+
+
+@runtime_checkable
+class AsyncDataProvider(Protocol):
+    """DataProvider with awaitable methods — same arguments, same return values."""
+
+    async def get_user(self, user_id: str) -> dict | None:
+        ...
+
+    async def get_following_ids(self, user_id: str) -> frozenset[str]:
+        ...
+
+    async def invalidate_following(self, user_id: str) -> None:
+        ...
+
+    async def get_nearby_businesses(
+        self,
+        lat: float,
+        lon: float,
+        max_radius_km: float,
+    ) -> dict[str, float]:
+        ...
+
+    async def get_nearest_businesses(
+        self,
+        lat: float,
+        lon: float,
+        k: int,
+        max_radius_km: float,
+    ) -> dict[str, float]:
+        ...
+
+    async def get_businesses_batch(self, business_ids: list[str]) -> dict[str, dict]:
+        ...
+
+    async def get_posts_for_businesses(
+        self,
+        business_ids: list[str],
+        limit_per_business: int = 5,
+        since: datetime | None = None,
+    ) -> list[dict]:
+        ...
+
+    async def get_post_candidates(
+        self,
+        business_ids: list[str],
+        limit_per_business: int = 5,
+        since: datetime | None = None,
+    ) -> list[dict]:
+        ...
+
+    async def get_posts_by_ids(self, post_ids: list[str]) -> dict[str, dict]:
+        ...
+
+    async def get_feed_inbox(self, user_id: str) -> list[dict] | None:
+        ...
+
+    async def seed_feed_inbox(self, user_id: str, posts: list[dict]) -> None:
+        ...
+
+    async def reset_feed_inbox(self, user_id: str) -> None:
+        ...
+
+    async def fan_out_post(self, post_id: str) -> int:
+        ...
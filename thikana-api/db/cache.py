@@ -0,0 +1,97 @@
+"""
+db/cache.py
+
+In-process caching helpers for the data providers.
+
+TTLCache is a bounded LRU map whose entries also expire after a fixed
+time-to-live. It is thread-safe (routes run in a threadpool and FirebaseDB
+fans work out to its own pool) and keeps hit/miss counters so cache
+effectiveness can be checked at runtime via stats().
+
+Storing a falsy value (e.g. an empty tuple) is a valid *negative* entry —
+callers distinguish "cached as empty" from "not cached" with MISSING.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+MISSING: Any = object()  # sentinel returned by TTLCache.get on a miss
+
+
+class TTLCache:
+    """
+    Bounded LRU cache with per-entry expiry.
+
+    ttl_seconds <= 0 disables the cache: every get() is a miss and set()
+    is a no-op, so callers never need a separate "cache enabled" branch.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        max_entries: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value, or MISSING if absent or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return MISSING
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> bool:
+        """Drop one entry. Returns True if it was cached."""
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size":        len(self._entries),
+                "max_size":    self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits":        self.hits,
+                "misses":      self.misses,
+                "hit_rate":    round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions":   self.evictions,
+            }
@@ -8,14 +8,24 @@ Activated when USE_MOCK = False in config.py.
 Reads serviceAccountKey.json from the path set in config.KEY_PATH.
 """
 
-import math
+import contextvars
 import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime
 from pathlib import Path
+from typing import Iterable, Iterator
 
 import firebase_admin
 from firebase_admin import credentials, firestore
 
 import config
+from core.business_table import BusinessTable
+from db import identity_map
+from db.cache import MISSING, TTLCache
+from db.identity_map import current_scope
+from db.inbox import INBOX_COLLECTION, inbox_entry, split_inbox
+from db.recent_posts import RecentPosts
+from db.replica import BusinessReplica
 
 logger = logging.getLogger(__name__)
 
@@ -37,20 +47,62 @@ def _init_firebase() -> None:
 _init_firebase()
 _db = firestore.client()
 
+# Shared pool for overlapping independent Firestore RPCs within a request
+_pool = ThreadPoolExecutor(
+    max_workers=config.FIRESTORE_MAX_WORKERS,
+    thread_name_prefix="firestore",
+)
+
+# location_index/{cell} → tuple of business_ids. Missing cells are cached as ()
+_cell_cache = TTLCache(
+    ttl_seconds=config.CELL_CACHE_TTL_SECONDS,
+    max_entries=config.CELL_CACHE_MAX_ENTRIES,
+)
+
+# users/{user_id}/following → frozenset of business_ids
+_following_cache = TTLCache(
+    ttl_seconds=config.FOLLOWING_CACHE_TTL_SECONDS,
+    max_entries=config.FOLLOWING_CACHE_MAX_ENTRIES,
+)
+
+# Live local copy of businesses/ — serves business reads once bootstrapped
+_replica: BusinessReplica | None = None
+if config.BUSINESS_REPLICA_ENABLED:
+    _replica = BusinessReplica()
+    _replica.start(_db)
+
+
+def _replica_ready() -> bool:
+    return _replica is not None and _replica.ready
+
+
+# Newest posts per business — answers feed post queries once bootstrapped
+_recent_posts: RecentPosts | None = None
+if config.RECENT_POSTS_ENABLED:
+    _recent_posts = RecentPosts()
+    _recent_posts.start(_db)
+
+
+def _recent_lookup(
+    business_ids: list[str],
+    limit_per_business: int,
+    fields: list[str] | None,
+    since: datetime | None,
+) -> tuple[list[dict], list[str]]:
+    """(posts served from the recent-posts store, business_ids to query live)."""
+    if _recent_posts is None:
+        return [], business_ids
+    return _recent_posts.lookup(business_ids, limit_per_business, since, fields)
+
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
-def _haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    R = 6371.0
-    dlat = math.radians(lat2 - lat1)
-    dlon = math.radians(lon2 - lon1)
-    a = (
-        math.sin(dlat / 2) ** 2
-        + math.cos(math.radians(lat1))
-        * math.cos(math.radians(lat2))
-        * math.sin(dlon / 2) ** 2
-    )
-    return R * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+_BATCH_SIZE = 10  # Firestore 'in' query limit — also used for get_all batches
+_END = object()   # iterator-exhausted sentinel for _run_bounded
+_WRITE_BATCH_SIZE = 500  # Firestore WriteBatch limit
+
+# The only post fields build_feed needs to rank a candidate (id comes free)
+POST_RANK_FIELDS: list[str] = ["uid", "createdAt"]
 
 
 def _doc_to_dict(doc) -> dict:
@@ -65,13 +117,21 @@ def _batch_fetch(collection_name: str, doc_ids: list[str]) -> dict[str, dict]:
     Fetch multiple documents by ID in batches of 10 (Firestore 'in' query limit).
     Returns {doc_id: doc_data}.
 
-    DB reads: ceil(n / 10)
+    Inside a request_scope(), documents already loaded by this request are
+    served from the identity map and only the rest are read.
+
+    DB reads: ceil(n / 10) — n = IDs not yet loaded in this request
     """
     if not doc_ids:
         return {}
 
+    scope = current_scope()
     result: dict[str, dict] = {}
-    batch_size = 10
+    if scope is not None:
+        result, doc_ids = scope.lookup(collection_name, doc_ids)
+
+    fetched: dict[str, dict] = {}
+    batch_size = _BATCH_SIZE
 
     for i in range(0, len(doc_ids), batch_size):
         batch = doc_ids[i : i + batch_size]
@@ -80,11 +140,140 @@ def _batch_fetch(collection_name: str, doc_ids: list[str]) -> dict[str, dict]:
         docs = _db.get_all(refs)          # 1 Firestore RPC per batch
         for doc in docs:
             if doc.exists:
-                result[doc.id] = _doc_to_dict(doc)
+                fetched[doc.id] = _doc_to_dict(doc)
+
+    if scope is not None:
+        scope.add(collection_name, fetched)
+    result.update(fetched)
+    return result
+
+
+def _filter_by_distance(
+    businesses: dict[str, dict],
+    lat: float,
+    lon: float,
+    max_radius_km: float,
+) -> dict[str, float]:
+    """
+    Exact distance filter over fetched business docs, run on a BusinessTable
+    of them — a vectorised bounding-box pass over its lat/lon columns drops
+    the far corners of the covering cells, then Haversine runs on the
+    survivors only.
+    Returns {business_id: distance_km} within max_radius_km, nearest first.
+    """
+    return BusinessTable.from_docs(businesses).nearby(lat, lon, max_radius_km)
+
+
+def _ring_radii(max_radius_km: float) -> Iterator[float]:
+    """
+    Search radii for get_nearest_businesses: MAX_RADIUS_KM (whose cells the
+    nearby query has usually just cached), doubling up to max_radius_km.
+    """
+    radius_km = min(config.MAX_RADIUS_KM, max_radius_km)
+    while radius_km < max_radius_km:
+        yield radius_km
+        radius_km *= 2
+    yield max_radius_km
+
 
+def _knn_rings(lat: float, lon: float, max_radius_km: float) -> Iterator[tuple[float, list[str]]]:
+    """
+    (radius_km, cells no earlier ring read) for each ring of
+    get_nearest_businesses. Stops before the ring that would take the total
+    past KNN_MAX_CELLS — the first ring is always read.
+
+    With only precision 5 indexed a 100 km ring alone covers ~1,500 cells,
+    so the cap ends the search at ~20 km; with precision 4 indexed too the
+    outer rings use ~40 km cells and 100 km fits in ~60–100 cells.
+    """
+    from core.geohash_utils import cover_cells
+
+    read_cells: set[str] = set()
+    for radius_km in _ring_radii(max_radius_km):
+        cells = [cell for cell in cover_cells(lat, lon, radius_km) if cell not in read_cells]
+        if read_cells and len(read_cells) + len(cells) > config.KNN_MAX_CELLS:
+            logger.info(
+                f"kNN search at ({lat}, {lon}) stopped before {radius_km} km: "
+                f"{len(read_cells) + len(cells)} cells > KNN_MAX_CELLS"
+            )
+            return
+        read_cells.update(cells)
+        yield radius_km, cells
+
+
+def _posts_query(
+    client,
+    batch: list[str],
+    limit_per_business: int,
+    fields: list[str] | None,
+    since: datetime | None,
+):
+    """
+    Newest posts of up to 10 businesses; only createdAt >= since when given,
+    projected to `fields` when given. Uses the same (uid, createdAt desc)
+    composite index with or without the range filter.
+    """
+    query = client.collection("posts").where("uid", "in", batch)
+    if since is not None:
+        query = query.where("createdAt", ">=", since)
+    query = (
+        query
+        .order_by("createdAt", direction=firestore.Query.DESCENDING)
+        .limit(limit_per_business * len(batch))  # upper bound
+    )
+    if fields is not None:
+        query = query.select(fields)
+    return query
+
+
+def _cap_per_business(chunks: Iterable[list[dict]], limit_per_business: int) -> list[dict]:
+    """
+    Merge chunk results and keep the newest limit_per_business posts per
+    business. Each business lives in exactly one chunk, so its posts are
+    already newest-first.
+    """
+    by_biz: dict[str, list[dict]] = {}
+    for chunk in chunks:
+        for post in chunk:
+            by_biz.setdefault(post.get("uid", ""), []).append(post)
+
+    result: list[dict] = []
+    for posts in by_biz.values():
+        result.extend(posts[:limit_per_business])
     return result
 
 
+def _submit(fn, *args) -> Future:
+    """Run fn on the shared pool inside the caller's context (identity map etc.)."""
+    return _pool.submit(contextvars.copy_context().run, fn, *args)
+
+
+def _run_bounded(fn, items: list, max_in_flight: int) -> Iterator:
+    """
+    Yield fn(item) for every item, running at most max_in_flight calls on the
+    shared pool at once. Results are yielded in completion order.
+    A single item runs inline — no pool hop for the common small case.
+    """
+    if len(items) <= 1 or max_in_flight <= 1:
+        for item in items:
+            yield fn(item)
+        return
+
+    queue = iter(items)
+    in_flight: set[Future] = set()
+    for item in queue:
+        in_flight.add(_submit(fn, item))
+        if len(in_flight) >= max_in_flight:
+            break
+    while in_flight:
+        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield future.result()
+            next_item = next(queue, _END)
+            if next_item is not _END:
+                in_flight.add(_submit(fn, next_item))
+
+
 # ── FirebaseDB class ──────────────────────────────────────────────────────────
 
 class FirebaseDB:
@@ -92,14 +281,33 @@ class FirebaseDB:
     Live Firestore data provider.
 
     Firestore reads per feed request:
-      get_following_ids:       1 read  (subcollection stream)
-      get_nearby_businesses:   9 reads (location_index cells) + ceil(n/10) reads
-      get_businesses_batch:    ceil(n/10) reads
-      get_posts_for_buses:     ceil(n/10) reads per batch of 10 businesses
+      get_following_ids:       1 read  (subcollection stream; 0 while cached)
+      get_nearby_businesses:   ≤c reads (1 get_all RPC, cached cells skipped) + ceil(n/10) reads
+                               c = cells in the radius cover, usually ≤ GEOHASH_COVER_MAX_CELLS
+      get_businesses_batch:    ceil(n/10) reads (nearby ones reused in a request_scope)
+      get_post_candidates:     ceil(n/10) reads, projected, chunk queries concurrent
+      get_posts_by_ids:        ceil(limit/10) reads — only the feed winners
+      get_feed_inbox:          1 read — replaces the following stream and the
+                               followed posts queries when FEED_INBOX_ENABLED
       ─────────────────────────────────────────────────────────
       Total per feed request:  ~12–20 reads regardless of Firestore size
     """
 
+    # ── cache_stats ───────────────────────────────────────────────────────────
+
+    def cache_stats(self) -> dict:
+        """Hit/miss counters for the in-process Firestore caches."""
+        stats = {
+            "location_index": _cell_cache.stats(),
+            "following":      _following_cache.stats(),
+            "identity_map":   identity_map.stats(),
+        }
+        if _replica is not None:
+            stats["business_replica"] = _replica.stats()
+        if _recent_posts is not None:
+            stats["recent_posts"] = _recent_posts.stats()
+        return stats
+
     # ── get_user ──────────────────────────────────────────────────────────────
 
     def get_user(self, user_id: str) -> dict | None:
@@ -114,18 +322,31 @@ class FirebaseDB:
 
     # ── get_following_ids ─────────────────────────────────────────────────────
 
-    def get_following_ids(self, user_id: str) -> list[str]:
+    def get_following_ids(self, user_id: str) -> frozenset[str]:
         """
-        1 Firestore read (subcollection stream).
+        1 Firestore read (subcollection stream) — 0 while cached.
         Collection: users/{user_id}/following
         Each document ID = the business ID being followed.
+
+        Cached per user for FOLLOWING_CACHE_TTL_SECONDS; invalidate_following()
+        drops the entry after a follow/unfollow.
         """
+        cached = _following_cache.get(user_id)
+        if cached is not MISSING:
+            return cached
+
         following_ref = (
             _db.collection("users")
             .document(user_id)
             .collection("following")
         )
-        return [doc.id for doc in following_ref.stream()]
+        following = frozenset(doc.id for doc in following_ref.stream())
+        _following_cache.set(user_id, following)
+        return following
+
+    def invalidate_following(self, user_id: str) -> None:
+        """Drop the cached following set — the next read streams it again."""
+        _following_cache.invalidate(user_id)
 
     # ── get_nearby_businesses ─────────────────────────────────────────────────
 
@@ -136,60 +357,126 @@ class FirebaseDB:
         max_radius_km: float = config.MAX_RADIUS_KM,
     ) -> dict[str, float]:
         """
-        Geohash-indexed spatial query. Total reads: 9 + ceil(n/10).
-        n = number of businesses found in the geohash cells (~10–50 typically).
+        Geohash-indexed spatial query. Total reads: c + ceil(n/10).
+        c = cells covering the max_radius_km circle (cover_cells — the finest
+        indexed precision within GEOHASH_COVER_MAX_CELLS),
+        n = number of businesses found in those cells (~10–50 typically).
+        0 reads when the business replica is enabled and bootstrapped.
 
         Steps:
-          1. Compute center + 8 neighbours (9 geohash cells) — free
-          2. Read location_index/{cell} for each cell           — 9 reads
-          3. Collect unique business_ids from all cells
-          4. Batch-fetch businesses/{id} for exact location      — ceil(n/10) reads
-          5. Filter by Haversine distance                        — free
+          1. Compute the radius cover (every indexed cell the circle touches) — free
+          2. Serve cells from the in-process cell cache (incl. known-empty cells);
+             read the rest in ONE get_all RPC         — ≤c reads, 0 when warm
+          3. Collect unique business_ids as cell docs stream back; every full
+             batch of 10 is handed to the pool immediately, so business
+             fetches overlap the rest of the cell stream  — ceil(n/10) reads
+          4. Bounding box, then exact Haversine distance        — free
 
         Returns {business_id: distance_km}, sorted by distance ascending.
         """
-        from core.geohash_utils import get_search_cells
-
-        search_cells = get_search_cells(lat, lon)   # 9 geohash strings
+        if _replica_ready():
+            return _replica.nearby(lat, lon, max_radius_km)
 
-        # Step 2: read location_index for each cell
-        business_ids: set[str] = set()
-        for cell in search_cells:
-            doc = _db.collection("location_index").document(cell).get()  # 1 read each
-            if doc.exists:
-                ids = doc.to_dict().get("business_ids", [])
-                business_ids.update(ids)
+        from core.geohash_utils import cover_cells
 
-        if not business_ids:
+        businesses = self._index_businesses(cover_cells(lat, lon, max_radius_km), set())
+        if not businesses:
             logger.info(f"No businesses found in location_index for ({lat}, {lon})")
             return {}
 
-        # Step 3: batch-fetch business data
-        businesses = _batch_fetch("businesses", list(business_ids))
-
-        # Step 4: exact Haversine filter
-        result: dict[str, float] = {}
-        for biz_id, biz in businesses.items():
-            loc = biz.get("location")
-            if not loc:
-                continue
-            biz_lat = loc.get("latitude")
-            biz_lon = loc.get("longitude")
-            if biz_lat is None or biz_lon is None:
-                continue
-            dist = _haversine_km(lat, lon, biz_lat, biz_lon)
-            if dist <= max_radius_km:
-                result[biz_id] = round(dist, 2)
-
-        return dict(sorted(result.items(), key=lambda x: x[1]))
+        # Step 4: bounding box, then exact Haversine on the survivors
+        return _filter_by_distance(businesses, lat, lon, max_radius_km)
+
+    def get_nearest_businesses(
+        self,
+        lat: float,
+        lon: float,
+        k: int,
+        max_radius_km: float,
+    ) -> dict[str, float]:
+        """
+        k nearest businesses by ring expansion over location_index.
+
+        Each ring covers a radius (MAX_RADIUS_KM, then doubling up to
+        max_radius_km) and reads only the cells and businesses earlier rings
+        have not. A covered radius is complete, so once it holds k businesses
+        they are the k nearest. The search stops early rather than read more
+        than KNN_MAX_CELLS cells (_knn_rings); it then returns the nearest
+        found within the last ring read, possibly fewer than k.
+
+        DB reads (worst case): ≤ KNN_MAX_CELLS cells in one get_all per ring
+        (cached cells free) + ceil(n/10), n = businesses listed in those
+        cells. One ring, all cached, where businesses are dense.
+        0 reads with the business replica.
+
+        Returns {business_id: distance_km}, sorted by distance ascending.
+        """
+        if _replica_ready():
+            return _replica.nearest(lat, lon, k, max_radius_km)
+
+        seen: set[str] = set()
+        businesses: dict[str, dict] = {}
+        found: dict[str, float] = {}
+        for radius_km, cells in _knn_rings(lat, lon, max_radius_km):
+            businesses.update(self._index_businesses(cells, seen))
+            found = _filter_by_distance(businesses, lat, lon, radius_km)
+            if len(found) >= k:
+                break
+        return dict(list(found.items())[:k])
+
+    def _index_businesses(self, search_cells: list[str], seen: set[str]) -> dict[str, dict]:
+        """
+        Business docs listed in search_cells, except IDs in `seen` (updated).
+        Steps 2–3 of get_nearby_businesses.
+        """
+        pending: list[str] = []
+        fetches: list[Future] = []
+
+        def collect(business_ids) -> None:
+            nonlocal pending
+            for biz_id in business_ids:
+                if biz_id not in seen:
+                    seen.add(biz_id)
+                    pending.append(biz_id)
+            while len(pending) >= _BATCH_SIZE:
+                fetches.append(_submit(_batch_fetch, "businesses", pending[:_BATCH_SIZE]))
+                pending = pending[_BATCH_SIZE:]
+
+        # Step 2: cached cells first, then one RPC for the misses
+        uncached: list[str] = []
+        for cell in search_cells:
+            cached = _cell_cache.get(cell)
+            if cached is MISSING:
+                uncached.append(cell)
+            else:
+                collect(cached)
+
+        # Step 3: business batches dispatched as ids arrive
+        if uncached:
+            cell_refs = [_db.collection("location_index").document(cell) for cell in uncached]
+            for doc in _db.get_all(cell_refs):
+                ids = tuple((doc.to_dict() or {}).get("business_ids", [])) if doc.exists else ()
+                _cell_cache.set(doc.id, ids)
+                collect(ids)
+        if pending:
+            fetches.append(_submit(_batch_fetch, "businesses", pending))
+
+        businesses: dict[str, dict] = {}
+        for fetch in fetches:
+            businesses.update(fetch.result())
+        return businesses
 
     # ── get_businesses_batch ──────────────────────────────────────────────────
 
     def get_businesses_batch(self, business_ids: list[str]) -> dict[str, dict]:
         """
         Batch-fetch business metadata.
-        DB reads: ceil(n / 10)
+        DB reads: ceil(n / 10) — 0 for businesses get_nearby_businesses already
+        loaded in the same request_scope(), 0 for all with the replica (which
+        returns the BusinessTable.FIELDS projection of each document).
         """
+        if _replica_ready():
+            return _replica.get_many(business_ids)
         return _batch_fetch("businesses", business_ids)
 
     # ── get_posts_for_businesses ──────────────────────────────────────────────
@@ -198,45 +485,137 @@ class FirebaseDB:
         self,
         business_ids: list[str],
         limit_per_business: int = 5,
+        since: datetime | None = None,
     ) -> list[dict]:
         """
-        Fetch recent posts for a set of businesses.
+        Fetch recent posts (full documents) for a set of businesses.
         Uses Firestore 'in' query (max 10 values), batched automatically.
+        Chunk queries run concurrently on the shared pool, at most
+        config.POSTS_QUERY_CONCURRENCY in flight per call.
 
         DB reads: ceil(n / 10) — each read returns posts for up to 10 businesses.
+        With the recent-posts store warm, only businesses it cannot answer
+        are queried (usually none).
 
         limit_per_business caps posts per business so one active business
-        can't flood the entire feed.
+        can't flood the entire feed. since, when given, is pushed down as a
+        createdAt >= since filter so stale posts are never read.
+        """
+        return self._fetch_posts(business_ids, limit_per_business, None, since)
+
+    # ── get_post_candidates ───────────────────────────────────────────────────
+
+    def get_post_candidates(
+        self,
+        business_ids: list[str],
+        limit_per_business: int = 5,
+        since: datetime | None = None,
+    ) -> list[dict]:
+        """
+        Same query as get_posts_for_businesses, projected with select() to the
+        ranking fields only — {id, uid, createdAt}. Captions, image URLs etc.
+        never cross the wire; hydrate the winners with get_posts_by_ids.
+
+        DB reads: ceil(n / 10)
         """
+        return self._fetch_posts(business_ids, limit_per_business, POST_RANK_FIELDS, since)
+
+    # ── get_posts_by_ids ──────────────────────────────────────────────────────
+
+    def get_posts_by_ids(self, post_ids: list[str]) -> dict[str, dict]:
+        """
+        Batch-fetch full post documents.
+        DB reads: ceil(n / 10)
+        """
+        return _batch_fetch("posts", post_ids)
+
+    def _fetch_posts(
+        self,
+        business_ids: list[str],
+        limit_per_business: int,
+        fields: list[str] | None,
+        since: datetime | None,
+    ) -> list[dict]:
+        cached, business_ids = _recent_lookup(business_ids, limit_per_business, fields, since)
         if not business_ids:
-            return []
+            return cached
 
-        result: list[dict] = []
-        batch_size = 10
+        def fetch_chunk(batch: list[str]) -> list[dict]:
+            query = _posts_query(_db, batch, limit_per_business, fields, since)
+            return [_doc_to_dict(doc) for doc in query.stream()]
 
-        # Group posts keyed by business for per-business capping
-        by_biz: dict[str, list[dict]] = {}
+        batches = [
+            business_ids[i : i + _BATCH_SIZE]
+            for i in range(0, len(business_ids), _BATCH_SIZE)
+        ]
+        chunks = _run_bounded(fetch_chunk, batches, config.POSTS_QUERY_CONCURRENCY)
+        return cached + _cap_per_business(chunks, limit_per_business)
 
-        for i in range(0, len(business_ids), batch_size):
-            batch = business_ids[i : i + batch_size]
+    # ── Feed inbox (fan-out on write) ─────────────────────────────────────────
 
-            query = (
-                _db.collection("posts")
-                .where("uid", "in", batch)
-                .order_by("createdAt", direction=firestore.Query.DESCENDING)
-                .limit(limit_per_business * len(batch))  # upper bound
-            )
+    def get_feed_inbox(self, user_id: str) -> list[dict] | None:
+        """
+        1 Firestore read — feed_inbox/{user_id}, regardless of follow count.
+        Refs beyond FEED_INBOX_SIZE are trimmed with one ArrayRemove write.
+        Returns None until the inbox has been seeded.
+        """
+        ref = _db.collection(INBOX_COLLECTION).document(user_id)
+        doc = ref.get()
+        data = (doc.to_dict() or {}) if doc.exists else {}
+        if not data.get("seeded"):
+            return None
+        keep, overflow = split_inbox(data.get("posts", []), config.FEED_INBOX_SIZE)
+        if overflow:
+            ref.update({"posts": firestore.ArrayRemove(overflow)})
+        return keep
 
-            for doc in query.stream():
-                post = _doc_to_dict(doc)
-                uid = post.get("uid", "")
-                by_biz.setdefault(uid, []).append(post)
+    def seed_feed_inbox(self, user_id: str, posts: list[dict]) -> None:
+        """
+        1 Firestore write. Merged, so refs fanned out before the seed survive.
+        """
+        _db.collection(INBOX_COLLECTION).document(user_id).set(
+            {
+                "seeded": True,
+                "posts":  firestore.ArrayUnion([inbox_entry(p) for p in posts]),
+            },
+            merge=True,
+        )
+
+    def reset_feed_inbox(self, user_id: str) -> None:
+        """1 Firestore delete — the next feed read re-seeds the inbox."""
+        _db.collection(INBOX_COLLECTION).document(user_id).delete()
+
+    def fan_out_post(self, post_id: str) -> int:
+        """
+        Append posts/{post_id}'s ref to the inbox of every follower in
+        users/{uid}/followers (kept by the web app on follow/unfollow). Blind ArrayUnion writes — no inbox reads.
+
+        DB reads: 2 (post + followers stream). Writes: 1 per follower,
+        committed in batches of 500.
+        """
+        doc = _db.collection("posts").document(post_id).get()
+        if not doc.exists:
+            return 0
+        entry = inbox_entry(_doc_to_dict(doc))
+        if not entry["uid"]:
+            return 0
+
+        followers_ref = (
+            _db.collection("users")
+            .document(entry["uid"])
+            .collection("followers")
+        )
+        followers = [follower.id for follower in followers_ref.stream()]
 
-        # Apply per-business cap and flatten
-        for uid, posts in by_biz.items():
-            result.extend(posts[:limit_per_business])
+        update = {"posts": firestore.ArrayUnion([entry])}
+        for i in range(0, len(followers), _WRITE_BATCH_SIZE):
+            batch = _db.batch()
+            for user_id in followers[i : i + _WRITE_BATCH_SIZE]:
+                batch.set(_db.collection(INBOX_COLLECTION).document(user_id), update, merge=True)
+            batch.commit()
 
-        return result
+        logger.info(f"fan_out_post: {post_id} → {len(followers)} inboxes")
+        return len(followers)
 
     # ── get_user_transactions ─────────────────────────────────────────────────
 
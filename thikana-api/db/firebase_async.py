@@ -0,0 +1,356 @@
+"""
+db/firebase_async.py
+
+AsyncFirebaseDB — Firestore AsyncClient implementation.
+Implements the AsyncDataProvider interface from db/base.py.
+
+Same queries and read counts as FirebaseDB, but every method is a coroutine,
+so independent round trips overlap on the event loop instead of holding a
+threadpool worker each. Shares FirebaseDB's location_index and following
+caches and honours the request_scope() identity map (asyncio tasks inherit it).
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+
+from firebase_admin import firestore, firestore_async
+
+import config
+from db.firebase import (
+    POST_RANK_FIELDS,
+    _BATCH_SIZE,
+    _WRITE_BATCH_SIZE,
+    _cap_per_business,
+    _cell_cache,
+    _following_cache,
+    _doc_to_dict,
+    _filter_by_distance,
+    _init_firebase,
+    _knn_rings,
+    _posts_query,
+    _recent_lookup,
+    _replica,
+    _replica_ready,
+)
+from db.cache import MISSING
+from db.identity_map import current_scope
+from db.inbox import INBOX_COLLECTION, inbox_entry, split_inbox
+
+logger = logging.getLogger(__name__)
+
+_init_firebase()
+_adb = firestore_async.client()
+
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+
+async def _batch_fetch(collection_name: str, doc_ids: list[str]) -> dict[str, dict]:
+    """
+    Async twin of db.firebase._batch_fetch — batches of 10 fetched concurrently.
+    Returns {doc_id: doc_data}.
+
+    DB reads: ceil(n / 10) — n = IDs not yet loaded in this request
+    """
+    if not doc_ids:
+        return {}
+
+    scope = current_scope()
+    result: dict[str, dict] = {}
+    if scope is not None:
+        result, doc_ids = scope.lookup(collection_name, doc_ids)
+
+    async def fetch(batch: list[str]) -> dict[str, dict]:
+        refs = [_adb.collection(collection_name).document(doc_id) for doc_id in batch]
+        return {
+            doc.id: _doc_to_dict(doc)
+            async for doc in _adb.get_all(refs)   # 1 Firestore RPC per batch
+            if doc.exists
+        }
+
+    fetched: dict[str, dict] = {}
+    for docs in await asyncio.gather(*(
+        fetch(doc_ids[i : i + _BATCH_SIZE])
+        for i in range(0, len(doc_ids), _BATCH_SIZE)
+    )):
+        fetched.update(docs)
+
+    if scope is not None:
+        scope.add(collection_name, fetched)
+    result.update(fetched)
+    return result
+
+
+# ── AsyncFirebaseDB class ─────────────────────────────────────────────────────
+
+class AsyncFirebaseDB:
+    """
+    Live Firestore data provider for async routes.
+    Firestore reads per request are identical to FirebaseDB.
+    """
+
+    # ── get_user ──────────────────────────────────────────────────────────────
+
+    async def get_user(self, user_id: str) -> dict | None:
+        """
+        1 Firestore read.
+        Collection: users/{user_id}
+        """
+        doc = await _adb.collection("users").document(user_id).get()
+        if not doc.exists:
+            return None
+        return _doc_to_dict(doc)
+
+    # ── get_following_ids ─────────────────────────────────────────────────────
+
+    async def get_following_ids(self, user_id: str) -> frozenset[str]:
+        """
+        1 Firestore read (subcollection stream) — 0 while cached.
+        Collection: users/{user_id}/following
+        """
+        cached = _following_cache.get(user_id)
+        if cached is not MISSING:
+            return cached
+
+        following_ref = (
+            _adb.collection("users")
+            .document(user_id)
+            .collection("following")
+        )
+        following = frozenset([doc.id async for doc in following_ref.stream()])
+        _following_cache.set(user_id, following)
+        return following
+
+    async def invalidate_following(self, user_id: str) -> None:
+        """Drop the cached following set (shared with FirebaseDB)."""
+        _following_cache.invalidate(user_id)
+
+    # ── get_nearby_businesses ─────────────────────────────────────────────────
+
+    async def get_nearby_businesses(
+        self,
+        lat: float,
+        lon: float,
+        max_radius_km: float = config.MAX_RADIUS_KM,
+    ) -> dict[str, float]:
+        """
+        Geohash-indexed spatial query — see FirebaseDB.get_nearby_businesses.
+        Business batches are started as tasks while cell docs still stream in.
+
+        Returns {business_id: distance_km}, sorted by distance ascending.
+        """
+        if _replica_ready():
+            return _replica.nearby(lat, lon, max_radius_km)
+
+        from core.geohash_utils import cover_cells
+
+        businesses = await self._index_businesses(cover_cells(lat, lon, max_radius_km), set())
+        if not businesses:
+            logger.info(f"No businesses found in location_index for ({lat}, {lon})")
+            return {}
+
+        return _filter_by_distance(businesses, lat, lon, max_radius_km)
+
+    async def get_nearest_businesses(
+        self,
+        lat: float,
+        lon: float,
+        k: int,
+        max_radius_km: float,
+    ) -> dict[str, float]:
+        """
+        k nearest businesses by ring expansion — see
+        FirebaseDB.get_nearest_businesses (same ≤ KNN_MAX_CELLS cell cap).
+
+        Returns {business_id: distance_km}, sorted by distance ascending.
+        """
+        if _replica_ready():
+            return _replica.nearest(lat, lon, k, max_radius_km)
+
+        seen: set[str] = set()
+        businesses: dict[str, dict] = {}
+        found: dict[str, float] = {}
+        for radius_km, cells in _knn_rings(lat, lon, max_radius_km):
+            businesses.update(await self._index_businesses(cells, seen))
+            found = _filter_by_distance(businesses, lat, lon, radius_km)
+            if len(found) >= k:
+                break
+        return dict(list(found.items())[:k])
+
+    async def _index_businesses(self, search_cells: list[str], seen: set[str]) -> dict[str, dict]:
+        """Async FirebaseDB._index_businesses."""
+        pending: list[str] = []
+        fetches: list[asyncio.Task] = []
+
+        def collect(business_ids) -> None:
+            nonlocal pending
+            for biz_id in business_ids:
+                if biz_id not in seen:
+                    seen.add(biz_id)
+                    pending.append(biz_id)
+            while len(pending) >= _BATCH_SIZE:
+                fetches.append(asyncio.create_task(
+                    _batch_fetch("businesses", pending[:_BATCH_SIZE])
+                ))
+                pending = pending[_BATCH_SIZE:]
+
+        uncached: list[str] = []
+        for cell in search_cells:
+            cached = _cell_cache.get(cell)
+            if cached is MISSING:
+                uncached.append(cell)
+            else:
+                collect(cached)
+
+        if uncached:
+            cell_refs = [_adb.collection("location_index").document(cell) for cell in uncached]
+            async for doc in _adb.get_all(cell_refs):
+                ids = tuple((doc.to_dict() or {}).get("business_ids", [])) if doc.exists else ()
+                _cell_cache.set(doc.id, ids)
+                collect(ids)
+        if pending:
+            fetches.append(asyncio.create_task(_batch_fetch("businesses", pending)))
+
+        businesses: dict[str, dict] = {}
+        for docs in await asyncio.gather(*fetches):
+            businesses.update(docs)
+        return businesses
+
+    # ── get_businesses_batch ──────────────────────────────────────────────────
+
+    async def get_businesses_batch(self, business_ids: list[str]) -> dict[str, dict]:
+        """
+        Batch-fetch business metadata.
+        DB reads: ceil(n / 10), minus businesses already loaded in the request;
+        0 with the business replica.
+        """
+        if _replica_ready():
+            return _replica.get_many(business_ids)
+        return await _batch_fetch("businesses", business_ids)
+
+    # ── get_posts_for_businesses ──────────────────────────────────────────────
+
+    async def get_posts_for_businesses(
+        self,
+        business_ids: list[str],
+        limit_per_business: int = 5,
+        since: datetime | None = None,
+    ) -> list[dict]:
+        """
+        Fetch recent posts (full documents) for a set of businesses.
+        Chunked 'in' queries run concurrently, at most
+        config.POSTS_QUERY_CONCURRENCY in flight.
+
+        since, when given, becomes a createdAt >= since filter.
+
+        DB reads: ceil(n / 10) — only for businesses the recent-posts store
+        cannot answer once it is warm.
+        """
+        return await self._fetch_posts(business_ids, limit_per_business, None, since)
+
+    # ── get_post_candidates ───────────────────────────────────────────────────
+
+    async def get_post_candidates(
+        self,
+        business_ids: list[str],
+        limit_per_business: int = 5,
+        since: datetime | None = None,
+    ) -> list[dict]:
+        """
+        Projected twin of get_posts_for_businesses — {id, uid, createdAt} only.
+        DB reads: ceil(n / 10)
+        """
+        return await self._fetch_posts(business_ids, limit_per_business, POST_RANK_FIELDS, since)
+
+    # ── get_posts_by_ids ──────────────────────────────────────────────────────
+
+    async def get_posts_by_ids(self, post_ids: list[str]) -> dict[str, dict]:
+        """
+        Batch-fetch full post documents.
+        DB reads: ceil(n / 10)
+        """
+        return await _batch_fetch("posts", post_ids)
+
+    async def _fetch_posts(
+        self,
+        business_ids: list[str],
+        limit_per_business: int,
+        fields: list[str] | None,
+        since: datetime | None,
+    ) -> list[dict]:
+        cached, business_ids = _recent_lookup(business_ids, limit_per_business, fields, since)
+        if not business_ids:
+            return cached
+
+        limiter = asyncio.Semaphore(max(1, config.POSTS_QUERY_CONCURRENCY))
+
+        async def fetch_chunk(batch: list[str]) -> list[dict]:
+            query = _posts_query(_adb, batch, limit_per_business, fields, since)
+            async with limiter:
+                return [_doc_to_dict(doc) async for doc in query.stream()]
+
+        chunks = await asyncio.gather(*(
+            fetch_chunk(business_ids[i : i + _BATCH_SIZE])
+            for i in range(0, len(business_ids), _BATCH_SIZE)
+        ))
+        return cached + _cap_per_business(chunks, limit_per_business)
+
+    # ── Feed inbox (fan-out on write) ─────────────────────────────────────────
+
+    async def get_feed_inbox(self, user_id: str) -> list[dict] | None:
+        """
+        1 Firestore read — see FirebaseDB.get_feed_inbox.
+        """
+        ref = _adb.collection(INBOX_COLLECTION).document(user_id)
+        doc = await ref.get()
+        data = (doc.to_dict() or {}) if doc.exists else {}
+        if not data.get("seeded"):
+            return None
+        keep, overflow = split_inbox(data.get("posts", []), config.FEED_INBOX_SIZE)
+        if overflow:
+            await ref.update({"posts": firestore.ArrayRemove(overflow)})
+        return keep
+
+    async def seed_feed_inbox(self, user_id: str, posts: list[dict]) -> None:
+        """1 Firestore write (merged)."""
+        await _adb.collection(INBOX_COLLECTION).document(user_id).set(
+            {
+                "seeded": True,
+                "posts":  firestore.ArrayUnion([inbox_entry(p) for p in posts]),
+            },
+            merge=True,
+        )
+
+    async def reset_feed_inbox(self, user_id: str) -> None:
+        """1 Firestore delete."""
+        await _adb.collection(INBOX_COLLECTION).document(user_id).delete()
+
+    async def fan_out_post(self, post_id: str) -> int:
+        """
+        See FirebaseDB.fan_out_post — write batches are committed concurrently.
+        """
+        doc = await _adb.collection("posts").document(post_id).get()
+        if not doc.exists:
+            return 0
+        entry = inbox_entry(_doc_to_dict(doc))
+        if not entry["uid"]:
+            return 0
+
+        followers_ref = (
+            _adb.collection("users")
+            .document(entry["uid"])
+            .collection("followers")
+        )
+        followers = [follower.id async for follower in followers_ref.stream()]
+
+        update = {"posts": firestore.ArrayUnion([entry])}
+        batches = []
+        for i in range(0, len(followers), _WRITE_BATCH_SIZE):
+            batch = _adb.batch()
+            for user_id in followers[i : i + _WRITE_BATCH_SIZE]:
+                batch.set(_adb.collection(INBOX_COLLECTION).document(user_id), update, merge=True)
+            batches.append(batch.commit())
+        await asyncio.gather(*batches)
+
+        logger.info(f"fan_out_post: {post_id} → {len(followers)} inboxes")
+        return len(followers)
@@ -0,0 +1,115 @@
+"""
+db/identity_map.py
+
+Request-scoped identity map — each document is read at most once per request.
+
+A feed request touches the same business documents more than once
+(get_nearby_businesses needs their locations, then get_businesses_batch
+needs their metadata). Inside `with request_scope():` every provider
+records the documents it loads, and later lookups for the same IDs are
+served from memory instead of Firestore.
+
+The active scope lives in a ContextVar, so it follows the request across
+function calls without changing any DataProvider signature. Work handed to
+a thread pool must be submitted through contextvars.copy_context().run to
+see it.
+"""
+
+import functools
+import inspect
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, TypeVar
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable)
+
+
+class IdentityMap:
+    """{collection: {doc_id: doc}} for one request, plus a saved-reads counter."""
+
+    def __init__(self):
+        self._docs: dict[str, dict[str, dict]] = {}
+        self._lock = threading.Lock()
+        self.saved_reads = 0
+
+    def add(self, collection: str, docs: dict[str, dict]) -> None:
+        """Record documents loaded from the data source."""
+        with self._lock:
+            self._docs.setdefault(collection, {}).update(docs)
+
+    def lookup(
+        self,
+        collection: str,
+        doc_ids: list[str],
+    ) -> tuple[dict[str, dict], list[str]]:
+        """
+        Split doc_ids into (already loaded {id: doc}, ids still to fetch).
+        Every ID served from memory counts as one saved read.
+        """
+        with self._lock:
+            loaded = self._docs.get(collection, {})
+            found = {doc_id: loaded[doc_id] for doc_id in doc_ids if doc_id in loaded}
+            self.saved_reads += len(found)
+        missing = [doc_id for doc_id in doc_ids if doc_id not in found]
+        return found, missing
+
+
+_current: ContextVar[IdentityMap | None] = ContextVar("identity_map", default=None)
+
+_totals_lock = threading.Lock()
+_saved_reads_total = 0
+
+
+def current_scope() -> IdentityMap | None:
+    """The identity map of the running request, or None outside a scope."""
+    return _current.get()
+
+
+@contextmanager
+def request_scope() -> Iterator[IdentityMap]:
+    """
+    Open an identity map for the duration of a request.
+    Nested calls reuse the outer scope, so composed builders share one map.
+    """
+    outer = _current.get()
+    if outer is not None:
+        yield outer
+        return
+
+    scope = IdentityMap()
+    token = _current.set(scope)
+    try:
+        yield scope
+    finally:
+        _current.reset(token)
+        global _saved_reads_total
+        with _totals_lock:
+            _saved_reads_total += scope.saved_reads
+        if scope.saved_reads:
+            logger.debug(f"identity map saved {scope.saved_reads} document reads")
+
+
+def request_scoped(fn: F) -> F:
+    """Decorator — run fn (sync or async) inside request_scope()."""
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            with request_scope():
+                return await fn(*args, **kwargs)
+        return async_wrapper  # type: ignore[return-value]
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with request_scope():
+            return fn(*args, **kwargs)
+    return wrapper  # type: ignore[return-value]
+
+
+def stats() -> dict:
+    """Process-wide total of document reads served from identity maps."""
+    with _totals_lock:
+        return {"saved_reads": _saved_reads_total}
@@ -0,0 +1,43 @@
+"""
+db/inbox.py
+
+Shared helpers for the fan-out-on-write feed inbox (config.FEED_INBOX_ENABLED).
+
+When a business publishes a post, a small reference to it is appended to
+the inbox of every follower. build_feed then reads the followed half of a
+feed from ONE inbox document instead of streaming the following list and
+running 'in' queries over every followed business.
+
+Firestore layout:
+  feed_inbox/{userId}                     seeded: bool, posts: [{id, uid, createdAt}]
+  users/{businessId}/followers/{uid}      one doc per follower (ID = follower's uid),
+                                          written by the web app on follow
+
+An inbox only counts once it is seeded (the first pull-based feed read
+writes the followed posts it found). Fan-out never reads inboxes, so the
+array can overshoot FEED_INBOX_SIZE between reads; readers trim it.
+"""
+
+import math
+
+from core.scorer import created_epoch
+
+INBOX_COLLECTION = "feed_inbox"
+
+
+def inbox_entry(post: dict) -> dict:
+    """The reference stored in an inbox — only the fields ranking needs."""
+    return {"id": post.get("id"), "uid": post.get("uid"), "createdAt": post.get("createdAt")}
+
+
+def split_inbox(entries: list[dict], size: int) -> tuple[list[dict], list[dict]]:
+    """
+    (newest `size` entries, overflow) — both newest first.
+    Entries without a parseable createdAt sort last.
+    """
+    def newest(entry: dict) -> float:
+        ts = created_epoch(entry.get("createdAt"))
+        return -math.inf if math.isnan(ts) else ts
+
+    ordered = sorted(entries, key=newest, reverse=True)
+    return ordered[:size], ordered[size:]
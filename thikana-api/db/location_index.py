@@ -0,0 +1,351 @@
+"""
+db/location_index.py
+
+Builds, repairs and verifies location_index/{cell} — the geohash index
+FirebaseDB.get_nearby_businesses reads. Every located business is listed
+in one cell per indexed precision:
+
+  location_index/{cell}   business_ids: [businessId, ...]   (cell = base32 geohash)
+
+  sync()              diff the index against `businesses` and write only the
+                      cells that differ — a first build and a repair are the
+                      same operation
+  reindex_business()  incremental update after one business moved, gained a
+                      location or was deleted (old location not needed)
+  diff_index()        what sync() would change — the verify mode
+
+Cells are computed in one vectorised pass (core/geohash_codec.encode_batch)
+and writes go out in WriteBatches of 500 operations. Targets:
+
+  FirestoreIndex   a Firestore client — production or the emulator
+  MemoryIndex      a dict, optionally saved as JSON — tests and mock data
+
+Only cells of the requested precisions are read or written. Queries use
+the precisions in config.GEOHASH_INDEX_PRECISIONS, so build new precisions
+first, then add them there. The default precisions (build_precisions())
+always include the queried ones, so a plain `build` backfills an index
+that lacks one. Running servers cache cells for CELL_CACHE_TTL_SECONDS
+and see changes after that.
+
+CLI (run from thikana-api/):
+  python -m db.location_index build  [--precisions 4 5 6] [--dry-run]
+  python -m db.location_index verify [--precisions 4 5 6]
+  python -m db.location_index update BUSINESS_ID [BUSINESS_ID ...]
+
+  --emulator HOST:PORT [--project ID]   Firestore emulator instead of KEY_PATH
+  --mock FILE                           data/mock_db.json → index in a JSON file
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+
+import config
+from core import geohash_codec
+
+INDEX_COLLECTION = "location_index"
+_WRITE_BATCH_SIZE = 500  # Firestore WriteBatch limit
+
+# cell → business_ids
+Index = dict[str, frozenset[str]]
+
+# ("set" | "delete" | "add" | "remove", cell, business_ids)
+Write = tuple[str, str, list[str]]
+
+
+# ── Cells ─────────────────────────────────────────────────────────────────────
+
+def build_precisions() -> tuple[int, ...]:
+    """GEOHASH_BUILD_PRECISIONS plus every precision queries read."""
+    precisions = set(config.GEOHASH_BUILD_PRECISIONS) | set(config.GEOHASH_INDEX_PRECISIONS)
+    return tuple(sorted(precisions))
+
+
+def _location(doc: dict | None) -> tuple[float, float] | None:
+    loc = (doc or {}).get("location") or {}
+    lat, lon = loc.get("latitude"), loc.get("longitude")
+    if lat is None or lon is None:
+        return None
+    return float(lat), float(lon)
+
+
+def expected_index(businesses: dict[str, dict], precisions: tuple[int, ...]) -> Index:
+    """The index `businesses` should have — cells of every precision, one pass each."""
+    ids: list[str] = []
+    coords: list[tuple[float, float]] = []
+    for biz_id, doc in businesses.items():
+        loc = _location(doc)
+        if loc is not None:
+            ids.append(biz_id)
+            coords.append(loc)
+    if not ids:
+        return {}
+
+    lats, lons = np.array(coords, dtype=np.float64).T
+    cells: dict[str, set[str]] = defaultdict(set)
+    for precision in precisions:
+        codes = geohash_codec.encode_batch(lats, lons, precision)
+        for biz_id, cell in zip(ids, geohash_codec.to_base32_batch(codes, precision)):
+            cells[cell].add(biz_id)
+    return {cell: frozenset(members) for cell, members in cells.items()}
+
+
+def business_cells(doc: dict | None, precisions: tuple[int, ...]) -> set[str]:
+    """Cells one business belongs in (empty without a location)."""
+    loc = _location(doc)
+    if loc is None:
+        return set()
+    return {
+        geohash_codec.to_base32(geohash_codec.encode(*loc, precision), precision)
+        for precision in precisions
+    }
+
+
+def diff_index(expected: Index, actual: Index) -> dict[str, dict[str, list[str]]]:
+    """
+    {"missing": {cell: ids the index lacks}, "stale": {cell: ids it should
+    not list}} — both empty when the index is exact.
+    """
+    missing: dict[str, list[str]] = {}
+    stale: dict[str, list[str]] = {}
+    for cell in sorted(expected.keys() | actual.keys()):
+        want = expected.get(cell, frozenset())
+        have = actual.get(cell, frozenset())
+        if want - have:
+            missing[cell] = sorted(want - have)
+        if have - want:
+            stale[cell] = sorted(have - want)
+    return {"missing": missing, "stale": stale}
+
+
+# ── Maintenance ───────────────────────────────────────────────────────────────
+
+def sync(
+    target,
+    businesses: dict[str, dict],
+    precisions: tuple[int, ...] | None = None,
+    dry_run: bool = False,
+) -> dict:
+    """
+    Make target's cells at `precisions` (default build_precisions()) match
+    `businesses`.
+
+    Steps:
+      1. Expected cells for every located business        [0 reads]
+      2. Read the index at those precisions               [1 read per cell]
+      3. Rewrite the cells that differ, delete the empty  [1 write per changed cell]
+
+    Returns counts: businesses, cells, missing, stale, written.
+    """
+    precisions = tuple(precisions or build_precisions())
+    expected = expected_index(businesses, precisions)
+    actual = target.read(precisions)
+    diff = diff_index(expected, actual)
+
+    changed = diff["missing"].keys() | diff["stale"].keys()
+    changed |= {cell for cell, ids in actual.items() if not ids and cell not in expected}
+    writes: list[Write] = [
+        ("set", cell, sorted(expected[cell])) if cell in expected else ("delete", cell, [])
+        for cell in sorted(changed)
+    ]
+    if not dry_run:
+        target.apply(writes)
+    return {
+        "businesses": len(businesses),
+        "cells":      len(expected),
+        "missing":    sum(len(ids) for ids in diff["missing"].values()),
+        "stale":      sum(len(ids) for ids in diff["stale"].values()),
+        "written":    0 if dry_run else len(writes),
+    }
+
+
+def reindex_business(
+    target,
+    biz_id: str,
+    doc: dict | None,
+    precisions: tuple[int, ...] | None = None,
+) -> tuple[set[str], set[str]]:
+    """
+    List biz_id under the cells of doc's current location only (doc None =
+    business deleted). The cells that list it now are looked up in the
+    index, so callers do not need the old location.
+
+    Returns (cells added to, cells removed from).
+    """
+    precisions = tuple(precisions or build_precisions())
+    want = business_cells(doc, precisions)
+    have = {cell for cell in target.cells_of(biz_id) if len(cell) in precisions}
+    added, removed = want - have, have - want
+    target.apply(
+        [("remove", cell, [biz_id]) for cell in sorted(removed)]
+        + [("add", cell, [biz_id]) for cell in sorted(added)]
+    )
+    return added, removed
+
+
+# ── Targets ───────────────────────────────────────────────────────────────────
+
+class MemoryIndex:
+    """location_index held in a dict: cell → set of business_ids."""
+
+    def __init__(self, cells: dict[str, list[str]] | None = None):
+        self.cells: dict[str, set[str]] = {
+            cell: set(ids) for cell, ids in (cells or {}).items()
+        }
+        self.writes = 0
+
+    @classmethod
+    def load(cls, path: Path) -> "MemoryIndex":
+        """From a JSON file of {cell: [business_ids]} (empty when absent)."""
+        if not path.exists():
+            return cls()
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def save(self, path: Path) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({cell: sorted(ids) for cell, ids in sorted(self.cells.items())}, f, indent=2)
+
+    def read(self, precisions: tuple[int, ...]) -> Index:
+        return {
+            cell: frozenset(ids)
+            for cell, ids in self.cells.items()
+            if len(cell) in precisions
+        }
+
+    def cells_of(self, biz_id: str) -> set[str]:
+        return {cell for cell, ids in self.cells.items() if biz_id in ids}
+
+    def apply(self, writes: list[Write]) -> None:
+        for op, cell, ids in writes:
+            if op == "set":
+                self.cells[cell] = set(ids)
+            elif op == "delete":
+                self.cells.pop(cell, None)
+            elif op == "add":
+                self.cells.setdefault(cell, set()).update(ids)
+            else:                                      # remove
+                self.cells.get(cell, set()).difference_update(ids)
+        self.writes += len(writes)
+
+
+class FirestoreIndex:
+    """location_index in Firestore (or the emulator) through a sync client."""
+
+    def __init__(self, client):
+        self._client = client
+        self._collection = client.collection(INDEX_COLLECTION)
+        self.writes = 0
+
+    def read(self, precisions: tuple[int, ...]) -> Index:
+        """Streams the whole collection — one read per cell."""
+        return {
+            doc.id: frozenset((doc.to_dict() or {}).get("business_ids", []))
+            for doc in self._collection.stream()
+            if len(doc.id) in precisions
+        }
+
+    def cells_of(self, biz_id: str) -> set[str]:
+        """One array_contains query — one read per matching cell."""
+        query = self._collection.where("business_ids", "array_contains", biz_id)
+        return {doc.id for doc in query.select([]).stream()}
+
+    def apply(self, writes: list[Write]) -> None:
+        """Commits the writes in WriteBatches of _WRITE_BATCH_SIZE."""
+        from firebase_admin import firestore
+
+        for i in range(0, len(writes), _WRITE_BATCH_SIZE):
+            batch = self._client.batch()
+            for op, cell, ids in writes[i : i + _WRITE_BATCH_SIZE]:
+                ref = self._collection.document(cell)
+                if op == "set":
+                    batch.set(ref, {"business_ids": list(ids)})
+                elif op == "delete":
+                    batch.delete(ref)
+                elif op == "add":
+                    batch.set(ref, {"business_ids": firestore.ArrayUnion(list(ids))}, merge=True)
+                else:                                  # remove
+                    batch.set(ref, {"business_ids": firestore.ArrayRemove(list(ids))}, merge=True)
+            batch.commit()
+        self.writes += len(writes)
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+
+def _firestore_client(emulator: str | None, project: str):
+    if emulator:
+        from firebase_admin import firestore
+
+        os.environ["FIRESTORE_EMULATOR_HOST"] = emulator
+        return firestore.Client(project=project)
+    from db.firebase import _db                        # KEY_PATH credentials
+    return _db
+
+
+def _load_businesses(client) -> dict[str, dict]:
+    """businesses/ projected to location — one read per business."""
+    docs = client.collection("businesses").select(["location"]).stream()
+    return {doc.id: doc.to_dict() or {} for doc in docs}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m db.location_index",
+        description="Build, verify or update location_index from businesses.",
+    )
+    parser.add_argument("command", choices=["build", "verify", "update"])
+    parser.add_argument("business_ids", nargs="*", help="update: businesses to re-index")
+    parser.add_argument(
+        "--precisions", type=int, nargs="+", default=list(build_precisions()),
+        help="geohash precisions to index (default: %(default)s)",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="build: report, write nothing")
+    target_args = parser.add_mutually_exclusive_group()
+    target_args.add_argument("--emulator", metavar="HOST:PORT", help="Firestore emulator")
+    target_args.add_argument("--mock", metavar="FILE", type=Path,
+                             help="index in a JSON file, businesses from data/mock_db.json")
+    parser.add_argument("--project", default="demo-thikana", help="project ID for --emulator")
+    args = parser.parse_args(argv)
+    precisions = tuple(args.precisions)
+
+    if args.command == "update" and not args.business_ids:
+        parser.error("update needs at least one BUSINESS_ID")
+
+    if args.mock:
+        from db.mock import MockDB
+
+        target = MemoryIndex.load(args.mock)
+        businesses = MockDB()._data["businesses"]
+        get_business = businesses.get
+        load_all = lambda: businesses
+    else:
+        client = _firestore_client(args.emulator, args.project)
+        target = FirestoreIndex(client)
+        get_business = lambda biz_id: client.collection("businesses").document(biz_id).get().to_dict()
+        load_all = lambda: _load_businesses(client)
+
+    if args.command == "update":
+        for biz_id in args.business_ids:
+            added, removed = reindex_business(target, biz_id, get_business(biz_id), precisions)
+            print(f"{biz_id}: +{sorted(added)} -{sorted(removed)}")
+        status = 0
+    else:
+        dry_run = args.dry_run or args.command == "verify"
+        report = sync(target, load_all(), precisions, dry_run=dry_run)
+        print(" ".join(f"{key}={value}" for key, value in report.items()))
+        status = 1 if args.command == "verify" and (report["missing"] or report["stale"]) else 0
+
+    if args.mock and target.writes:
+        target.save(args.mock)
+    return status
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
@@ -9,36 +9,49 @@ Swap this entire file for db/firebase.py and nothing else changes.
 """
 
 import json
-import math
+from datetime import datetime
 from pathlib import Path
 
+import config
 from config import MAX_RADIUS_KM
+from core.distance import within_radius
+from core.scorer import created_epoch
+from core.spatial_index import GridIndex
+from db import identity_map
+from db.identity_map import current_scope
+from db.inbox import inbox_entry, split_inbox
 
 _MOCK_DB_PATH = Path(__file__).parent.parent / "data" / "mock_db.json"
 
 
-def _haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    R = 6371.0
-    dlat = math.radians(lat2 - lat1)
-    dlon = math.radians(lon2 - lon1)
-    a = (
-        math.sin(dlat / 2) ** 2
-        + math.cos(math.radians(lat1))
-        * math.cos(math.radians(lat2))
-        * math.sin(dlon / 2) ** 2
-    )
-    return R * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-
-
 class MockDB:
     """
     Reads data/mock_db.json once and caches it in memory.
     All methods mirror what FirebaseDB will do when implemented.
+
+    Pass `data` to run against an in-memory snapshot instead of the JSON file.
     """
 
-    def __init__(self):
-        with open(_MOCK_DB_PATH, "r", encoding="utf-8") as f:
-            self._data = json.load(f)
+    def __init__(self, data: dict | None = None):
+        if data is None:
+            with open(_MOCK_DB_PATH, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        self._data = data
+
+        # Spatial index over business coordinates — built once, queried per request
+        self._index = GridIndex()
+        for biz_id, biz in self._data["businesses"].items():
+            loc = biz.get("location")
+            if not loc:
+                continue
+            self._index.insert(biz_id, loc["latitude"], loc["longitude"])
+
+        self._posts_by_id: dict[str, dict] = {
+            post["id"]: post for post in self._data["posts"] if post.get("id")
+        }
+
+        # feed_inbox/{user_id} → {"seeded": bool, "posts": [post refs]}
+        self._inboxes: dict[str, dict] = {}
 
     # ── Interface methods ─────────────────────────────────────────────────────
 
@@ -49,14 +62,22 @@ class MockDB:
         """
         return self._data["users"].get(user_id)
 
-    def get_following_ids(self, user_id: str) -> list[str]:
+    def cache_stats(self) -> dict:
+        """Only the identity map — the snapshot itself needs no caches."""
+        return {"identity_map": identity_map.stats()}
+
+    def get_following_ids(self, user_id: str) -> frozenset[str]:
         """
         Firebase equivalent:
             db.collection('users').document(user_id)
               .collection('following').stream()              → 1 read
+            (0 reads while the per-user TTL cache holds it)
         """
         user = self._data["users"].get(user_id, {})
-        return user.get("following", [])
+        return frozenset(user.get("following", []))
+
+    def invalidate_following(self, user_id: str) -> None:
+        """Nothing cached — the snapshot is the source of truth."""
 
     def get_nearby_businesses(
         self,
@@ -65,60 +86,119 @@ class MockDB:
         max_radius_km: float = MAX_RADIUS_KM,
     ) -> dict[str, float]:
         """
-        Mock: brute-force Haversine over all businesses in JSON (fine for dev).
+        Mock: grid-index lookup, then a vectorised bounding-box pass and exact
+        Haversine over the nearby buckets only.
 
         Firebase equivalent (scalable — O(1) regardless of business count):
-            1. Encode (lat,lon) → geohash (precision=5), get 9 cells  [free]
-            2. Read location_index/{cell} for 9 cells               [9 reads]
+            1. Cover the radius with indexed geohash cells            [free]
+            2. Read location_index/{cell} for the c cells          [c reads]
             3. Collect business_ids from each cell
             4. Batch-fetch businesses/{id}                [ceil(n/10) reads]
-            5. Haversine filter for exact distance                    [free]
+            5. Bounding box, then Haversine for exact distance         [free]
 
         Returns {business_id: distance_km}, sorted by distance ascending.
         """
-        result: dict[str, float] = {}
-        for biz_id, biz in self._data["businesses"].items():
-            loc = biz.get("location")
-            if not loc:
-                continue
-            dist = _haversine_km(lat, lon, loc["latitude"], loc["longitude"])
-            if dist <= max_radius_km:
-                result[biz_id] = round(dist, 2)
+        ids, lats, lons = [], [], []
+        for biz_id, biz_lat, biz_lon in self._index.query_radius(lat, lon, max_radius_km):
+            ids.append(biz_id)
+            lats.append(biz_lat)
+            lons.append(biz_lon)
+        if not ids:
+            return {}
+
+        hits, dists = within_radius(lat, lon, lats, lons, max_radius_km)
+        result: dict[str, float] = {
+            ids[i]: round(float(dist), 2) for i, dist in zip(hits, dists)
+        }
+
+        # Firebase loads these docs for their location — record them in the
+        # request's identity map just like FirebaseDB does
+        scope = current_scope()
+        if scope is not None:
+            businesses = self._data["businesses"]
+            scope.add("businesses", {biz_id: businesses[biz_id] for biz_id in result})
+
         return dict(sorted(result.items(), key=lambda x: x[1]))
 
+    def get_nearest_businesses(
+        self,
+        lat: float,
+        lon: float,
+        k: int,
+        max_radius_km: float,
+    ) -> dict[str, float]:
+        """
+        Mock: rings of grid buckets outward from the user's bucket, stopping
+        once nothing further out can beat the k nearest found.
+
+        Firebase equivalent (the same rings, in geohash cells):
+            1. Cover a radius, doubling it until it holds k businesses
+               or reaches max_radius_km                [cells not yet read]
+            2. Batch-fetch the new businesses/{id}        [ceil(n/10) reads]
+            3. First k by exact distance                              [free]
+
+        Returns {business_id: distance_km}, sorted by distance ascending.
+        """
+        result: dict[str, float] = {
+            biz_id: round(dist, 2)
+            for biz_id, dist in self._index.nearest(lat, lon, k, max_radius_km)
+        }
+        scope = current_scope()
+        if scope is not None:
+            businesses = self._data["businesses"]
+            scope.add("businesses", {biz_id: businesses[biz_id] for biz_id in result})
+        return result
+
     def get_businesses_batch(self, business_ids: list[str]) -> dict[str, dict]:
         """
         Firebase equivalent:
             Firestore 'in' query in batches of 10       [ceil(n/10) reads]
+            (IDs already loaded in the request_scope() cost 0 reads)
         """
         if not business_ids:
             return {}
-        return {
+
+        result: dict[str, dict] = {}
+        scope = current_scope()
+        if scope is not None:
+            result, business_ids = scope.lookup("businesses", business_ids)
+
+        fetched = {
             biz_id: self._data["businesses"][biz_id]
             for biz_id in business_ids
             if biz_id in self._data["businesses"]
         }
+        if scope is not None:
+            scope.add("businesses", fetched)
+        result.update(fetched)
+        return result
 
     def get_posts_for_businesses(
         self,
         business_ids: list[str],
         limit_per_business: int = 5,
+        since: datetime | None = None,
     ) -> list[dict]:
         """
         Firebase equivalent:
             Firestore 'in' query on uid field in batches of 10  [ceil(n/10) reads]
 
         limit_per_business prevents one very active business flooding the feed.
+        since mirrors Firestore's createdAt >= since filter; posts without a
+        parseable createdAt are excluded by it, as in Firestore.
         """
         if not business_ids:
             return []
 
         biz_set = set(business_ids)
         by_biz: dict[str, list[dict]] = {}
+        since_ts = since.timestamp() if since is not None else None
 
         for post in self._data["posts"]:
             uid = post.get("uid")
             if uid in biz_set:
+                if since_ts is not None and not created_epoch(post.get("createdAt")) >= since_ts:
+                    continue
                 by_biz.setdefault(uid, []).append(post)
 
         result = []
@@ -126,3 +206,161 @@ class MockDB:
             posts.sort(key=lambda p: p.get("createdAt", ""), reverse=True)
             result.extend(posts[:limit_per_business])
         return result
+
+    def get_post_candidates(
+        self,
+        business_ids: list[str],
+        limit_per_business: int = 5,
+        since: datetime | None = None,
+    ) -> list[dict]:
+        """
+        Firebase equivalent:
+            same 'in' query with select(['uid', 'createdAt'])  [ceil(n/10) reads]
+
+        Returns skinny {id, uid, createdAt} dicts — just enough to rank.
+        """
+        return [
+            {"id": post.get("id"), "uid": post.get("uid"), "createdAt": post.get("createdAt")}
+            for post in self.get_posts_for_businesses(business_ids, limit_per_business, since)
+        ]
+
+    def get_posts_by_ids(self, post_ids: list[str]) -> dict[str, dict]:
+        """
+        Firebase equivalent:
+            db.get_all(post refs) in batches of 10       [ceil(n/10) reads]
+        """
+        return {
+            post_id: self._posts_by_id[post_id]
+            for post_id in post_ids
+            if post_id in self._posts_by_id
+        }
+
+    # ── Feed inbox (fan-out on write) ─────────────────────────────────────────
+
+    def get_feed_inbox(self, user_id: str) -> list[dict] | None:
+        """
+        Firebase equivalent:
+            db.collection('feed_inbox').document(user_id).get()  → 1 read
+            (+ 1 ArrayRemove write when the inbox overshot FEED_INBOX_SIZE)
+        """
+        inbox = self._inboxes.get(user_id)
+        if not inbox or not inbox["seeded"]:
+            return None
+        keep, overflow = split_inbox(inbox["posts"], config.FEED_INBOX_SIZE)
+        if overflow:
+            inbox["posts"] = list(keep)
+        return keep
+
+    def seed_feed_inbox(self, user_id: str, posts: list[dict]) -> None:
+        """
+        Firebase equivalent:
+            feed_inbox/{user_id}.set({seeded, posts: ArrayUnion}, merge) → 1 write
+        """
+        inbox = self._inboxes.setdefault(user_id, {"seeded": False, "posts": []})
+        inbox["seeded"] = True
+        self._append(inbox, [inbox_entry(p) for p in posts])
+
+    def reset_feed_inbox(self, user_id: str) -> None:
+        """
+        Firebase equivalent:
+            db.collection('feed_inbox').document(user_id).delete()  → 1 write
+        """
+        self._inboxes.pop(user_id, None)
+
+    def fan_out_post(self, post_id: str) -> int:
+        """
+        Firebase equivalent:
+            posts/{post_id}.get()                                 [1 read]
+            users/{uid}/followers stream                          [1 read]
+            feed_inbox/{follower}.set(ArrayUnion, merge) per follower, batched
+        """
+        post = self._posts_by_id.get(post_id)
+        if post is None or not post.get("uid"):
+            return 0
+        entry = inbox_entry(post)
+        followers = [
+            user_id
+            for user_id, user in self._data["users"].items()
+            if entry["uid"] in user.get("following", [])
+        ]
+        for user_id in followers:
+            inbox = self._inboxes.setdefault(user_id, {"seeded": False, "posts": []})
+            self._append(inbox, [entry])
+        return len(followers)
+
+    @staticmethod
+    def _append(inbox: dict, entries: list[dict]) -> None:
+        """ArrayUnion — entries already present are not added twice."""
+        for entry in entries:
+            if entry not in inbox["posts"]:
+                inbox["posts"].append(entry)
+
+
+class AsyncMockDB:
+    """
+    AsyncDataProvider over a MockDB. Lookups are in-memory and never block,
+    so each coroutine simply calls the sync method.
+    """
+
+    def __init__(self, mock: MockDB):
+        self._mock = mock
+
+    async def get_user(self, user_id: str) -> dict | None:
+        return self._mock.get_user(user_id)
+
+    async def get_following_ids(self, user_id: str) -> frozenset[str]:
+        return self._mock.get_following_ids(user_id)
+
+    async def invalidate_following(self, user_id: str) -> None:
+        self._mock.invalidate_following(user_id)
+
+    async def get_nearby_businesses(
+        self,
+        lat: float,
+        lon: float,
+        max_radius_km: float = MAX_RADIUS_KM,
+    ) -> dict[str, float]:
+        return self._mock.get_nearby_businesses(lat, lon, max_radius_km)
+
+    async def get_nearest_businesses(
+        self,
+        lat: float,
+        lon: float,
+        k: int,
+        max_radius_km: float,
+    ) -> dict[str, float]:
+        return self._mock.get_nearest_businesses(lat, lon, k, max_radius_km)
+
+    async def get_businesses_batch(self, business_ids: list[str]) -> dict[str, dict]:
+        return self._mock.get_businesses_batch(business_ids)
+
+    async def get_posts_for_businesses(
+        self,
+        business_ids: list[str],
+        limit_per_business: int = 5,
+        since: datetime | None = None,
+    ) -> list[dict]:
+        return self._mock.get_posts_for_businesses(business_ids, limit_per_business, since)
+
+    async def get_post_candidates(
+        self,
+        business_ids: list[str],
+        limit_per_business: int = 5,
+        since: datetime | None = None,
+    ) -> list[dict]:
+        return self._mock.get_post_candidates(business_ids, limit_per_business, since)
+
+    async def get_posts_by_ids(self, post_ids: list[str]) -> dict[str, dict]:
+        return self._mock.get_posts_by_ids(post_ids)
+
+    async def get_feed_inbox(self, user_id: str) -> list[dict] | None:
+        return self._mock.get_feed_inbox(user_id)
+
+    async def seed_feed_inbox(self, user_id: str, posts: list[dict]) -> None:
+        self._mock.seed_feed_inbox(user_id, posts)
+
+    async def reset_feed_inbox(self, user_id: str) -> None:
+        self._mock.reset_feed_inbox(user_id)
+
+    async def fan_out_post(self, post_id: str) -> int:
+        return self._mock.fan_out_post(post_id)
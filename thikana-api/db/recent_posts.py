@@ -0,0 +1,212 @@
+"""
+db/recent_posts.py
+
+In-process store of each business's newest posts (config.RECENT_POSTS_ENABLED).
+
+build_feed only ever asks for the newest few posts per business, yet every
+request runs 'in' queries for them. RecentPosts keeps a bounded, newest-first
+ring buffer of RECENT_POSTS_PER_BUSINESS posts per business, fed by
+
+  start(client)   a Firestore on_snapshot listener on `posts` (first callback
+                  = bootstrap, then only changes), or
+  bootstrap() / ingest() / discard()   explicit hooks for other writers
+
+and FirebaseDB answers get_posts_for_businesses / get_post_candidates from
+it once warm (`ready`), querying Firestore only for the businesses lookup()
+cannot answer exactly.
+
+A buffer that has never overflowed holds ALL of its business's posts. Once
+it overflows it holds the newest N — a contiguous prefix — so a request is
+answerable when its limit fits in the buffer or its `since` bound falls
+inside it. Backdated posts older than a full buffer's tail are ignored to
+keep the prefix contiguous. Posts without a parseable createdAt are skipped,
+as Firestore's createdAt ordering skips them.
+
+Listener callbacks run on a background thread; a lock guards the buffers.
+Returned documents are shared — treat them as read-only.
+"""
+
+import logging
+import math
+import threading
+from datetime import datetime, timedelta, timezone
+
+import config
+from core.scorer import created_epoch
+
+logger = logging.getLogger(__name__)
+
+
+class RecentPosts:
+    """Newest posts per business, kept current from change events."""
+
+    def __init__(
+        self,
+        per_business: int = config.RECENT_POSTS_PER_BUSINESS,
+        horizon_hours: float | None = config.RECENT_POSTS_HORIZON_HOURS,
+    ):
+        self.per_business = per_business
+        self.horizon_hours = horizon_hours
+        self._horizon: float = -math.inf       # older posts were never loaded
+        self._buffers: dict[str, list[tuple[float, dict]]] = {}   # newest first
+        self._trimmed: set[str] = set()        # buffers that have dropped a post
+        self._owner: dict[str, str] = {}       # post_id → business_id
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._watch = None
+        self.changes_applied = 0
+
+    def __len__(self) -> int:
+        return len(self._owner)
+
+    @property
+    def ready(self) -> bool:
+        """True once the store holds a complete bootstrap."""
+        return self._ready.is_set()
+
+    # ── Feeding ───────────────────────────────────────────────────────────────
+
+    def start(self, client) -> None:
+        """Subscribe to posts (only createdAt >= now - horizon when one is set)."""
+        if self._watch is not None:
+            return
+        query = client.collection("posts")
+        if self.horizon_hours is not None:
+            since = datetime.now(timezone.utc) - timedelta(hours=self.horizon_hours)
+            self._horizon = since.timestamp()
+            query = query.where("createdAt", ">=", since)
+        self._watch = query.on_snapshot(self._on_snapshot)
+        logger.info("recent posts: listener started")
+
+    def stop(self) -> None:
+        if self._watch is not None:
+            self._watch.unsubscribe()
+            self._watch = None
+
+    def _on_snapshot(self, _docs, changes, _read_time) -> None:
+        with self._lock:
+            for change in changes:
+                doc = change.document
+                if change.type.name == "REMOVED":
+                    self._discard(doc.id)
+                else:                                  # ADDED / MODIFIED
+                    self._ingest({**(doc.to_dict() or {}), "id": doc.id})
+            self.changes_applied += len(changes)
+        self._mark_ready()
+
+    def bootstrap(self, posts: list[dict], since: datetime | None = None) -> None:
+        """
+        Load a full backfill — every post created at or after `since` (all
+        posts when None) — and start answering lookups.
+        """
+        with self._lock:
+            if since is not None:
+                self._horizon = since.timestamp()
+            for post in posts:
+                self._ingest(post)
+        self._mark_ready()
+
+    def ingest(self, post: dict) -> None:
+        """Add or update one post (needs id, uid, createdAt)."""
+        with self._lock:
+            self._ingest(post)
+
+    def discard(self, post_id: str) -> None:
+        """Forget a deleted post."""
+        with self._lock:
+            self._discard(post_id)
+
+    def _mark_ready(self) -> None:
+        if not self._ready.is_set():
+            self._ready.set()
+            logger.info(
+                f"recent posts: bootstrapped {len(self._owner)} posts "
+                f"for {len(self._buffers)} businesses"
+            )
+
+    # ── Mutations (lock held) ─────────────────────────────────────────────────
+
+    def _ingest(self, post: dict) -> None:
+        post_id, biz_id = post.get("id"), post.get("uid")
+        ts = created_epoch(post.get("createdAt"))
+        if self._owner.get(post_id) == biz_id:
+            buffer = self._buffers[biz_id]
+            for i, (old_ts, old_post) in enumerate(buffer):
+                if old_post.get("id") == post_id and old_ts == ts:
+                    buffer[i] = (ts, post)             # edit in place — same slot
+                    return
+        if post_id in self._owner:
+            self._discard(post_id)
+        if not biz_id or math.isnan(ts) or ts < self._horizon:
+            return
+
+        buffer = self._buffers.setdefault(biz_id, [])
+        if biz_id in self._trimmed and buffer and ts < buffer[-1][0]:
+            return                                     # would leave a gap
+        buffer.append((ts, post))
+        buffer.sort(key=lambda entry: entry[0], reverse=True)
+        self._owner[post_id] = biz_id
+
+        for _, dropped in buffer[self.per_business:]:
+            del self._owner[dropped["id"]]
+            self._trimmed.add(biz_id)
+        del buffer[self.per_business:]
+
+    def _discard(self, post_id: str) -> None:
+        biz_id = self._owner.pop(post_id, None)
+        if biz_id is None:
+            return
+        buffer = self._buffers[biz_id]
+        buffer[:] = [entry for entry in buffer if entry[1].get("id") != post_id]
+        if not buffer and biz_id not in self._trimmed:
+            del self._buffers[biz_id]
+
+    # ── Reads ─────────────────────────────────────────────────────────────────
+
+    def lookup(
+        self,
+        business_ids: list[str],
+        limit_per_business: int,
+        since: datetime | None = None,
+        fields: list[str] | None = None,
+    ) -> tuple[list[dict], list[str]]:
+        """
+        (posts answered from the buffers, business_ids that need a live query).
+
+        Same result as the posts query for every answered business: its newest
+        limit_per_business posts with createdAt >= since, newest first,
+        projected to `fields` (plus id) when given.
+        """
+        if not self.ready:
+            return [], list(business_ids)
+        floor = -math.inf if since is None else since.timestamp()
+        if floor < self._horizon:
+            return [], list(business_ids)
+
+        posts: list[dict] = []
+        uncovered: list[str] = []
+        with self._lock:
+            for biz_id in business_ids:
+                buffer = self._buffers.get(biz_id, ())
+                fresh = [post for ts, post in buffer if ts >= floor]
+                complete = (
+                    biz_id not in self._trimmed
+                    or len(fresh) >= limit_per_business
+                    or len(fresh) < len(buffer)          # buffer reaches past since
+                )
+                if not complete:
+                    uncovered.append(biz_id)
+                    continue
+                for post in fresh[:limit_per_business]:
+                    if fields is not None:
+                        post = {"id": post["id"], **{f: post.get(f) for f in fields}}
+                    posts.append(post)
+        return posts, uncovered
+
+    def stats(self) -> dict:
+        return {
+            "ready":           self.ready,
+            "businesses":      len(self._buffers),
+            "posts":           len(self._owner),
+            "changes_applied": self.changes_applied,
+        }
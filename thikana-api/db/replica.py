@@ -0,0 +1,120 @@
+"""
+db/replica.py
+
+In-memory replica of the `businesses` collection (config.BUSINESS_REPLICA_ENABLED).
+
+Business documents are read-mostly, so instead of reading them per request
+FirebaseDB can keep a full local copy: a Firestore on_snapshot listener
+delivers every document once (bootstrap) and then only the changes. The
+replica keeps them in a BusinessTable (core/business_table.py), so
+
+  get_nearby_businesses  → one vectorised Haversine pass over the lat/lon columns
+  get_businesses_batch   → row lookups, rebuilt as BusinessTable.FIELDS docs
+
+are answered locally with zero Firestore reads once the first snapshot
+has arrived (`ready`). Until then FirebaseDB keeps using Firestore.
+
+Listener callbacks run on a background thread; a lock keeps readers from
+seeing the index mid-update. Only the FIELDS projection of each document is
+kept, so the replica's size does not grow with unrelated business fields.
+"""
+
+import logging
+import threading
+
+import config
+from core.business_table import BusinessTable
+
+logger = logging.getLogger(__name__)
+
+
+class BusinessReplica:
+    """Local copy of businesses/{id} kept current from change events."""
+
+    def __init__(self):
+        self._table = BusinessTable()
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._watch = None
+        self.changes_applied = 0
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    @property
+    def ready(self) -> bool:
+        """True once the bootstrap snapshot has been applied."""
+        return self._ready.is_set()
+
+    # ── Listener ──────────────────────────────────────────────────────────────
+
+    def start(self, client) -> None:
+        """Subscribe to the businesses collection (first callback = bootstrap)."""
+        if self._watch is None:
+            self._watch = client.collection("businesses").on_snapshot(self._on_snapshot)
+            logger.info("business replica: listener started")
+
+    def stop(self) -> None:
+        if self._watch is not None:
+            self._watch.unsubscribe()
+            self._watch = None
+
+    def _on_snapshot(self, _docs, changes, _read_time) -> None:
+        with self._lock:
+            for change in changes:
+                doc = change.document
+                if change.type.name == "REMOVED":
+                    self._remove(doc.id)
+                else:                                  # ADDED / MODIFIED
+                    self._upsert(doc.id, doc.to_dict() or {})
+            self.changes_applied += len(changes)
+        if not self._ready.is_set():
+            self._ready.set()
+            logger.info(f"business replica: bootstrapped {len(self._table)} businesses")
+
+    # ── Mutations (lock held) ─────────────────────────────────────────────────
+
+    def _upsert(self, biz_id: str, data: dict) -> None:
+        self._table.upsert(biz_id, data)
+
+    def _remove(self, biz_id: str) -> None:
+        self._table.remove(biz_id)
+
+    # ── Reads ─────────────────────────────────────────────────────────────────
+
+    def nearby(
+        self,
+        lat: float,
+        lon: float,
+        max_radius_km: float = config.MAX_RADIUS_KM,
+    ) -> dict[str, float]:
+        """
+        Same contract as DataProvider.get_nearby_businesses.
+        Returns {business_id: distance_km}, sorted by distance ascending.
+        """
+        with self._lock:
+            return self._table.nearby(lat, lon, max_radius_km)
+
+    def nearest(
+        self,
+        lat: float,
+        lon: float,
+        k: int,
+        max_radius_km: float,
+    ) -> dict[str, float]:
+        """Same contract as DataProvider.get_nearest_businesses."""
+        with self._lock:
+            return self._table.nearest(lat, lon, k, max_radius_km)
+
+    def get_many(self, business_ids: list[str]) -> dict[str, dict]:
+        """{business_id: doc} for the IDs present in the replica."""
+        with self._lock:
+            return self._table.get_many(business_ids)
+
+    def stats(self) -> dict:
+        return {
+            "ready":           self.ready,
+            "size":            len(self._table),
+            "column_bytes":    self._table.nbytes(),
+            "changes_applied": self.changes_applied,
+        }
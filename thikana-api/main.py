@@ -8,8 +8,10 @@ NOTHING else lives here. All logic is in engine/ and routes/.
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from core import assembler
 from routes.feed import router as feed_router
 from routes.discovery import router as discovery_router
+from routes.home import router as home_router
 from routes.analytics import router as analytics_router
 
 # ── App ───────────────────────────────────────────────────────────────────────
@@ -33,13 +35,14 @@ app.add_middleware(
 
 app.include_router(feed_router)
 app.include_router(discovery_router)
+app.include_router(home_router)
 app.include_router(analytics_router)
 
 # ── Health ────────────────────────────────────────────────────────────────────
 
 @app.get("/", tags=["Health"])
 def root():
-    return {"status": "ok", "version": "2.0.0"}
+    return {"status": "ok", "version": "2.0.0", "caches": assembler.cache_stats()}
 
 # ── Run ───────────────────────────────────────────────────────────────────────
 
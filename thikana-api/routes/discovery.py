@@ -6,17 +6,23 @@ All business logic lives in engine/assembler.py — this file is routes ONLY.
 """
 
 from fastapi import APIRouter, HTTPException, Query
+
+import config
 from core import assembler
 
 router = APIRouter(prefix="/discovery", tags=["Discovery"])
 
 
 @router.get("/who-to-follow/{user_id}")
-def get_who_to_follow(
+async def get_who_to_follow(
     user_id: str,
     lat:   float = Query(..., description="User's current latitude",  ge=-90,  le=90),
     lon:   float = Query(..., description="User's current longitude", ge=-180, le=180),
     limit: int   = Query(10,  description="Max suggestions to return", ge=1,   le=30),
+    radius_km: float | None = Query(
+        None, description="Search radius in km (default MAX_RADIUS_KM)",
+        gt=0, le=config.MAX_QUERY_RADIUS_KM,
+    ),
 ):
     """
     Returns nearby businesses the user doesn't follow yet.
@@ -28,7 +34,9 @@ def get_who_to_follow(
     Businesses already followed are excluded.
     """
     try:
-        suggestions = assembler.build_who_to_follow(user_id, lat, lon, limit)
+        suggestions = await assembler.build_who_to_follow_async(
+            user_id, lat, lon, limit, radius_km=radius_km
+        )
         return {
             "user_id":     user_id,
             "count":       len(suggestions),
@@ -5,18 +5,43 @@ Post feed endpoint.
 All business logic lives in engine/assembler.py — this file is routes ONLY.
 """
 
-from fastapi import APIRouter, HTTPException, Query
+import secrets
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+
+import config
 from core import assembler
+from core.feed_snapshot import InvalidCursor
 
 router = APIRouter(prefix="/feed", tags=["Feed"])
 
 
+def require_internal_caller(
+    x_internal_key: str | None = Header(None, description="config.INTERNAL_API_KEY"),
+) -> None:
+    """
+    Dependency for the state-changing endpoints below: only callers that hold
+    config.INTERNAL_API_KEY (the web app's server side) may use them.
+    """
+    if not config.INTERNAL_API_KEY:
+        raise HTTPException(status_code=503, detail="Internal endpoints are not configured")
+    if not x_internal_key or not secrets.compare_digest(
+        x_internal_key.encode(), config.INTERNAL_API_KEY.encode()
+    ):
+        raise HTTPException(status_code=403, detail="Invalid X-Internal-Key")
+
+
 @router.get("/{user_id}")
-def get_feed(
+async def get_feed(
     user_id: str,
     lat:   float = Query(..., description="User's current latitude",  ge=-90,  le=90),
     lon:   float = Query(..., description="User's current longitude", ge=-180, le=180),
     limit: int   = Query(20,  description="Max posts to return",      ge=1,    le=50),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    radius_km: float | None = Query(
+        None, description="Search radius in km (default MAX_RADIUS_KM)",
+        gt=0, le=config.MAX_QUERY_RADIUS_KM,
+    ),
 ):
     """
     Returns a ranked list of posts for the user's home feed.
@@ -25,13 +50,50 @@ def get_feed(
       - Followed businesses : 55%
       - Nearby businesses   : 35%  (within 10 km)
       - Recency             : 10%  (decay over 7 days)
+
+    Pass the returned next_cursor to get the following page; it is null on
+    the last page. A cursor keeps the radius of the page that issued it.
+    """
+    try:
+        posts, next_cursor = await assembler.build_feed_page_async(
+            user_id, lat, lon, limit, cursor, radius_km=radius_km
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return {
+        "user_id":     user_id,
+        "count":       len(posts),
+        "posts":       posts,
+        "next_cursor": next_cursor,
+    }
+
+
+@router.post("/publish/{post_id}", dependencies=[Depends(require_internal_caller)])
+async def publish_post(post_id: str):
+    """
+    Fan-out-on-write hook — call after a business creates posts/{post_id}.
+    Appends the post to every follower's feed inbox (FEED_INBOX_ENABLED).
+    Internal: requires the X-Internal-Key header.
+    """
+    try:
+        inboxes = await assembler.publish_post_async(post_id)
+        return {"post_id": post_id, "inboxes": inboxes}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/{user_id}/following/changed", dependencies=[Depends(require_internal_caller)])
+async def following_changed(user_id: str):
+    """
+    Call after the user follows or unfollows a business. Drops the cached
+    following set (and the feed inbox, which the next feed request rebuilds
+    from the current following list). Internal: requires the X-Internal-Key
+    header.
     """
     try:
-        posts = assembler.build_feed(user_id, lat, lon, limit)
-        return {
-            "user_id": user_id,
-            "count":   len(posts),
-            "posts":   posts,
-        }
+        await assembler.following_changed_async(user_id)
+        return {"user_id": user_id, "invalidated": True}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,52 @@
+"""
+routes/home.py
+
+Home-screen endpoint — feed + "Who to Follow" in one request.
+All business logic lives in core/assembler.py — this file is routes ONLY.
+"""
+
+from fastapi import APIRouter, HTTPException, Query
+
+import config
+from core import assembler
+
+router = APIRouter(prefix="/home", tags=["Home"])
+
+
+@router.get("/{user_id}")
+async def get_home(
+    user_id: str,
+    lat:          float = Query(..., description="User's current latitude",   ge=-90,  le=90),
+    lon:          float = Query(..., description="User's current longitude",  ge=-180, le=180),
+    feed_limit:   int   = Query(20,  description="Max posts to return",       ge=1,    le=50),
+    follow_limit: int   = Query(10,  description="Max suggestions to return", ge=1,    le=30),
+    radius_km: float | None = Query(
+        None, description="Search radius in km (default MAX_RADIUS_KM)",
+        gt=0, le=config.MAX_QUERY_RADIUS_KM,
+    ),
+):
+    """
+    Returns /feed/{user_id} and /discovery/who-to-follow/{user_id} for the
+    same user and location, computed from one shared pass — following list,
+    nearby businesses and business documents are fetched once.
+
+    feed.next_cursor continues the feed via /feed/{user_id}?cursor=...
+    """
+    try:
+        home = await assembler.build_home_async(
+            user_id, lat, lon, feed_limit, follow_limit, radius_km=radius_km
+        )
+        return {
+            "user_id": user_id,
+            "feed": {
+                "count":       len(home["feed"]),
+                "posts":       home["feed"],
+                "next_cursor": home["next_cursor"],
+            },
+            "who_to_follow": {
+                "count":       len(home["who_to_follow"]),
+                "suggestions": home["who_to_follow"],
+            },
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
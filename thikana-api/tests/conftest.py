@@ -0,0 +1,243 @@
+"""
+tests/conftest.py
+
+Shared fixtures for the tests that run core/assembler.py against a
+synthetic MockDB snapshot:
+
+  synthetic_snapshot()   businesses around (LAT, LON) + biz_far in Mumbai,
+                         posts spread over the last few hundred hours
+  CountingDB             MockDB that records provider calls
+  install_db             puts a CountingDB behind core.assembler and clears
+                         the per-process caches around the test
+  FakeFirestore          dict-backed stand-in for the Firestore client
+  index_data()           FakeFirestore data: businesses + their location_index
+  firebase               db.firebase imported against a FakeFirestore — the
+                         real project (KEY_PATH) is never initialised
+"""
+
+# Force mock mode BEFORE any import that touches db/__init__.py
+import config
+config.USE_MOCK = True
+
+import importlib
+import random
+import sys
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from core import assembler, candidate_pool, feed_snapshot
+from db.location_index import expected_index
+from db.mock import AsyncMockDB, MockDB
+
+LAT, LON = 18.5204, 73.8567
+NOW = datetime.now(timezone.utc)
+
+
+def synthetic_snapshot(
+    seed: int,
+    businesses: int,
+    posts: int,
+    spread_deg: float,
+    hours: tuple[float, float],
+    following: dict[str, list[str]],
+) -> dict:
+    """
+    MockDB data: `businesses` cafés biz_000… within ±spread_deg of (LAT, LON),
+    biz_far in Mumbai (~120 km away), `posts` posts post_0000… created
+    hours[0]–hours[1] ago, and users → following lists.
+    """
+    rng = random.Random(seed)
+    docs = {
+        f"biz_{i:03d}": {
+            "businessName": f"Business {i}",
+            "username":     f"biz{i}",
+            "businessType": "Cafe",
+            "location": {
+                "latitude":  LAT + rng.uniform(-spread_deg, spread_deg),
+                "longitude": LON + rng.uniform(-spread_deg, spread_deg),
+            },
+            "postCount": rng.randint(0, 30),
+        }
+        for i in range(businesses)
+    }
+    docs["biz_far"] = {
+        "businessName": "Far Away", "username": "far", "businessType": "Shop",
+        "location": {"latitude": 19.0760, "longitude": 72.8777}, "postCount": 3,
+    }
+    post_docs = [
+        {
+            "id": f"post_{i:04d}",
+            "uid": rng.choice(list(docs)),
+            "caption": f"caption {i}",
+            "createdAt": (NOW - timedelta(hours=rng.uniform(*hours))).isoformat(),
+        }
+        for i in range(posts)
+    ]
+    users = {user_id: {"following": list(ids)} for user_id, ids in following.items()}
+    return {"users": users, "businesses": docs, "posts": post_docs}
+
+
+class CountingDB(MockDB):
+    """MockDB that records which provider methods were called, and with what."""
+
+    def __init__(self, data: dict):
+        super().__init__(data)
+        self.calls: Counter = Counter()
+        self.post_requests: list[list[str]] = []
+        self.business_requests: list[list[str]] = []
+
+    def get_following_ids(self, *args, **kwargs):
+        self.calls["get_following_ids"] += 1
+        return super().get_following_ids(*args, **kwargs)
+
+    def get_nearby_businesses(self, *args, **kwargs):
+        self.calls["get_nearby_businesses"] += 1
+        return super().get_nearby_businesses(*args, **kwargs)
+
+    def get_nearest_businesses(self, *args, **kwargs):
+        self.calls["get_nearest_businesses"] += 1
+        return super().get_nearest_businesses(*args, **kwargs)
+
+    def get_businesses_batch(self, business_ids, *args, **kwargs):
+        self.calls["get_businesses_batch"] += 1
+        self.business_requests.append(list(business_ids))
+        return super().get_businesses_batch(business_ids, *args, **kwargs)
+
+    def get_post_candidates(self, business_ids, *args, **kwargs):
+        self.calls["get_post_candidates"] += 1
+        self.post_requests.append(list(business_ids))
+        return super().get_post_candidates(business_ids, *args, **kwargs)
+
+    def reset(self) -> None:
+        self.calls.clear()
+        self.post_requests.clear()
+        self.business_requests.clear()
+
+
+@pytest.fixture
+def install_db(monkeypatch):
+    """install_db(data) → the CountingDB now serving core.assembler (sync and async)."""
+
+    def install(data: dict) -> CountingDB:
+        mock = CountingDB(data)
+        monkeypatch.setattr(assembler, "db", mock)
+        monkeypatch.setattr(assembler, "async_db", AsyncMockDB(mock))
+        return mock
+
+    candidate_pool.clear()
+    feed_snapshot.clear()
+    yield install
+    candidate_pool.clear()
+    feed_snapshot.clear()
+
+
+# ── Fake Firestore ────────────────────────────────────────────────────────────
+
+class FakeSnapshot:
+    def __init__(self, doc_id: str, data: dict | None):
+        self.id = doc_id
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self) -> dict | None:
+        return dict(self._data) if self._data is not None else None
+
+
+class FakeDocument:
+    def __init__(self, client: "FakeFirestore", path: str, doc_id: str):
+        self._client, self._path, self.id = client, path, doc_id
+
+    def get(self) -> FakeSnapshot:
+        return self._client.read(self._path, [self.id])[0]
+
+    def collection(self, name: str) -> "FakeCollection":
+        return FakeCollection(self._client, f"{self._path}/{self.id}/{name}")
+
+
+class FakeCollection:
+    def __init__(self, client: "FakeFirestore", path: str):
+        self._client, self._path = client, path
+
+    def document(self, doc_id: str) -> FakeDocument:
+        return FakeDocument(self._client, self._path, doc_id)
+
+    def stream(self):
+        return iter(self._client.read(self._path, list(self._client.data.get(self._path, {}))))
+
+
+class FakeBatch:
+    def __init__(self, client: "FakeFirestore"):
+        self._client = client
+        self._writes: list[tuple[str, str, dict]] = []
+
+    def set(self, ref: FakeDocument, data: dict, merge: bool = False) -> None:
+        self._writes.append((ref._path, ref.id, data))
+
+    def commit(self) -> None:
+        self._client.writes.extend(self._writes)
+
+
+class FakeFirestore:
+    """
+    Documents in data[collection path][doc_id]; subcollections are paths
+    like "users/u1/following". Counts reads per collection path, records
+    every get_all call's refs and every committed batch write as
+    (path, doc_id, data) — writes are not applied to data.
+    """
+
+    def __init__(self, data: dict[str, dict[str, dict]] | None = None):
+        self.data = data or {}
+        self.reads: Counter = Counter()
+        self.get_all_calls: list[list[str]] = []
+        self.writes: list[tuple[str, str, dict]] = []
+
+    def batch(self) -> FakeBatch:
+        return FakeBatch(self)
+
+    def collection(self, name: str) -> FakeCollection:
+        return FakeCollection(self, name)
+
+    def read(self, path: str, doc_ids: list[str]) -> list[FakeSnapshot]:
+        docs = self.data.get(path, {})
+        self.reads[path] += len(doc_ids)
+        return [FakeSnapshot(doc_id, docs.get(doc_id)) for doc_id in doc_ids]
+
+    def get_all(self, refs: list[FakeDocument]):
+        self.get_all_calls.append([ref.id for ref in refs])
+        for ref in refs:
+            yield ref.get()
+
+
+def index_data(businesses: dict[str, dict], precisions: tuple[int, ...]) -> dict:
+    """FakeFirestore data: `businesses` and their location_index at `precisions`."""
+    index = expected_index(businesses, precisions)
+    return {
+        "businesses": businesses,
+        "location_index": {cell: {"business_ids": sorted(ids)} for cell, ids in index.items()},
+    }
+
+
+@pytest.fixture
+def firebase(monkeypatch):
+    """A fresh db.firebase bound to firebase.fake (a FakeFirestore)."""
+    import firebase_admin
+    from firebase_admin import firestore
+
+    import db as db_package
+
+    fake = FakeFirestore()
+    monkeypatch.setattr(config, "BUSINESS_REPLICA_ENABLED", False)
+    monkeypatch.setattr(config, "RECENT_POSTS_ENABLED", False)
+    monkeypatch.setattr(firebase_admin, "_apps", {"[DEFAULT]": object()})
+    monkeypatch.setattr(firestore, "client", lambda *args, **kwargs: fake)
+    monkeypatch.delitem(sys.modules, "db.firebase", raising=False)
+    monkeypatch.delattr(db_package, "firebase", raising=False)
+    module = importlib.import_module("db.firebase")
+    module.fake = fake
+    yield module
+    module._pool.shutdown(wait=True)
+    sys.modules.pop("db.firebase", None)
+    if hasattr(db_package, "firebase"):
+        delattr(db_package, "firebase")
@@ -0,0 +1,186 @@
+"""
+tests/test_assembler.py
+
+core/assembler.py against a larger synthetic MockDB snapshot.
+
+Run:  python -m pytest tests/test_assembler.py -v
+"""
+
+# Force mock mode BEFORE any import that touches db/__init__.py
+import config
+config.USE_MOCK = True
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from core import assembler, scorer
+from core.records import PostCandidate
+from tests.conftest import NOW, synthetic_snapshot
+
+
+@pytest.fixture
+def synthetic_db(install_db):
+    return install_db(synthetic_snapshot(
+        seed=11, businesses=150, posts=900, spread_deg=0.12, hours=(0, 300),
+        following={"user_a": ["biz_001", "biz_002", "biz_far"]},
+    ))
+
+
+# ── Tests ─────────────────────────────────────────────────────────────────────
+
+def test_feed_is_top_n_of_full_ranking(synthetic_db):
+    following = set(synthetic_db.get_following_ids("user_a"))
+    nearby = synthetic_db.get_nearby_businesses(18.5204, 73.8567)
+    candidates = list((following | set(nearby)) - {"user_a"})
+    every_post = synthetic_db.get_posts_for_businesses(candidates, limit_per_business=5)
+    candidates = [PostCandidate.from_post(post) for post in every_post]
+    scores = scorer.score_candidates(candidates, frozenset(following), nearby).tolist()
+    expected = sorted(scores, reverse=True)[:25]
+
+    posts = assembler.build_feed("user_a", 18.5204, 73.8567, limit=25)
+    assert len(posts) == 25
+    assert [p["score"] for p in posts] == expected
+
+
+def test_followed_business_outside_radius_gets_no_location_signal(synthetic_db):
+    distance = synthetic_db.get_nearby_businesses(18.5204, 73.8567)["biz_001"]
+    default = {p["id"]: p for p in assembler.build_feed("user_a", 18.5204, 73.8567, limit=900)}
+    narrow = {
+        p["id"]: p
+        for p in assembler.build_feed("user_a", 18.5204, 73.8567, limit=900, radius_km=distance / 2)
+    }
+    followed = [post_id for post_id, p in narrow.items() if p["uid"] == "biz_001"]
+    assert followed
+
+    location = config.POST_WEIGHT_LOCATION * (1 - distance / config.MAX_RADIUS_KM)
+    for post_id in followed:
+        assert narrow[post_id]["recommendation_type"] == "followed"
+        assert "distance_km" not in narrow[post_id]
+        assert default[post_id]["distance_km"] == distance
+        assert narrow[post_id]["score"] == pytest.approx(default[post_id]["score"] - location, abs=2e-4)
+
+
+def test_feed_metadata_on_returned_posts(synthetic_db):
+    posts = assembler.build_feed("user_a", 18.5204, 73.8567, limit=10)
+    for p in posts:
+        assert p["caption"].startswith("caption")      # hydrated in phase 2
+        assert p["business"]["businessName"]
+        assert p["recommendation_type"] in ("followed", "nearby")
+        if p["recommendation_type"] == "nearby":
+            assert p["distance_km"] <= config.MAX_RADIUS_KM
+
+
+def test_feed_never_writes_to_provider_data(synthetic_db):
+    before = [dict(p) for p in synthetic_db._data["posts"]]
+    first = assembler.build_feed("user_a", 18.5204, 73.8567, limit=10)
+    assert synthetic_db._data["posts"] == before
+    assert all("score" not in p for p in synthetic_db.get_posts_by_ids([first[0]["id"]]).values())
+
+    first[0]["score"] = -1.0
+    second = assembler.build_feed("user_a", 18.5204, 73.8567, limit=10)
+    assert second[0]["score"] != -1.0
+
+
+def test_following_ids_are_a_frozenset(synthetic_db):
+    following = synthetic_db.get_following_ids("user_a")
+    assert following == frozenset({"biz_001", "biz_002", "biz_far"})
+    asyncio.run(assembler.following_changed_async("user_a"))
+    assert synthetic_db.get_following_ids("user_a") == following
+
+
+def test_post_candidates_are_skinny(synthetic_db):
+    candidates = synthetic_db.get_post_candidates(["biz_001", "biz_002"], limit_per_business=5)
+    assert candidates
+    assert all(set(c) == {"id", "uid", "createdAt"} for c in candidates)
+    full = synthetic_db.get_posts_by_ids([c["id"] for c in candidates] + ["missing"])
+    assert set(full) == {c["id"] for c in candidates}
+
+
+def test_who_to_follow_is_top_n_and_excludes_followed(synthetic_db):
+    suggestions = assembler.build_who_to_follow("user_a", 18.5204, 73.8567, limit=30)
+    assert len(suggestions) == 30
+    ids = {s["id"] for s in suggestions}
+    assert not ids & {"biz_001", "biz_002", "biz_far"}
+
+    nearby = synthetic_db.get_nearby_businesses(18.5204, 73.8567)
+    businesses = synthetic_db.get_businesses_batch(list(nearby))
+    all_scores = sorted(
+        (
+            scorer.score_business_to_follow(businesses[b], d)
+            for b, d in nearby.items()
+            if b not in ("biz_001", "biz_002", "biz_far")
+        ),
+        reverse=True,
+    )
+    assert [s["score"] for s in suggestions] == all_scores[:30]
+
+
+def test_posts_window_is_pushed_down(synthetic_db, monkeypatch):
+    since = NOW - timedelta(hours=config.RECENCY_WINDOW_HOURS)
+    ids = [f"biz_{i:03d}" for i in range(150)]
+    windowed = synthetic_db.get_post_candidates(ids, limit_per_business=5, since=since)
+    assert windowed
+    assert all(datetime.fromisoformat(p["createdAt"]) >= since for p in windowed)
+
+    monkeypatch.setattr(config, "FEED_POSTS_WINDOW_HOURS", config.RECENCY_WINDOW_HOURS)
+    posts = assembler.build_feed("user_a", 18.5204, 73.8567, limit=20)
+    assert len(posts) == 20
+    assert all(datetime.fromisoformat(p["createdAt"]) >= since for p in posts)
+
+
+def test_posts_window_falls_back_when_too_few(synthetic_db, monkeypatch):
+    monkeypatch.setattr(config, "FEED_POSTS_WINDOW_HOURS", 0.001)
+    posts = assembler.build_feed("user_a", 18.5204, 73.8567, limit=20)
+    assert len(posts) == 20
+
+    monkeypatch.setattr(config, "FEED_WINDOW_FALLBACK", False)
+    assert assembler.build_feed("user_a", 18.5204, 73.8567, limit=20) == []
+
+
+def test_home_shares_stages_and_matches_separate_builders(synthetic_db):
+    feed = assembler.build_feed("user_a", 18.5204, 73.8567, limit=15)
+    suggestions = assembler.build_who_to_follow("user_a", 18.5204, 73.8567, limit=10)
+
+    synthetic_db.reset()
+    home = assembler.build_home("user_a", 18.5204, 73.8567, feed_limit=15, follow_limit=10)
+    assert [p["id"] for p in home["feed"]] == [p["id"] for p in feed]
+    assert home["who_to_follow"] == suggestions
+    assert home["next_cursor"]
+    assert synthetic_db.calls["get_following_ids"] == 1
+    assert synthetic_db.calls["get_nearby_businesses"] == 1
+
+    async_home = asyncio.run(
+        assembler.build_home_async("user_a", 18.5204, 73.8567, feed_limit=15, follow_limit=10)
+    )
+    assert [p["id"] for p in async_home["feed"]] == [p["id"] for p in feed]
+    assert async_home["who_to_follow"] == suggestions
+
+
+def test_sparse_area_falls_back_to_nearest(synthetic_db, monkeypatch):
+    calls = []
+    nearest = synthetic_db.get_nearest_businesses
+    monkeypatch.setattr(synthetic_db, "get_nearest_businesses", lambda *a: calls.append(a) or nearest(*a))
+
+    assembler.build_feed("user_a", 18.5204, 73.8567, limit=10)
+    assert not calls                                       # dense: no extra call
+
+    rural = (19.3, 73.3)                                   # > 10 km from everyone
+    assert not synthetic_db.get_nearby_businesses(*rural, config.MAX_RADIUS_KM)
+    suggestions = assembler.build_who_to_follow("user_b", *rural, limit=5)
+    assert len(suggestions) == 5
+    assert calls[-1][2:] == (config.KNN_K, config.KNN_MAX_RADIUS_KM)
+    assert all(config.MAX_RADIUS_KM < s["distance_km"] <= config.KNN_MAX_RADIUS_KM for s in suggestions)
+    assert asyncio.run(assembler.build_feed_async("user_b", *rural, limit=5))
+
+    monkeypatch.setattr(config, "KNN_MIN_NEARBY", 0)
+    assert assembler.build_who_to_follow("user_b", *rural, limit=5) == []
+
+
+def test_explicit_radius_never_falls_back(synthetic_db):
+    rural = (19.3, 73.3)
+    assert assembler.build_who_to_follow("user_b", *rural, limit=5, radius_km=0.2) == []
+    assert assembler.build_feed("user_b", *rural, limit=5, radius_km=0.2) == []
+    assert asyncio.run(assembler.build_feed_async("user_b", *rural, limit=5, radius_km=0.2)) == []
+    assert synthetic_db.calls["get_nearest_businesses"] == 0
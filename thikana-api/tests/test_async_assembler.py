@@ -0,0 +1,43 @@
+"""
+tests/test_async_assembler.py
+
+The async builders must return exactly what the sync builders return.
+
+Run:  python -m pytest tests/test_async_assembler.py -v
+"""
+
+# Force mock mode BEFORE any import that touches db/__init__.py
+import config
+config.USE_MOCK = True
+
+import asyncio
+
+from core import assembler
+from db.base import AsyncDataProvider, DataProvider
+from db import async_db, db
+
+
+def test_providers_satisfy_protocols():
+    assert isinstance(db, DataProvider)
+    assert isinstance(async_db, AsyncDataProvider)
+
+
+def test_async_feed_matches_sync():
+    for user_id, lat, lon in [
+        ("user_001", 18.5204, 73.8567),
+        ("testuser", 18.5204, 73.8567),
+        ("user_003", 19.0760, 72.8777),
+    ]:
+        sync_posts = assembler.build_feed(user_id, lat, lon, limit=20)
+        async_posts = asyncio.run(assembler.build_feed_async(user_id, lat, lon, limit=20))
+        assert [p["id"] for p in async_posts] == [p["id"] for p in sync_posts]
+        assert [p["score"] for p in async_posts] == [p["score"] for p in sync_posts]
+
+
+def test_async_who_to_follow_matches_sync():
+    for user_id in ("user_001", "testuser"):
+        sync_wtf = assembler.build_who_to_follow(user_id, 18.5204, 73.8567, limit=10)
+        async_wtf = asyncio.run(
+            assembler.build_who_to_follow_async(user_id, 18.5204, 73.8567, limit=10)
+        )
+        assert async_wtf == sync_wtf
@@ -0,0 +1,111 @@
+"""
+tests/test_business_table.py
+
+Tests for the struct-of-arrays business table (core/business_table.py)
+
+Run:  python -m pytest tests/test_business_table.py -v
+"""
+
+# Force mock mode BEFORE any import that touches db/__init__.py
+import config
+config.USE_MOCK = True
+
+import random
+
+from core.business_table import BusinessTable
+from db.mock import MockDB
+
+_LAT, _LON = 18.5204, 73.8567
+
+
+def _businesses(n: int = 300) -> dict:
+    rng = random.Random(19)
+    businesses = {
+        f"biz_{i:03d}": {
+            "businessName": f"Business {i}",
+            "businessType": rng.choice(["cafe", "salon", "grocery"]),
+            "postCount":    rng.randint(0, 30),
+            "location": {
+                "latitude":  _LAT + rng.uniform(-0.3, 0.3),
+                "longitude": _LON + rng.uniform(-0.3, 0.3),
+            },
+        }
+        for i in range(n)
+    }
+    businesses["biz_nowhere"] = {"businessName": "No location"}
+    return businesses
+
+
+# ── Tests ─────────────────────────────────────────────────────────────────────
+
+def test_nearby_matches_mock():
+    businesses = _businesses()
+    table = BusinessTable.from_docs(businesses)
+    mock = MockDB({"users": {}, "businesses": businesses, "posts": []})
+    for radius in (1.0, 10.0, 40.0):
+        assert table.nearby(_LAT, _LON, radius) == mock.get_nearby_businesses(_LAT, _LON, radius)
+
+
+def test_columns_and_projected_docs():
+    businesses = _businesses()
+    businesses["biz_007"]["description"] = "not kept"
+    table = BusinessTable.from_docs(businesses)
+
+    ids, rows = table.lookup(["biz_002", "missing", "biz_001"])
+    assert ids == ["biz_002", "biz_001"] and rows.tolist() == [2, 1]
+    assert table.post_count[rows].tolist() == [
+        businesses["biz_002"]["postCount"], businesses["biz_001"]["postCount"],
+    ]
+
+    doc = table.get_many(["biz_007", "missing"])["biz_007"]
+    assert doc == {"id": "biz_007", "username": "", **{
+        field: businesses["biz_007"][field]
+        for field in ("businessName", "businessType", "postCount", "location")
+    }}
+    assert doc is not table.get_many(["biz_007"])["biz_007"]
+
+    assert "biz_nowhere" in table
+    assert "biz_nowhere" not in table.located_ids()
+    assert "location" not in table.get_many(["biz_nowhere"])["biz_nowhere"]
+
+
+def test_row_views_read_the_columns():
+    businesses = _businesses()
+    businesses["biz_007"]["username"] = "biz7"
+    table = BusinessTable.from_docs(businesses)
+
+    row = table.row("biz_007")
+    assert (row.id, row.business_name, row.username) == ("biz_007", "Business 7", "biz7")
+    assert row.lat == businesses["biz_007"]["location"]["latitude"]
+    assert row.post_count == businesses["biz_007"]["postCount"]
+    assert row.business_type == businesses["biz_007"]["businessType"]
+    assert row.doc() == table.get_many(["biz_007"])["biz_007"]
+    assert not hasattr(row, "__dict__")
+    assert table.row("missing") is None
+    assert list(table.rows(["biz_002", "missing", "biz_001"])) == ["biz_002", "biz_001"]
+
+
+def test_remove_recycles_rows_and_growth_keeps_data():
+    table = BusinessTable(capacity=2)
+    for i in range(100):
+        table.upsert(f"b{i}", {"location": {"latitude": i * 0.001, "longitude": 0.0}})
+    assert len(table) == 100
+    assert table.get_many(["b99"])["b99"]["location"]["latitude"] == 0.099
+
+    table.remove("b10")
+    assert "b10" not in table
+    assert "b10" not in table.nearby(0.0, 0.0, 50.0)
+    assert table.upsert("new", {"location": {"latitude": 0.0, "longitude": 0.0}}) == 10
+
+    table.upsert("b0", {"location": {"latitude": 1.0, "longitude": 1.0}})
+    assert "b0" not in table.nearby(0.0, 0.0, 1.0)
+    assert table.nearby(0.0, 0.0, 0.01)["new"] == 0.0
+
+
+def test_nearest_is_first_k_of_nearby():
+    table = BusinessTable.from_docs(_businesses())
+    nearby = table.nearby(_LAT, _LON, 20.0)
+    for k in (1, 7, 1000):
+        nearest = table.nearest(_LAT, _LON, k, 20.0)
+        assert list(nearest.values()) == list(nearby.values())[:k]
+        assert set(nearest) <= set(nearby)
@@ -0,0 +1,67 @@
+"""
+tests/test_cache.py
+
+Tests for db/cache.py
+
+Run:  python -m pytest tests/test_cache.py -v
+"""
+
+# Force mock mode BEFORE any import that touches db/__init__.py
+import config
+config.USE_MOCK = True
+
+from db.cache import MISSING, TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_hit_miss_and_expiry():
+    clock = FakeClock()
+    cache = TTLCache(ttl_seconds=60, max_entries=10, clock=clock)
+
+    assert cache.get("tfe72") is MISSING
+    cache.set("tfe72", ("biz_001",))
+    assert cache.get("tfe72") == ("biz_001",)
+
+    clock.now += 61
+    assert cache.get("tfe72") is MISSING
+    assert len(cache) == 0
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+
+
+def test_negative_entries_are_hits():
+    cache = TTLCache(ttl_seconds=60, max_entries=10)
+    cache.set("empty_cell", ())
+    assert cache.get("empty_cell") == ()
+    assert cache.stats()["hits"] == 1
+
+
+def test_lru_eviction_keeps_recently_used():
+    cache = TTLCache(ttl_seconds=60, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")          # a is now most recent
+    cache.set("c", 3)       # evicts b
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_invalidate_and_disabled_cache():
+    cache = TTLCache(ttl_seconds=60, max_entries=10)
+    cache.set("a", 1)
+    assert cache.invalidate("a") is True
+    assert cache.invalidate("a") is False
+
+    disabled = TTLCache(ttl_seconds=0, max_entries=10)
+    disabled.set("a", 1)
+    assert disabled.get("a") is MISSING
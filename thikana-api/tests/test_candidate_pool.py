@@ -0,0 +1,150 @@
+"""
+tests/test_candidate_pool.py
+
+Tests for core/candidate_pool.py (shared per-cell feed candidates)
+
+Run:  python -m pytest tests/test_candidate_pool.py -v
+"""
+
+# Force mock mode BEFORE any import that touches db/__init__.py
+import config
+config.USE_MOCK = True
+
+import asyncio
+import random
+
+import pytest
+
+from core import assembler, candidate_pool
+from core.geohash_utils import cell_bounds, cover_cells, encode
+from db.cache import TTLCache
+from db.mock import AsyncMockDB
+from tests.conftest import LAT, LON, index_data, synthetic_snapshot
+
+
+@pytest.fixture
+def counting_db(install_db, monkeypatch):
+    monkeypatch.setattr(candidate_pool, "_pools", TTLCache(60.0, 100))   # opt-in
+    return install_db(synthetic_snapshot(
+        seed=5, businesses=120, posts=600, spread_deg=0.15, hours=(0, 200),
+        following={"user_a": ["biz_001", "biz_far"], "user_b": ["biz_far"]},
+    ))
+
+
+# ── Tests ─────────────────────────────────────────────────────────────────────
+
+def test_pool_nearby_is_exact_anywhere_in_cell(counting_db):
+    pool = candidate_pool.get_pool(counting_db, LAT, LON)
+    lat, lon, half_lat, half_lon = cell_bounds(encode(LAT, LON))
+    rng = random.Random(1)
+    for _ in range(25):
+        p_lat = lat + rng.uniform(-half_lat, half_lat)
+        p_lon = lon + rng.uniform(-half_lon, half_lon)
+        assert pool.nearby(p_lat, p_lon) == counting_db.get_nearby_businesses(p_lat, p_lon)
+
+
+def test_second_user_in_cell_reuses_pool(counting_db):
+    assembler.build_feed("user_a", LAT, LON, limit=10)
+    counting_db.reset()
+
+    posts = assembler.build_feed("user_b", LAT + 0.001, LON - 0.001, limit=10)
+    assert len(posts) == 10
+    assert counting_db.calls["get_nearby_businesses"] == 0
+    assert counting_db.post_requests == [["biz_far"]]   # only followed outside pool
+
+
+def test_feed_matches_unpooled_feed(counting_db, monkeypatch):
+    pooled = assembler.build_feed("user_a", LAT, LON, limit=20)
+    pooled_suggestions = assembler.build_who_to_follow("user_a", LAT, LON, limit=20)
+    monkeypatch.setattr(candidate_pool, "_pools", TTLCache(0, 0))
+    assert not candidate_pool.enabled()
+    assert assembler.build_feed("user_a", LAT, LON, limit=20) == pooled
+    assert assembler.build_who_to_follow("user_a", LAT, LON, limit=20) == pooled_suggestions
+
+
+def test_who_to_follow_ranks_from_the_pool_table(counting_db):
+    assembler.build_feed("user_a", LAT, LON, limit=10)
+    counting_db.reset()
+    suggestions = assembler.build_who_to_follow("user_b", LAT, LON, limit=15)
+    assert len(suggestions) == 15
+    assert counting_db.calls["get_businesses_batch"] == 0
+    assert not hasattr(candidate_pool.get_pool(counting_db, LAT, LON), "businesses")
+
+
+def test_who_to_follow_leaves_pool_posts_unloaded(counting_db):
+    assembler.build_who_to_follow("user_b", LAT, LON, limit=10)
+    assert counting_db.calls["get_post_candidates"] == 0
+    assert not candidate_pool.get_pool(counting_db, LAT, LON, with_posts=False).has_posts
+
+    pooled = assembler.build_feed("user_b", LAT, LON, limit=10)
+    assert counting_db.calls["get_nearby_businesses"] == 1
+    assert counting_db.post_requests[0] == candidate_pool.get_pool(counting_db, LAT, LON).query_ids
+    counting_db.reset()
+
+    assert assembler.build_feed("user_b", LAT, LON, limit=10) == pooled
+    assert counting_db.post_requests == [["biz_far"]]
+
+
+def test_concurrent_async_post_loads_share_one_fetch(counting_db):
+    async def many():
+        provider = AsyncMockDB(counting_db)
+        await candidate_pool.get_pool_async(provider, LAT, LON, with_posts=False)
+        return await asyncio.gather(*(
+            candidate_pool.get_pool_async(provider, LAT, LON) for _ in range(5)
+        ))
+
+    pools = asyncio.run(many())
+    assert all(p is pools[0] and p.has_posts for p in pools)
+    assert counting_db.calls["get_post_candidates"] == 1
+
+
+def test_home_takes_pooled_businesses_from_the_table(counting_db):
+    assembler.build_feed("user_b", LAT, LON, limit=10)
+    counting_db.reset()
+    assembler.build_home("user_a", LAT, LON, feed_limit=15, follow_limit=10)
+    assert counting_db.calls["get_nearby_businesses"] == 0
+    assert all(ids == ["biz_far"] for ids in counting_db.business_requests)
+
+
+def test_pool_hits_are_reported_in_cache_stats(counting_db):
+    assembler.build_feed("user_a", LAT, LON, limit=10)
+    assembler.build_feed("user_b", LAT, LON, limit=10)
+    stats = assembler.cache_stats()
+    assert stats["candidate_pool"]["hits"] >= 1 and stats["candidate_pool"]["size"] == 1
+    assert {"identity_map", "feed_snapshot"} <= stats.keys()
+
+
+def test_concurrent_async_misses_share_one_build(counting_db):
+    async def many():
+        provider = AsyncMockDB(counting_db)
+        return await asyncio.gather(*(
+            candidate_pool.get_pool_async(provider, LAT, LON) for _ in range(5)
+        ))
+
+    pools = asyncio.run(many())
+    assert all(p is pools[0] for p in pools)
+    assert counting_db.calls["get_nearby_businesses"] == 1
+
+
+def test_explicit_radius_bypasses_the_pool(counting_db):
+    default = assembler.build_who_to_follow("user_a", LAT, LON, limit=200)
+    counting_db.reset()
+    wide = assembler.build_who_to_follow("user_a", LAT, LON, limit=200, radius_km=200.0)
+    assert len(wide) > len(default)
+    assert all(b["distance_km"] <= 200.0 for b in wide)
+    assert counting_db.calls["get_nearby_businesses"] == 1
+    assert len(candidate_pool._pools) == 1
+
+
+def test_explicit_radius_reads_only_its_cover(firebase, install_db, monkeypatch):
+    data = synthetic_snapshot(
+        seed=5, businesses=120, posts=0, spread_deg=0.3, hours=(0, 1), following={},
+    )
+    truth = install_db(data)
+    firebase.fake.data = index_data(data["businesses"], config.GEOHASH_INDEX_PRECISIONS)
+    monkeypatch.setattr(assembler, "db", firebase.FirebaseDB())
+
+    suggestions = assembler.build_who_to_follow("user_b", LAT, LON, limit=200, radius_km=11.0)
+    assert {b["id"] for b in suggestions} == set(truth.get_nearby_businesses(LAT, LON, 11.0))
+    assert firebase.fake.reads["location_index"] == len(cover_cells(LAT, LON, 11.0))
+    assert len(candidate_pool._pools) == 0
@@ -0,0 +1,53 @@
+"""
+tests/test_distance.py
+
+Tests for core/distance.py
+
+Run:  python -m pytest tests/test_distance.py -v
+"""
+
+import math
+import random
+
+import numpy as np
+
+from core.distance import haversine_km, haversine_km_batch, within_radius
+
+
+_rng = random.Random(7)
+_LATS = [_rng.uniform(-80, 80) for _ in range(500)]
+_LONS = [_rng.uniform(-180, 180) for _ in range(500)]
+
+
+def test_batch_matches_scalar():
+    dists = haversine_km_batch(18.5204, 73.8567, _LATS, _LONS)
+    assert dists.shape == (500,)
+    for i in range(500):
+        expected = haversine_km(18.5204, 73.8567, _LATS[i], _LONS[i])
+        assert math.isclose(dists[i], expected, rel_tol=1e-12, abs_tol=1e-9)
+
+
+def test_batch_nan_coordinates_give_nan():
+    dists = haversine_km_batch(18.5204, 73.8567, [18.53, float("nan")], [73.86, 73.86])
+    assert not math.isnan(dists[0])
+    assert math.isnan(dists[1])
+
+
+def test_within_radius_matches_full_haversine_filter():
+    rng = random.Random(24)
+    origins = [(18.5204, 73.8567, 10.0), (0.0, 179.95, 20.0), (-0.05, -179.99, 15.0),
+               (89.95, 10.0, 30.0), (-60.0, 0.0, 500.0), (45.0, 45.0, 0.0)]
+    for lat, lon, radius_km in origins:
+        lats = np.clip(lat + np.array([rng.uniform(-1, 1) for _ in range(3000)]), -90, 90)
+        lons = (lon + np.array([rng.uniform(-3, 3) for _ in range(3000)]) + 180) % 360 - 180
+        lats[::50] = np.nan
+        full = haversine_km_batch(lat, lon, lats, lons)
+        expected = (full <= radius_km).nonzero()[0]
+
+        hits, dists = within_radius(lat, lon, lats, lons, radius_km)
+        assert hits.tolist() == expected.tolist()
+        assert np.array_equal(dists, full[expected])
+
+    edge = haversine_km(18.5204, 73.8567, 18.6104, 73.8567)
+    hits, _ = within_radius(18.5204, 73.8567, [18.6104], [73.8567], edge)
+    assert hits.tolist() == [0]                      # a point exactly on the radius
@@ -0,0 +1,71 @@
+"""
+tests/test_feed_routes.py
+
+Tests for the internal-caller check on the state-changing feed endpoints
+(routes/feed.py: POST /feed/publish/{post_id}, /feed/{user_id}/following/changed)
+
+Run:  python -m pytest tests/test_feed_routes.py -v
+"""
+
+# Force mock mode BEFORE any import that touches db/__init__.py
+import config
+config.USE_MOCK = True
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from core import assembler
+from routes.feed import router
+
+ENDPOINTS = ["/feed/publish/post_001", "/feed/user_001/following/changed"]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    calls = []
+
+    async def publish(post_id):
+        calls.append(("publish", post_id))
+        return 0
+
+    async def changed(user_id):
+        calls.append(("changed", user_id))
+
+    monkeypatch.setattr(assembler, "publish_post_async", publish)
+    monkeypatch.setattr(assembler, "following_changed_async", changed)
+    monkeypatch.setattr(config, "INTERNAL_API_KEY", "s3cret")
+    app = FastAPI()
+    app.include_router(router)
+    test_client = TestClient(app)
+    test_client.calls = calls
+    return test_client
+
+
+# ── Tests ─────────────────────────────────────────────────────────────────────
+
+@pytest.mark.parametrize("path", ENDPOINTS)
+@pytest.mark.parametrize("headers", [{}, {"X-Internal-Key": "wrong"}])
+def test_rejects_callers_without_the_key(client, path, headers):
+    assert client.post(path, headers=headers).status_code == 403
+    assert client.calls == []
+
+
+@pytest.mark.parametrize("path", ENDPOINTS)
+def test_disabled_when_no_key_is_configured(client, monkeypatch, path):
+    monkeypatch.setattr(config, "INTERNAL_API_KEY", "")
+    assert client.post(path, headers={"X-Internal-Key": ""}).status_code == 503
+    assert client.calls == []
+
+
+def test_accepts_internal_callers(client):
+    headers = {"X-Internal-Key": "s3cret"}
+    assert client.post(ENDPOINTS[0], headers=headers).json() == {"post_id": "post_001", "inboxes": 0}
+    assert client.post(ENDPOINTS[1], headers=headers).json() == {"user_id": "user_001", "invalidated": True}
+    assert client.calls == [("publish", "post_001"), ("changed", "user_001")]
+
+
+def test_feed_reads_stay_public(client, install_db):
+    install_db({"users": {}, "businesses": {}, "posts": []})
+    response = client.get("/feed/user_001", params={"lat": 18.52, "lon": 73.85})
+    assert response.status_code == 200
@@ -0,0 +1,81 @@
+"""
+tests/test_feed_snapshot.py
+
+Tests for cursor pagination (core/feed_snapshot.py + build_feed_page)
+
+Run:  python -m pytest tests/test_feed_snapshot.py -v
+"""
+
+# Force mock mode BEFORE any import that touches db/__init__.py
+import config
+config.USE_MOCK = True
+
+import asyncio
+
+import pytest
+
+from core import assembler, candidate_pool, feed_snapshot
+from core.feed_snapshot import InvalidCursor, decode_cursor, encode_cursor
+from db.cache import TTLCache
+from tests.conftest import LAT, LON, synthetic_snapshot
+
+
+@pytest.fixture
+def paging_db(install_db, monkeypatch):
+    monkeypatch.setattr(candidate_pool, "_pools", TTLCache(0, 0))
+    return install_db(synthetic_snapshot(
+        seed=9, businesses=30, posts=400, spread_deg=0.05, hours=(1, 300),
+        following={"user_a": ["biz_001", "biz_002"]},
+    ))
+
+
+# ── Tests ─────────────────────────────────────────────────────────────────────
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor("abc_-12", 40)) == ("abc_-12", 40)
+    for bad in ("", "!!!", encode_cursor("abc", 0)[:-2] + "**", "YWJj"):
+        with pytest.raises(InvalidCursor):
+            decode_cursor(bad)
+
+
+def test_pages_cover_the_ranking_in_order(paging_db):
+    expected = [p["id"] for p in assembler.build_feed("user_a", LAT, LON, limit=60)]
+
+    seen: list[str] = []
+    posts, cursor = assembler.build_feed_page("user_a", LAT, LON, limit=20)
+    seen += [p["id"] for p in posts]
+    queries_after_first = paging_db.calls["get_post_candidates"]
+    while cursor and len(seen) < 60:
+        posts, cursor = assembler.build_feed_page("user_a", LAT, LON, limit=20, cursor=cursor)
+        seen += [p["id"] for p in posts]
+
+    assert seen == expected
+    assert paging_db.calls["get_post_candidates"] == queries_after_first   # no re-ranking
+
+
+def test_last_page_has_no_cursor(paging_db, monkeypatch):
+    monkeypatch.setattr(config, "FEED_SNAPSHOT_MAX_POSTS", 25)
+    _, cursor = assembler.build_feed_page("user_a", LAT, LON, limit=20)
+    posts, cursor = assembler.build_feed_page("user_a", LAT, LON, limit=20, cursor=cursor)
+    assert len(posts) == 5
+    assert cursor is None
+
+
+def test_expired_cursor_reranks_at_offset(paging_db):
+    _, cursor = assembler.build_feed_page("user_a", LAT, LON, limit=10)
+    feed_snapshot.clear()
+    posts, _ = assembler.build_feed_page("user_a", LAT, LON, limit=10, cursor=cursor)
+    expected = assembler.build_feed("user_a", LAT, LON, limit=20)[10:]
+    assert [p["id"] for p in posts] == [p["id"] for p in expected]
+
+
+def test_async_pages_match_sync(paging_db):
+    sync_posts, cursor = assembler.build_feed_page("user_a", LAT, LON, limit=15)
+    sync_next, _ = assembler.build_feed_page("user_a", LAT, LON, limit=15, cursor=cursor)
+    async_posts, cursor = asyncio.run(
+        assembler.build_feed_page_async("user_a", LAT, LON, limit=15)
+    )
+    async_next, _ = asyncio.run(
+        assembler.build_feed_page_async("user_a", LAT, LON, limit=15, cursor=cursor)
+    )
+    assert [p["id"] for p in async_posts + async_next] == [p["id"] for p in sync_posts + sync_next]
@@ -0,0 +1,162 @@
+"""
+tests/test_firebase.py
+
+Tests for FirebaseDB (db/firebase.py) against an in-memory FakeFirestore —
+read counts, caches and the shared pool helpers.
+
+Run:  python -m pytest tests/test_firebase.py -v
+"""
+
+# Force mock mode BEFORE any import that touches db/__init__.py
+import config
+config.USE_MOCK = True
+
+import threading
+import time
+
+import pytest
+
+from core import assembler, candidate_pool
+from db.cache import TTLCache
+from db.identity_map import request_scope
+from db.location_index import build_precisions
+from db.mock import MockDB
+from tests.conftest import LAT, LON, index_data, synthetic_snapshot
+
+
+# ── Tests ─────────────────────────────────────────────────────────────────────
+
+def test_knn_rings_stay_within_cell_cap(firebase, monkeypatch):
+    for precisions in ((5,), (4, 5)):
+        monkeypatch.setattr(config, "GEOHASH_INDEX_PRECISIONS", precisions)
+        for lat in (LAT, 45.0, 60.0):
+            rings = list(firebase._knn_rings(lat, LON, config.KNN_MAX_RADIUS_KM))
+            assert sum(len(cells) for _, cells in rings) <= config.KNN_MAX_CELLS
+            assert rings[0][0] == config.MAX_RADIUS_KM
+            if precisions == (4, 5) and lat < 60.0:
+                assert rings[-1][0] == config.KNN_MAX_RADIUS_KM
+
+
+def test_nearby_filters_through_a_business_table(firebase):
+    businesses = synthetic_snapshot(
+        seed=2, businesses=80, posts=0, spread_deg=0.2, hours=(0, 1), following={},
+    )["businesses"]
+    businesses["biz_nowhere"] = {"businessName": "No location"}
+    firebase.fake.data = index_data(businesses, config.GEOHASH_INDEX_PRECISIONS)
+    truth = MockDB({"users": {}, "businesses": businesses, "posts": []})
+
+    for radius_km in (2.0, 10.0, 25.0):
+        assert firebase.FirebaseDB().get_nearby_businesses(LAT, LON, radius_km) == \
+            truth.get_nearby_businesses(LAT, LON, radius_km)
+
+
+def test_nearest_reads_at_most_knn_max_cells(firebase, monkeypatch):
+    lonely = {"biz_lonely": {"location": {"latitude": LAT + 0.55, "longitude": LON}}}  # ~61 km
+    firebase.fake.data = index_data(lonely, (4, 5))
+
+    monkeypatch.setattr(config, "GEOHASH_INDEX_PRECISIONS", (5,))
+    assert firebase.FirebaseDB().get_nearest_businesses(LAT, LON, 10, 100.0) == {}
+    assert firebase.fake.reads["location_index"] <= config.KNN_MAX_CELLS
+
+    firebase._cell_cache.clear()
+    firebase.fake.reads.clear()
+    monkeypatch.setattr(config, "GEOHASH_INDEX_PRECISIONS", (4, 5))
+    nearest = firebase.FirebaseDB().get_nearest_businesses(LAT, LON, 10, 100.0)
+    assert list(nearest) == ["biz_lonely"]
+    assert 60.0 < nearest["biz_lonely"] < 62.0
+    assert firebase.fake.reads["location_index"] <= config.KNN_MAX_CELLS
+    assert firebase.fake.reads["businesses"] == 1
+
+
+def test_following_ids_cached_until_ttl_or_invalidation(firebase, monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(firebase, "_following_cache", TTLCache(60.0, 100, clock=lambda: now[0]))
+    firebase.fake.data = {"users/u1/following": {"biz_001": {}, "biz_002": {}}}
+    provider = firebase.FirebaseDB()
+
+    assert provider.get_following_ids("u1") == {"biz_001", "biz_002"}
+    firebase.fake.data["users/u1/following"]["biz_003"] = {}
+    assert provider.get_following_ids("u1") == {"biz_001", "biz_002"}      # hit
+    assert firebase.fake.reads["users/u1/following"] == 2
+
+    now[0] = 61.0                                                          # expired
+    assert provider.get_following_ids("u1") == {"biz_001", "biz_002", "biz_003"}
+    assert firebase.fake.reads["users/u1/following"] == 5
+
+    del firebase.fake.data["users/u1/following"]["biz_001"]
+    provider.invalidate_following("u1")
+    assert provider.get_following_ids("u1") == {"biz_002", "biz_003"}
+    assert provider.get_following_ids("u2") == frozenset()
+
+
+def test_run_bounded_caps_in_flight_and_yields_in_completion_order(firebase):
+    lock = threading.Lock()
+    running, peak = [0], [0]
+
+    def work(delay: float) -> float:
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(delay)
+        with lock:
+            running[0] -= 1
+        return delay
+
+    delays = [0.02, 0.01, 0.03, 0.01, 0.02, 0.01, 0.03, 0.02, 0.01, 0.02]
+    assert sorted(firebase._run_bounded(work, delays, max_in_flight=3)) == sorted(delays)
+    assert 1 < peak[0] <= 3
+
+    assert list(firebase._run_bounded(work, [0.3, 0.0], max_in_flight=2)) == [0.0, 0.3]
+
+
+def test_run_bounded_propagates_errors(firebase):
+    def work(item: int) -> int:
+        if item == 4:
+            raise ValueError("boom")
+        return item
+
+    for max_in_flight in (1, 3):
+        with pytest.raises(ValueError, match="boom"):
+            list(firebase._run_bounded(work, list(range(8)), max_in_flight))
+
+
+def test_batch_fetch_reads_in_batches_of_ten(firebase):
+    firebase.fake.data = {"businesses": {f"biz_{i:03d}": {"postCount": i} for i in range(23)}}
+    ids = [f"biz_{i:03d}" for i in range(25)]                     # two don't exist
+
+    docs = firebase._batch_fetch("businesses", ids)
+    assert [len(batch) for batch in firebase.fake.get_all_calls] == [10, 10, 5]
+    assert sum(firebase.fake.get_all_calls, []) == ids
+    assert set(docs) == set(ids[:23])
+    assert docs["biz_007"] == {"postCount": 7, "id": "biz_007"}
+
+    firebase.fake.get_all_calls.clear()
+    with request_scope():
+        firebase._batch_fetch("businesses", ids[:12])
+        firebase._batch_fetch("businesses", ids[5:15])
+    assert firebase.fake.get_all_calls == [ids[:10], ids[10:12], ids[12:15]]
+
+
+def test_fan_out_reads_the_web_apps_followers(firebase):
+    firebase.fake.data = {
+        "posts": {"post_1": {"uid": "biz_001", "createdAt": "2026-03-01T08:00:00Z"}},
+        "users/biz_001/followers": {"u1": {}, "u2": {}},
+    }
+    assert firebase.FirebaseDB().fan_out_post("post_1") == 2
+    assert sorted((path, doc_id) for path, doc_id, _ in firebase.fake.writes) == \
+        [("feed_inbox", "u1"), ("feed_inbox", "u2")]
+    assert firebase.FirebaseDB().fan_out_post("post_missing") == 0
+
+
+def test_business_60_km_away_is_found_with_the_default_config(firebase, monkeypatch):
+    lonely = {"biz_lonely": {
+        "businessName": "Lonely Farm", "postCount": 2,
+        "location": {"latitude": LAT + 0.55, "longitude": LON},             # ~61 km
+    }}
+    firebase.fake.data = index_data(lonely, build_precisions())
+    monkeypatch.setattr(assembler, "db", firebase.FirebaseDB())
+    candidate_pool.clear()
+
+    suggestions = assembler.build_who_to_follow("user_rural", LAT, LON)
+    assert [b["id"] for b in suggestions] == ["biz_lonely"]
+    assert firebase.fake.reads["location_index"] <= config.KNN_MAX_CELLS
@@ -0,0 +1,97 @@
+"""
+tests/test_geohash.py
+
+Tests for the integer geohash codec (core/geohash_codec.py) and the string
+helpers in core/geohash_utils.py
+
+Run:  python -m pytest tests/test_geohash.py -v
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+import config
+from core import geohash_codec
+from core.distance import haversine_km
+from core.geohash_utils import cell_bounds, cover_cells, encode, get_search_cells
+
+_rng = random.Random(21)
+_LATS = np.array([_rng.uniform(-90, 90) for _ in range(2000)])
+_LONS = np.array([_rng.uniform(-180, 180) for _ in range(2000)])
+
+
+# ── Tests ─────────────────────────────────────────────────────────────────────
+
+def test_known_geohashes():
+    assert encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+    assert encode(18.5204, 73.8567, 5) == "tek92"
+    assert encode(0.0, 0.0, 5) == "s0000"            # edges go up / right
+    assert encode(90.0, 180.0, 5) == "zzzzz"
+    assert encode(-90.0, -180.0, 5) == "00000"
+
+
+@pytest.mark.parametrize("precision", [1, 4, 5, 6, 9, 12])
+def test_round_trip_and_batch_match_scalar(precision):
+    codes = geohash_codec.encode_batch(_LATS, _LONS, precision)
+    strings = geohash_codec.to_base32_batch(codes, precision)
+    for lat, lon, code, s in zip(_LATS[:300], _LONS[:300], codes, strings):
+        scalar = geohash_codec.encode(float(lat), float(lon), precision)
+        assert scalar == int(code)
+        assert geohash_codec.to_base32(scalar, precision) == s
+        assert geohash_codec.from_base32(s) == (scalar, precision)
+
+        c_lat, c_lon, half_lat, half_lon = cell_bounds(s)
+        assert abs(lat - c_lat) <= half_lat and abs(lon - c_lon) <= half_lon
+
+
+def test_search_cells_are_the_adjacent_cells():
+    assert get_search_cells(18.5204, 73.8567)[:5] == ["tek92", "tek98", "tek90", "tek93", "tek3r"]
+
+    for lat, lon in zip(_LATS[:200] * 0.85, _LONS[:200]):
+        cells = get_search_cells(float(lat), float(lon), 6)
+        assert len(set(cells)) == 9
+        c_lat, c_lon, half_lat, half_lon = cell_bounds(cells[0])
+        for cell in cells[1:]:
+            n_lat, n_lon, _, _ = cell_bounds(cell)
+            d_lon = (n_lon - c_lon + 180.0) % 360.0 - 180.0       # antimeridian wrap
+            assert round(abs(n_lat - c_lat) / (2 * half_lat)) <= 1
+            assert round(abs(d_lon) / (2 * half_lon)) <= 1
+            assert (n_lat, d_lon) != (c_lat, 0.0)
+
+
+def test_antimeridian_wraps_and_poles_dedupe():
+    east = get_search_cells(0.0, 179.99, 4)
+    assert encode(0.0, -179.99, 4) in east
+    assert len(get_search_cells(89.99, 0.0, 3)) == 6
+
+
+def test_cover_holds_every_point_in_the_radius():
+    rng = random.Random(22)
+    for lat, lon, radius_km in [(18.5204, 73.8567, 10.0), (0.0, 179.98, 5.0), (60.0, 10.0, 40.0)]:
+        for precisions in [(5,), (4, 5, 6)]:
+            cells = set(cover_cells(lat, lon, radius_km, precisions))
+            precision = len(next(iter(cells)))
+            for _ in range(500):
+                p_lat = lat + rng.uniform(-1, 1) * radius_km / 111.0
+                p_lon = lon + rng.uniform(-1, 1) * radius_km / 55.0
+                p_lon = (p_lon + 180.0) % 360.0 - 180.0
+                if haversine_km(lat, lon, p_lat, p_lon) <= radius_km:
+                    assert encode(p_lat, p_lon, precision) in cells
+
+
+def test_cover_picks_the_finest_precision_in_budget(monkeypatch):
+    monkeypatch.setattr(config, "GEOHASH_COVER_MAX_CELLS", 9)
+    small = cover_cells(18.5204, 73.8567, 0.5, (4, 5, 6))
+    large = cover_cells(18.5204, 73.8567, 30.0, (4, 5, 6))
+    assert len(small[0]) == 6 and len(small) <= 9
+    assert len(large[0]) == 4 and len(large) <= 9
+    assert len(cover_cells(18.5204, 73.8567, 500.0, (4, 5))[0]) == 4   # over budget → coarsest
+
+
+def test_invalid_input():
+    with pytest.raises(ValueError):
+        geohash_codec.from_base32("tek9a")               # 'a' is not base32
+    with pytest.raises(ValueError):
+        geohash_codec.encode(0.0, 0.0, 13)
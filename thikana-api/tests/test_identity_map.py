@@ -0,0 +1,50 @@
+"""
+tests/test_identity_map.py
+
+Tests for db/identity_map.py (request-scoped document reuse)
+
+Run:  python -m pytest tests/test_identity_map.py -v
+"""
+
+# Force mock mode BEFORE any import that touches db/__init__.py
+import config
+config.USE_MOCK = True
+
+from db.identity_map import current_scope, request_scope, request_scoped
+from db.mock import MockDB
+
+_DATA = {
+    "users": {},
+    "businesses": {
+        "biz_near": {"businessName": "Near", "location": {"latitude": 18.5204, "longitude": 73.8567}},
+        "biz_also": {"businessName": "Also", "location": {"latitude": 18.5300, "longitude": 73.8600}},
+        "biz_far":  {"businessName": "Far",  "location": {"latitude": 19.0760, "longitude": 72.8777}},
+    },
+    "posts": [],
+}
+
+
+def test_nearby_docs_are_not_fetched_again():
+    mock = MockDB(_DATA)
+    with request_scope() as scope:
+        nearby = mock.get_nearby_businesses(18.5204, 73.8567, 10.0)
+        businesses = mock.get_businesses_batch(list(nearby) + ["biz_far"])
+    assert set(businesses) == {"biz_near", "biz_also", "biz_far"}
+    assert scope.saved_reads == 2
+
+
+def test_no_scope_no_reuse():
+    mock = MockDB(_DATA)
+    assert current_scope() is None
+    mock.get_nearby_businesses(18.5204, 73.8567, 10.0)
+    assert mock.get_businesses_batch(["biz_near"]) == {"biz_near": _DATA["businesses"]["biz_near"]}
+
+
+def test_nested_scopes_share_one_map():
+    @request_scoped
+    def inner():
+        return current_scope()
+
+    with request_scope() as outer:
+        assert inner() is outer
+    assert current_scope() is None
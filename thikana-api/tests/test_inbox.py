@@ -0,0 +1,113 @@
+"""
+tests/test_inbox.py
+
+Tests for the fan-out-on-write feed inbox (db/inbox.py + build_feed read path)
+
+Run:  python -m pytest tests/test_inbox.py -v
+"""
+
+# Force mock mode BEFORE any import that touches db/__init__.py
+import config
+config.USE_MOCK = True
+
+import asyncio
+
+import pytest
+
+from core import assembler
+from db.inbox import split_inbox
+from tests.conftest import LAT, LON, synthetic_snapshot
+
+
+@pytest.fixture
+def inbox_db(install_db, monkeypatch):
+    monkeypatch.setattr(config, "FEED_INBOX_ENABLED", True)
+    data = synthetic_snapshot(
+        seed=3, businesses=40, posts=300, spread_deg=0.05, hours=(1, 300),
+        following={"user_a": ["biz_001", "biz_far"], "user_b": ["biz_far"]},
+    )
+    data["posts"].append({"id": "post_old", "uid": "biz_far", "createdAt": "2020-01-01T00:00:00Z"})
+    return install_db(data)
+
+
+# ── Tests ─────────────────────────────────────────────────────────────────────
+
+def test_split_inbox_keeps_newest():
+    entries = [
+        {"id": "a", "createdAt": "2026-01-01T00:00:00Z"},
+        {"id": "b", "createdAt": None},
+        {"id": "c", "createdAt": "2026-03-01T00:00:00Z"},
+        {"id": "d", "createdAt": "2026-02-01T00:00:00Z"},
+    ]
+    keep, overflow = split_inbox(entries, 2)
+    assert [e["id"] for e in keep] == ["c", "d"]
+    assert [e["id"] for e in overflow] == ["a", "b"]
+
+
+def test_first_read_seeds_then_inbox_replaces_followed_queries(inbox_db):
+    assert inbox_db.get_feed_inbox("user_a") is None
+    first = assembler.build_feed("user_a", LAT, LON, limit=15)
+    assert inbox_db.get_feed_inbox("user_a")
+
+    inbox_db.reset()
+    second = assembler.build_feed("user_a", LAT, LON, limit=15)
+
+    assert inbox_db.calls["get_following_ids"] == 1
+    assert all("biz_far" not in ids for ids in inbox_db.post_requests)
+    assert [p["id"] for p in second] == [p["id"] for p in first]
+
+
+def test_fan_out_reaches_seeded_followers(inbox_db):
+    assembler.build_feed("user_a", LAT, LON, limit=10)
+    assert "post_old" not in {p["id"] for p in inbox_db.get_feed_inbox("user_a")}
+
+    written = asyncio.run(assembler.publish_post_async("post_old"))
+    assert written == 2                                  # user_a and user_b
+    assert "post_old" in {p["id"] for p in inbox_db.get_feed_inbox("user_a")}
+    assert inbox_db.get_feed_inbox("user_b") is None     # not seeded yet
+
+    assembler.build_feed("user_b", LAT, LON, limit=10)
+    assert "post_old" in {p["id"] for p in inbox_db.get_feed_inbox("user_b")}
+
+
+def test_inbox_is_bounded_and_reset(inbox_db, monkeypatch):
+    monkeypatch.setattr(config, "FEED_INBOX_SIZE", 3)
+    assembler.build_feed("user_a", LAT, LON, limit=10)
+    assert len(inbox_db.get_feed_inbox("user_a")) == 3
+
+    asyncio.run(assembler.following_changed_async("user_a"))
+    assert inbox_db.get_feed_inbox("user_a") is None
+
+
+def test_async_feed_matches_sync_with_inbox(inbox_db):
+    sync_posts = assembler.build_feed("user_a", LAT, LON, limit=15)
+    async_posts = asyncio.run(assembler.build_feed_async("user_a", LAT, LON, limit=15))
+    assert [p["id"] for p in async_posts] == [p["id"] for p in sync_posts]
+
+
+def test_followed_business_missing_from_inbox_keeps_following_weight(inbox_db):
+    far_posts = [p for p in inbox_db.get_post_candidates(["biz_far"], limit_per_business=5)]
+    inbox_db.seed_feed_inbox("user_a", far_posts)          # biz_001's posts never arrived
+
+    feed = assembler.build_feed("user_a", LAT, LON, limit=50)
+    biz_001 = [p for p in feed if p["uid"] == "biz_001"]
+    assert biz_001 and all(p["recommendation_type"] == "followed" for p in biz_001)
+
+
+def test_inbox_refs_are_capped_per_business(install_db, monkeypatch):
+    monkeypatch.setattr(config, "FEED_INBOX_ENABLED", True)
+    data = synthetic_snapshot(
+        seed=3, businesses=10, posts=40, spread_deg=0.05, hours=(24, 300),
+        following={"user_a": ["biz_far"]},
+    )
+    prolific = [
+        {"id": f"far_{i}", "uid": "biz_far", "createdAt": f"2030-01-01T{i:02d}:00:00Z"}
+        for i in range(12)
+    ]
+    data["posts"].extend(prolific)
+    mock = install_db(data)
+    mock.seed_feed_inbox("user_a", prolific)
+
+    feed = assembler.build_feed("user_a", LAT, LON, limit=20)
+    assert sum(p["uid"] == "biz_far" for p in feed) == 5
+    assert {p["id"] for p in feed if p["uid"] == "biz_far"} == {f"far_{i}" for i in range(7, 12)}
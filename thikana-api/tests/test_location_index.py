@@ -0,0 +1,150 @@
+"""
+tests/test_location_index.py
+
+Tests for the location_index builder (db/location_index.py), run against
+the in-memory target
+
+Run:  python -m pytest tests/test_location_index.py -v
+"""
+
+# Force mock mode BEFORE any import that touches db/__init__.py
+import config
+config.USE_MOCK = True
+
+import json
+import random
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from core.geohash_utils import cover_cells
+from db.location_index import MemoryIndex, diff_index, expected_index, main, reindex_business, sync
+from db.mock import MockDB
+
+_PRECISIONS = (4, 5, 6)
+_PROJECT_ROOT = Path(__file__).parent.parent
+_LAT, _LON = 18.5204, 73.8567
+
+
+@pytest.fixture
+def businesses() -> dict[str, dict]:
+    rng = random.Random(23)
+    docs = {
+        f"biz_{i:03d}": {
+            "location": {
+                "latitude":  _LAT + rng.uniform(-0.3, 0.3),
+                "longitude": _LON + rng.uniform(-0.3, 0.3),
+            },
+        }
+        for i in range(200)
+    }
+    docs["biz_unlocated"] = {"businessName": "No location"}
+    return docs
+
+
+def _nearby_from_index(index: MemoryIndex, businesses, lat, lon, radius_km, precisions):
+    """The Firestore read path: cover cells → ids → exact distance filter."""
+    ids = set()
+    for cell in cover_cells(lat, lon, radius_km, precisions):
+        ids |= index.cells.get(cell, set())
+    mock = MockDB({"users": {}, "businesses": {i: businesses[i] for i in ids}, "posts": []})
+    return mock.get_nearby_businesses(lat, lon, radius_km)
+
+
+# ── Tests ─────────────────────────────────────────────────────────────────────
+
+def test_build_serves_exact_nearby_at_every_precision(businesses):
+    index = MemoryIndex()
+    report = sync(index, businesses, _PRECISIONS)
+    assert report["written"] == report["cells"] == len(index.cells)
+    assert {len(cell) for cell in index.cells} == set(_PRECISIONS)
+    assert not any("biz_unlocated" in ids for ids in index.cells.values())
+
+    truth = MockDB({"users": {}, "businesses": businesses, "posts": []})
+    for radius_km in (1.0, 5.0, 20.0):
+        for precisions in ((4,), (5,), (6,), _PRECISIONS):
+            assert _nearby_from_index(index, businesses, _LAT, _LON, radius_km, precisions) == \
+                truth.get_nearby_businesses(_LAT, _LON, radius_km)
+
+
+def test_sync_writes_only_changed_cells_and_verify_reports_drift(businesses):
+    index = MemoryIndex()
+    sync(index, businesses, _PRECISIONS)
+    assert sync(index, businesses, _PRECISIONS)["written"] == 0
+
+    cell = next(c for c in sorted(index.cells) if len(c) == 5)
+    index.cells[cell].add("biz_ghost")
+    index.cells["zzzz"] = set()                       # empty leftover is deleted
+    del businesses["biz_000"]
+
+    diff = diff_index(expected_index(businesses, _PRECISIONS), index.read(_PRECISIONS))
+    assert "biz_ghost" in diff["stale"][cell]
+    assert sum("biz_000" in ids for ids in diff["stale"].values()) == 3
+    assert not diff["missing"]
+
+    report = sync(index, businesses, _PRECISIONS, dry_run=True)
+    assert report["written"] == 0 and report["stale"] == 4
+    sync(index, businesses, _PRECISIONS)
+    assert diff_index(expected_index(businesses, _PRECISIONS), index.read(_PRECISIONS)) == \
+        {"missing": {}, "stale": {}}
+    assert "zzzz" not in index.cells
+
+
+def test_default_build_backfills_the_queried_precisions(businesses, monkeypatch):
+    monkeypatch.setattr(config, "GEOHASH_BUILD_PRECISIONS", (5, 6))
+    monkeypatch.setattr(config, "GEOHASH_INDEX_PRECISIONS", (4, 5))
+    index = MemoryIndex()
+    sync(index, businesses, (5,))                        # built before 4 was queried
+
+    report = sync(index, businesses)
+    assert {len(cell) for cell in index.cells} == {4, 5, 6}
+    assert report["written"] == sum(len(cell) != 5 for cell in index.cells)
+
+
+def test_reindex_moves_one_business(businesses):
+    index = MemoryIndex()
+    sync(index, businesses, _PRECISIONS)
+    before = index.cells_of("biz_001")
+
+    moved = {"location": {"latitude": 19.0760, "longitude": 72.8777}}   # Pune → Mumbai
+    added, removed = reindex_business(index, "biz_001", moved, _PRECISIONS)
+    assert removed == before and len(added) == 3
+    assert index.cells_of("biz_001") == added
+    businesses["biz_001"] = moved
+    assert sync(index, businesses, _PRECISIONS, dry_run=True)["stale"] == 0
+
+    assert reindex_business(index, "biz_001", moved, _PRECISIONS) == (set(), set())
+    reindex_business(index, "biz_001", None, _PRECISIONS)              # deleted
+    assert not index.cells_of("biz_001")
+
+
+def test_cli_against_mock_file(tmp_path, capsys):
+    path = tmp_path / "location_index.json"
+    assert main(["verify", "--mock", str(path)]) == 1
+    assert main(["build", "--mock", str(path), "--precisions", "5"]) == 0
+    cells = json.loads(path.read_text())
+    assert cells and {len(cell) for cell in cells} == {5}
+    assert main(["verify", "--mock", str(path), "--precisions", "5"]) == 0
+    assert "missing=0 stale=0" in capsys.readouterr().out
+
+
+def test_cli_mock_needs_no_credentials(tmp_path):
+    """`python -m db.location_index --mock` with USE_MOCK as shipped and no key file."""
+    path = tmp_path / "location_index.json"
+    script = (
+        "import runpy, sys, config\n"
+        "config.KEY_PATH = '/nonexistent/serviceAccountKey.json'\n"
+        f"sys.argv = ['location_index', 'build', '--mock', {str(path)!r}, '--precisions', '5']\n"
+        "try:\n"
+        "    runpy.run_module('db.location_index', run_name='__main__')\n"
+        "finally:\n"
+        "    assert not config.USE_MOCK and 'db.firebase' not in sys.modules\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=_PROJECT_ROOT, capture_output=True, text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    assert "written=" in result.stdout
+    assert json.loads(path.read_text())
@@ -0,0 +1,112 @@
+"""
+tests/test_recent_posts.py
+
+Tests for the per-business recent-posts store (db/recent_posts.py)
+
+Run:  python -m pytest tests/test_recent_posts.py -v
+"""
+
+# Force mock mode BEFORE any import that touches db/__init__.py
+import config
+config.USE_MOCK = True
+
+import random
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from db.mock import MockDB
+from db.recent_posts import RecentPosts
+
+_NOW = datetime.now(timezone.utc)
+_BUSINESSES = [f"biz_{i:02d}" for i in range(20)]
+
+
+def _post(i: int, rng: random.Random) -> dict:
+    created = _NOW - timedelta(hours=rng.uniform(1, 200))
+    return {
+        "id":        f"post_{i:04d}",
+        "uid":       rng.choice(_BUSINESSES),
+        "createdAt": created.strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+        "caption":   f"caption {i}",
+    }
+
+
+def _ids(posts: list[dict]) -> list[str]:
+    return sorted(p["id"] for p in posts)
+
+
+def _assert_matches_query(store: RecentPosts, mock: MockDB) -> None:
+    """Buffer answers + a live query for the rest == the live query for all."""
+    for limit in (1, 3, 5, 8):
+        for since in (None, _NOW - timedelta(hours=48), _NOW - timedelta(hours=150)):
+            cached, uncovered = store.lookup(_BUSINESSES, limit, since)
+            live = mock.get_posts_for_businesses(uncovered, limit, since)
+            expected = mock.get_posts_for_businesses(_BUSINESSES, limit, since)
+            assert _ids(cached + live) == _ids(expected), (limit, since)
+            assert not set(uncovered) & {p["uid"] for p in cached}
+
+
+@pytest.fixture
+def warm():
+    rng = random.Random(18)
+    posts = [_post(i, rng) for i in range(150)]
+    mock = MockDB({"users": {}, "businesses": {}, "posts": posts})
+    store = RecentPosts(per_business=5)
+    store.bootstrap(posts)
+    return store, mock, rng
+
+
+# ── Tests ─────────────────────────────────────────────────────────────────────
+
+def test_cold_store_answers_nothing():
+    store = RecentPosts(per_business=5)
+    store.ingest({"id": "p", "uid": "biz_00", "createdAt": _NOW.isoformat()})
+    assert store.lookup(["biz_00"], 5) == ([], ["biz_00"])
+
+
+def test_buffers_match_the_posts_query(warm):
+    store, mock, _ = warm
+    _assert_matches_query(store, mock)
+    cached, uncovered = store.lookup(_BUSINESSES, 5)
+    assert not uncovered                              # limit fits every buffer
+
+
+def test_changes_keep_buffers_exact(warm):
+    store, mock, rng = warm
+    posts = mock._data["posts"]
+    for i in range(150, 400):
+        if rng.random() < 0.3 and posts:
+            removed = posts.pop(rng.randrange(len(posts)))
+            store.discard(removed["id"])
+        else:
+            post = _post(i, rng)
+            posts.append(post)
+            store.ingest(post)
+    _assert_matches_query(store, mock)
+
+
+def test_listener_events_and_projection():
+    store = RecentPosts(per_business=2)
+    doc = lambda post_id, ts: SimpleNamespace(
+        id=post_id,
+        to_dict=lambda: {"uid": "biz_00", "createdAt": ts, "caption": "x"},
+    )
+    change = lambda kind, d: SimpleNamespace(type=SimpleNamespace(name=kind), document=d)
+
+    store._on_snapshot(None, [
+        change("ADDED", doc("a", "2026-01-01T00:00:00Z")),
+        change("ADDED", doc("b", "2026-02-01T00:00:00Z")),
+        change("ADDED", doc("c", "2026-03-01T00:00:00Z")),
+    ], None)
+    assert store.ready
+    cached, _ = store.lookup(["biz_00"], 2, fields=["uid", "createdAt"])
+    assert cached == [
+        {"id": "c", "uid": "biz_00", "createdAt": "2026-03-01T00:00:00Z"},
+        {"id": "b", "uid": "biz_00", "createdAt": "2026-02-01T00:00:00Z"},
+    ]
+
+    store._on_snapshot(None, [change("REMOVED", doc("c", "2026-03-01T00:00:00Z"))], None)
+    assert store.lookup(["biz_00"], 2) == ([], ["biz_00"])   # "a" was dropped earlier
+    assert [p["id"] for p in store.lookup(["biz_00"], 1)[0]] == ["b"]
@@ -0,0 +1,83 @@
+"""
+tests/test_replica.py
+
+Tests for the live businesses replica (db/replica.py)
+
+Run:  python -m pytest tests/test_replica.py -v
+"""
+
+# Force mock mode BEFORE any import that touches db/__init__.py
+import config
+config.USE_MOCK = True
+
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from db.mock import MockDB
+from db.replica import BusinessReplica
+
+_LAT, _LON = 18.5204, 73.8567
+
+
+def _businesses() -> dict:
+    rng = random.Random(17)
+    return {
+        f"biz_{i:02d}": {
+            "businessName": f"Business {i}",
+            "location": {
+                "latitude":  _LAT + rng.uniform(-0.2, 0.2),
+                "longitude": _LON + rng.uniform(-0.2, 0.2),
+            },
+        }
+        for i in range(60)
+    }
+
+
+def _change(kind: str, biz_id: str, data: dict | None = None):
+    """Stand-in for a Firestore DocumentChange."""
+    return SimpleNamespace(
+        type=SimpleNamespace(name=kind),
+        document=SimpleNamespace(id=biz_id, to_dict=lambda: dict(data or {})),
+    )
+
+
+@pytest.fixture
+def replica():
+    replica = BusinessReplica()
+    replica._on_snapshot(
+        None, [_change("ADDED", biz_id, doc) for biz_id, doc in _businesses().items()], None
+    )
+    return replica
+
+
+# ── Tests ─────────────────────────────────────────────────────────────────────
+
+def test_not_ready_until_bootstrap():
+    replica = BusinessReplica()
+    assert not replica.ready
+    replica._on_snapshot(None, [], None)            # empty collection still counts
+    assert replica.ready
+    assert replica.nearby(_LAT, _LON) == {}
+
+
+def test_nearby_matches_mock(replica):
+    mock = MockDB({"businesses": _businesses(), "posts": [], "users": {}})
+    for radius in (2.0, 10.0, 25.0):
+        assert replica.nearby(_LAT, _LON, radius) == mock.get_nearby_businesses(_LAT, _LON, radius)
+
+
+def test_changes_move_and_remove(replica):
+    moved = {"businessName": "Moved", "location": {"latitude": _LAT, "longitude": _LON}}
+    replica._on_snapshot(
+        None, [_change("MODIFIED", "biz_00", moved), _change("REMOVED", "biz_01")], None
+    )
+
+    nearby = replica.nearby(_LAT, _LON, 1.0)
+    assert nearby["biz_00"] == 0.0
+    assert "biz_01" not in replica.nearby(_LAT, _LON, 100.0)
+    assert replica.get_many(["biz_00", "biz_01", "nope"]) == {
+        "biz_00": {**moved, "id": "biz_00", "username": "", "businessType": "", "postCount": 0},
+    }
+    assert replica.stats()["changes_applied"] == 62
@@ -0,0 +1,82 @@
+"""
+tests/test_scorer.py
+
+Tests for the batch post scorer in core/scorer.py
+
+Run:  python -m pytest tests/test_scorer.py -v
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from core import scorer
+from core.distance import haversine_km_batch
+from core.records import PostCandidate
+
+_NOW = datetime.now(timezone.utc)
+_rng = random.Random(3)
+
+_LOCATIONS = {
+    f"biz_{i}": {
+        "latitude":  18.5204 + _rng.uniform(-0.15, 0.15),
+        "longitude": 73.8567 + _rng.uniform(-0.15, 0.15),
+    }
+    for i in range(40)
+}
+_DISTANCES = dict(zip(_LOCATIONS, haversine_km_batch(
+    18.5204, 73.8567,
+    [loc["latitude"] for loc in _LOCATIONS.values()],
+    [loc["longitude"] for loc in _LOCATIONS.values()],
+).tolist()))
+_NEARBY = {b: d for b, d in _DISTANCES.items() if d <= 10.0}
+_FOLLOWING = {"biz_1", "biz_5", "biz_9", "biz_outside"}
+
+_POSTS = [
+    {
+        "id": f"post_{i}",
+        "uid": f"biz_{i % 40}" if i % 13 else "biz_outside",
+        "createdAt": (_NOW - timedelta(hours=_rng.uniform(0, 240))).isoformat(),
+    }
+    for i in range(300)
+]
+_POSTS.append({"id": "post_no_date", "uid": "biz_2"})
+_CANDIDATES = [PostCandidate.from_post(post) for post in _POSTS]
+
+
+def test_batch_matches_single_post_scores():
+    scores = scorer.score_candidates(_CANDIDATES, _FOLLOWING, _NEARBY, now=_NOW.timestamp())
+    assert scores.shape == (len(_POSTS),)
+    for post, s in zip(_POSTS, scores):
+        single = scorer.score_post(post, _FOLLOWING, 18.5204, 73.8567, _LOCATIONS)
+        assert abs(single - s) <= 2e-4, post
+
+
+def test_batch_scores_in_range():
+    scores = scorer.score_candidates(_CANDIDATES, _FOLLOWING, _NEARBY)
+    assert np.all((scores >= 0.0) & (scores <= 1.0))
+
+
+def test_unknown_distance_and_date_score_zero_for_those_signals():
+    scores = scorer.score_posts_batch(
+        biz_index=np.array([0, 1]),
+        created_at=np.array([np.nan, np.nan]),
+        following=np.array([True, False]),
+        biz_distance_km=np.array([np.nan, 0.0]),
+        now=_NOW.timestamp(),
+    )
+    assert scores.tolist() == [0.55, 0.35]
+
+
+def test_empty_batch():
+    assert scorer.score_candidates([], frozenset(), {}).shape == (0,)
+
+
+def test_follow_batch_matches_hand_computed_scores():
+    scores = scorer.score_businesses_to_follow_batch(
+        distance_km=np.array([0.0, 5.0, 12.0]),
+        post_count=np.array([20, 5, 40]),
+    )
+    assert scores.tolist() == [1.0, 0.425, 0.3]
+    assert scorer.score_business_to_follow({"postCount": None}, 5.0) == 0.35
@@ -0,0 +1,117 @@
+"""
+tests/test_spatial_index.py
+
+Tests for core/spatial_index.py and the MockDB nearby-businesses lookup.
+
+Run:  python -m pytest tests/test_spatial_index.py -v
+"""
+
+import random
+
+# Force mock mode BEFORE any import that touches db/__init__.py
+import config
+config.USE_MOCK = True
+
+from core.scorer import haversine_km
+from core.spatial_index import GridIndex
+from db.mock import MockDB
+
+# ── Synthetic snapshot ────────────────────────────────────────────────────────
+
+_rng = random.Random(42)
+
+_BUSINESSES = {
+    f"biz_{i:04d}": {
+        "businessName": f"Business {i}",
+        "location": {
+            "latitude":  18.52 + _rng.uniform(-0.4, 0.4),
+            "longitude": 73.85 + _rng.uniform(-0.4, 0.4),
+        },
+        "postCount": i % 25,
+    }
+    for i in range(2000)
+}
+_BUSINESSES["biz_no_location"] = {"businessName": "Nowhere"}
+
+
+def _brute_force(lat: float, lon: float, radius_km: float) -> dict[str, float]:
+    result = {}
+    for biz_id, biz in _BUSINESSES.items():
+        loc = biz.get("location")
+        if not loc:
+            continue
+        dist = haversine_km(lat, lon, loc["latitude"], loc["longitude"])
+        if dist <= radius_km:
+            result[biz_id] = round(dist, 2)
+    return dict(sorted(result.items(), key=lambda x: x[1]))
+
+
+# ── Tests ─────────────────────────────────────────────────────────────────────
+
+def test_mock_nearby_matches_brute_force():
+    mock = MockDB({"users": {}, "businesses": _BUSINESSES, "posts": []})
+    for lat, lon, radius in [
+        (18.5204, 73.8567, 10.0),
+        (18.90,   74.20,   5.0),
+        (18.10,   73.45,   25.0),
+        (30.00,   10.00,   10.0),   # nothing around
+    ]:
+        assert mock.get_nearby_businesses(lat, lon, radius) == _brute_force(lat, lon, radius)
+
+
+def test_mock_nearby_is_sorted_by_distance():
+    mock = MockDB({"users": {}, "businesses": _BUSINESSES, "posts": []})
+    distances = list(mock.get_nearby_businesses(18.5204, 73.8567, 10.0).values())
+    assert distances == sorted(distances)
+
+
+def test_query_only_visits_nearby_buckets():
+    index = GridIndex(cell_deg=0.1)
+    for biz_id, biz in _BUSINESSES.items():
+        if biz.get("location"):
+            index.insert(biz_id, biz["location"]["latitude"], biz["location"]["longitude"])
+    candidates = list(index.query_radius(18.5204, 73.8567, 2.0))
+    assert 0 < len(candidates) < len(index) / 4
+
+
+def test_wraps_around_antimeridian():
+    index = GridIndex(cell_deg=0.1)
+    index.insert("east", 0.0, 179.98)
+    index.insert("west", 0.0, -179.98)
+    keys = {key for key, _, _ in index.query_radius(0.0, 179.99, 10.0)}
+    assert keys == {"east", "west"}
+
+
+def test_insert_moves_and_remove_drops():
+    index = GridIndex(cell_deg=0.1)
+    index.insert("a", 18.5, 73.8)
+    index.insert("a", 40.0, -3.7)
+    assert len(index) == 1
+    assert not list(index.query_radius(18.5, 73.8, 5.0))
+    assert [k for k, _, _ in index.query_radius(40.0, -3.7, 5.0)] == ["a"]
+
+    index.remove("a")
+    index.remove("missing")
+    assert len(index) == 0
+    assert not list(index.query_radius(40.0, -3.7, 5.0))
+
+
+def test_nearest_matches_brute_force():
+    mock = MockDB({"users": {}, "businesses": _BUSINESSES, "posts": []})
+    for lat, lon, k, radius in [
+        (18.5204, 73.8567, 10, 100.0),   # dense — first ring suffices
+        (18.5204, 73.8567, 5000, 100.0), # k larger than the data
+        (19.60,   74.90,   3, 300.0),    # outside the data — rings grow
+        (30.00,   10.00,   5, 100.0),    # nothing within reach
+    ]:
+        expected = list(_brute_force(lat, lon, radius).values())[:k]
+        assert list(mock.get_nearest_businesses(lat, lon, k, radius).values()) == expected
+
+
+def test_nearest_wraps_around_antimeridian_and_poles():
+    index = GridIndex(cell_deg=0.5)
+    index.insert("east", 0.0, 179.9)
+    index.insert("west", 0.0, -179.7)
+    index.insert("pole", 89.9, 100.0)
+    assert [key for key, _ in index.nearest(0.0, -179.95, 2, 100.0)] == ["east", "west"]
+    assert [key for key, _ in index.nearest(89.9, -80.0, 1, 100.0)] == ["pole"]